@@ -0,0 +1,317 @@
+"""Asyncio variants of the fetch / resolve / download stages.
+
+Mirrors ``schedule.get_schedule``, ``schedule.resolve_pdf``,
+``schedule.get_latest_published`` and ``downloader.download_pdf_deterministic``
+as coroutines on an ``aiohttp.ClientSession``, so one event loop can pipeline
+dozens of transcripts (``fetch_all``) without a thread per request. Requests
+are bounded per host by ``asyncio.Semaphore``s; ParlInfo gets a small budget
+because of its WAF. Calls that pass no ``limits`` share one default budget per
+event loop.
+
+Parsing, caching and archiving reuse the synchronous modules, so results are
+identical to the blocking path; their disk I/O (cache files, the schedule
+archive, PDF writes) runs in ``asyncio.to_thread`` so it never stalls the
+loop. aiohttp is optional: ``make_session()`` raises
+if it isn't installed, but any object with the same ``get()`` interface works.
+
+    async with aio.make_session() as s:
+        results = await aio.fetch_all(entries, session=s)
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+import asyncio
+import hashlib
+import tempfile
+import time
+import weakref
+
+import requests
+
+from estimates_monitor import archive, downloader, http, parlinfo, schedule
+from estimates_monitor.schedule import TranscriptEntry
+
+try:
+    import aiohttp
+except ImportError:  # optional dependency
+    aiohttp = None
+
+AIO_HOST_LIMITS = {"parlinfo.aph.gov.au": 2}
+AIO_DEFAULT_HOST_LIMIT = 6
+AIO_CHUNK_BYTES = 64 * 1024
+
+
+class _StatusResponse:
+    """The bits of a response that error handling looks at (``status_code``, ``url``)."""
+
+    def __init__(self, status_code: int, url: str):
+        self.status_code = status_code
+        self.url = url
+
+
+class HostLimits:
+    """Lazily created ``asyncio.Semaphore`` per hostname."""
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None, default: int = AIO_DEFAULT_HOST_LIMIT):
+        self.limits = dict(AIO_HOST_LIMITS if limits is None else limits)
+        self.default = default
+        self._sems: Dict[str, asyncio.Semaphore] = {}
+
+    def __call__(self, url: str) -> asyncio.Semaphore:
+        host = (urlparse(url).hostname or "").lower()
+        sem = self._sems.get(host)
+        if sem is None:
+            sem = self._sems[host] = asyncio.Semaphore(max(1, self.limits.get(host, self.default)))
+        return sem
+
+
+# Semaphores belong to one event loop, so the default budgets are kept per loop;
+# every call on a loop without its own ``limits`` shares them.
+_default_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HostLimits]" = weakref.WeakKeyDictionary()
+
+
+def _limits(limits: Optional[HostLimits]) -> HostLimits:
+    if limits is not None:
+        return limits
+    loop = asyncio.get_running_loop()
+    found = _default_limits.get(loop)
+    if found is None:
+        found = _default_limits[loop] = HostLimits()
+    return found
+
+
+def make_session(**kwargs):
+    """``aiohttp.ClientSession`` with the package's default headers.
+
+    Must be called with a running event loop (``async with aio.make_session()``).
+    """
+    if aiohttp is None:
+        raise RuntimeError("aiohttp is not installed; pip install aiohttp or pass a session")
+    headers = dict(http.DEFAULT_HEADERS)
+    headers.update(kwargs.pop("headers", {}) or {})
+    connector = kwargs.pop("connector", None) or aiohttp.TCPConnector(limit=64, limit_per_host=AIO_DEFAULT_HOST_LIMIT)
+    return http.mark_own_session(aiohttp.ClientSession(headers=headers, connector=connector, **kwargs))
+
+
+def _timeout(seconds):
+    return aiohttp.ClientTimeout(total=seconds) if aiohttp is not None else seconds
+
+
+def _raise_for_status(status: int, url: str):
+    if status >= 400:
+        raise requests.exceptions.HTTPError(f"{status} Error for url: {url}", response=_StatusResponse(status, url))
+
+
+async def _get_text(session, url: str, timeout_s, headers=None, limits=None):
+    """``(status, final_url, headers, text)`` for one GET, within the host's budget."""
+    async with _limits(limits)(url):
+        async with session.get(url, headers=headers, timeout=_timeout(timeout_s)) as resp:
+            text = await resp.text()
+            return resp.status, str(resp.url), dict(resp.headers), text
+
+
+async def get_schedule(
+    session,
+    timeout_s: int = 30,
+    use_cache: bool = True,
+    limits: Optional[HostLimits] = None,
+    archive_pages: Optional[bool] = None,
+) -> List[TranscriptEntry]:
+    """Async ``schedule.get_schedule``: candidates in order, conditional GET, same cache.
+
+    As there, only sessions from ``make_session()`` archive by default.
+    """
+    if archive_pages is None:
+        archive_pages = http.is_own_session(session)
+    use_cache = use_cache and schedule.SCHEDULE_CACHE_ENABLED
+    cache = await asyncio.to_thread(schedule._load_schedule_cache) if use_cache else {}
+    last_exc = None
+    for url in schedule.SCHEDULE_URL_CANDIDATES:
+        headers = dict(schedule.DEFAULT_HEADERS)
+        headers.update(schedule._conditional_headers(cache.get(url)))
+        try:
+            status, final_url, resp_headers, text = await _get_text(session, url, timeout_s, headers, limits)
+        except Exception as e:
+            last_exc = e
+            continue
+        if "/Help/404" in final_url or status == 404:
+            continue
+        if status == 304 and url in cache:
+            return [schedule._entry_from_dict(d) for d in cache[url].get("entries", [])]
+        if status >= 400:
+            last_exc = requests.exceptions.HTTPError(f"{status} Error for url: {url}", response=_StatusResponse(status, url))
+            continue
+
+        if archive_pages and archive.ARCHIVE_ENABLED:
+            await asyncio.to_thread(archive.store, text, final_url)
+        entries = schedule._parse_schedule_html(text, base_url=final_url or schedule.SCHEDULE_URL)
+        etag, last_modified = resp_headers.get("ETag"), resp_headers.get("Last-Modified")
+        if use_cache and (etag or last_modified):
+            cache[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "final_url": final_url,
+                "entries": [schedule._entry_to_dict(e) for e in entries],
+            }
+            await asyncio.to_thread(schedule._save_schedule_cache, cache)
+        return entries
+    if last_exc:
+        raise last_exc
+    raise RuntimeError("Failed to fetch schedule")
+
+
+async def resolve_pdf(entry: TranscriptEntry, session, timeout_s: int = 30, limits: Optional[HostLimits] = None) -> TranscriptEntry:
+    """Async ``schedule.resolve_pdf`` (in place); 403 sets ``parlinfo_blocked``.
+
+    Shares the on-disk display-page cache with the synchronous path.
+    """
+    if entry.pdf_url:
+        return entry
+    hostname = (urlparse(entry.page_url).hostname or "").lower()
+    est_id, _, id_str = schedule._extract_estimate_id_parts(entry.page_url)
+
+    page = None
+    # Only sessions from make_session() share the on-disk cache (see http.is_own_session)
+    use_cache = parlinfo.DISPLAY_CACHE_ENABLED and http.is_own_session(session)
+    if use_cache:
+        page = await asyncio.to_thread(parlinfo._read_display_cache, entry.page_url, parlinfo.DISPLAY_CACHE_TTL_S)
+    if page is None:
+        status, final_url, _, text = await _get_text(session, entry.page_url, timeout_s, schedule.DEFAULT_HEADERS, limits)
+        if status == 403:
+            entry.parlinfo_blocked = True
+            return entry
+        _raise_for_status(status, entry.page_url)
+        page = parlinfo.DisplayPage(url=final_url or entry.page_url, status_code=status, text=text, fetched_at=time.time())
+        # Same rule as the sync path: challenge pages and pages without PDF links aren't cached
+        if use_cache and parlinfo._cacheable(page):
+            await asyncio.to_thread(parlinfo._write_display_cache, entry.page_url, page)
+
+    links = page.link_index()
+    if "parlinfo.aph.gov.au" in hostname:
+        entry.pdf_url = parlinfo.extract_pdf_url(entry.page_url, links)
+    if not entry.pdf_url:
+        entry.pdf_url = schedule._pick_pdf_link(links, page.url or entry.page_url, estimate_id=est_id, id_str=id_str)
+    return entry
+
+
+async def get_latest_published(
+    session,
+    is_seen_func=None,
+    timeout_s: int = 30,
+    use_cache: bool = True,
+    limits: Optional[HostLimits] = None,
+) -> Optional[TranscriptEntry]:
+    entries = await get_schedule(session, timeout_s=timeout_s, use_cache=use_cache, limits=limits)
+    if not entries:
+        return None
+    entries.sort(key=schedule._sort_key_latest, reverse=True)
+    chosen = next((e for e in entries if is_seen_func and not is_seen_func(e.page_url)), entries[0])
+    return await resolve_pdf(chosen, session, timeout_s=timeout_s, limits=limits)
+
+
+async def download_pdf_deterministic(
+    pdf_url: str,
+    base_name: str,
+    session,
+    timeout: int = 30,
+    hash_prefix_len: int = 8,
+    out_dir: Optional[Path] = None,
+    limits: Optional[HostLimits] = None,
+):
+    """Async ``downloader.download_pdf_deterministic``; same naming and result dict."""
+    out_dir = out_dir or downloader.PDF_DIR
+    url = downloader._strip_url_fragment(pdf_url)
+
+    hasher = hashlib.sha256()
+    total = 0
+    f, tmp_path = await asyncio.to_thread(_open_tmp, out_dir)
+    try:
+        try:
+            async with _limits(limits)(url):
+                async with session.get(url, timeout=_timeout(timeout)) as resp:
+                    if resp.status == 403 and "html" in (resp.headers.get("Content-Type") or "").lower():
+                        raise downloader.WafChallengeError.from_response(resp, url, b"")
+                    _raise_for_status(resp.status, url)
+                    # Hold the first PDF_SNIFF_BYTES back: a challenge page posing as the PDF
+                    # stops the download there, and a short first chunk isn't mistaken for one
+                    head = b""
+                    async for chunk in resp.content.iter_chunked(AIO_CHUNK_BYTES):
+                        if head is not None:
+                            head += chunk
+                            if len(head) < downloader.PDF_SNIFF_BYTES:
+                                continue
+                            downloader.check_pdf_start(head, resp, url)
+                            chunk, head = head, None
+                        await asyncio.to_thread(f.write, chunk)
+                        hasher.update(chunk)
+                        total += len(chunk)
+                    if head is not None:
+                        # Whole body shorter than the sniff window
+                        downloader.check_pdf_start(head, resp, url)
+                        await asyncio.to_thread(f.write, head)
+                        hasher.update(head)
+                        total += len(head)
+        finally:
+            await asyncio.to_thread(f.close)
+        await asyncio.to_thread(downloader.check_pdf_trailer, tmp_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    sha = hasher.hexdigest()
+    final_path, obj = await asyncio.to_thread(_finish, tmp_path, sha, base_name, out_dir, hash_prefix_len)
+    return {
+        "path": str(final_path), "sha256": sha, "bytes": total, "object_path": str(obj),
+        "etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified"),
+    }
+
+
+def _open_tmp(out_dir: Path):
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix="pdf", dir=str(out_dir))
+    return open(tmp_fd, "wb"), Path(tmp_path)
+
+
+def _finish(tmp_path: Path, sha: str, base_name: str, out_dir: Path, hash_prefix_len: int):
+    stored = downloader._store(tmp_path, sha, base_name, out_dir, hash_prefix_len)
+    downloader._cleanup_manual_download_artifacts(out_dir)
+    return stored
+
+
+def _base_name(entry: TranscriptEntry) -> str:
+    date = entry.published_date.date().isoformat() if entry.published_date else ""
+    return f"{date} {entry.title or 'transcript'}".strip()
+
+
+async def fetch_one(entry: TranscriptEntry, session, timeout_s: int = 60, limits: Optional[HostLimits] = None) -> dict:
+    """Resolve then download one entry; failures are returned, not raised."""
+    result = {"id": entry.page_url, "title": entry.title}
+    try:
+        await resolve_pdf(entry, session, timeout_s=timeout_s, limits=limits)
+        result["pdf_url"] = entry.pdf_url
+        if not entry.pdf_url:
+            result["parlinfo_blocked"] = entry.parlinfo_blocked
+            return result
+        result.update(await download_pdf_deterministic(entry.pdf_url, _base_name(entry), session, timeout=timeout_s, limits=limits))
+    except downloader.WafChallengeError as e:
+        result["parlinfo_blocked"] = True
+        result["waf"] = e.as_dict()
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+async def fetch_all(
+    entries: List[TranscriptEntry],
+    session,
+    timeout_s: int = 60,
+    host_limits: Optional[Dict[str, int]] = None,
+) -> List[dict]:
+    """Resolve and download every entry concurrently; results in ``entries`` order.
+
+    Each result is ``{"id", "title", "pdf_url", "path", "sha256", "bytes"}`` on
+    success, with ``parlinfo_blocked`` or ``error`` instead when it didn't get that far.
+    """
+    limits = HostLimits(host_limits) if host_limits is not None else _limits(None)
+    return list(await asyncio.gather(*(fetch_one(e, session, timeout_s=timeout_s, limits=limits) for e in entries)))
@@ -0,0 +1,223 @@
+"""Content-addressed archive of fetched schedule pages.
+
+Every schedule body that ``schedule.get_schedule`` downloads is kept under
+``ARCHIVE_DIR``:
+
+    objects/<sha[:2]>/<sha256>.zst   (or .gz when zstandard isn't installed)
+    index.jsonl                      one line per fetch: time, url, sha, sizes
+
+Identical bodies are stored once; the index still records every fetch, so the
+archive doubles as a fetch log. ``replay`` runs the schedule parser over the
+archive for offline benchmarking and for rebuilding entries without touching APH.
+
+Storing happens on the polling path, so compression is kept cheap, and
+``prune`` (run every ``ARCHIVE_PRUNE_EVERY`` stores) bounds the index and the
+objects to ``ARCHIVE_RETENTION_DAYS`` / ``ARCHIVE_MAX_RECORDS``.
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+import gzip
+import hashlib
+import json
+import tempfile
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is always available
+    zstandard = None
+
+ARCHIVE_DIR = Path("data/schedule_archive")
+# False stops get_schedule() from archiving what it fetches
+ARCHIVE_ENABLED = True
+# Low levels: a schedule page compresses in a few ms, well inside a poll
+ARCHIVE_ZSTD_LEVEL = 3
+ARCHIVE_GZIP_LEVEL = 6
+# Index records older than this, or beyond the newest ARCHIVE_MAX_RECORDS, are pruned
+# together with the objects only they referenced (None disables either cap)
+ARCHIVE_RETENTION_DAYS = 180
+ARCHIVE_MAX_RECORDS = 20000
+# store() prunes on its first call in a process and then every this many calls
+ARCHIVE_PRUNE_EVERY = 500
+
+_stores_since_prune = None
+
+_CODEC_EXT = {"zstd": ".zst", "gzip": ".gz"}
+
+
+def _index_path() -> Path:
+    return ARCHIVE_DIR / "index.jsonl"
+
+
+def _object_path(sha: str, codec: str) -> Path:
+    return ARCHIVE_DIR / "objects" / sha[:2] / f"{sha}{_CODEC_EXT[codec]}"
+
+
+def _find_object(sha: str) -> Optional[Tuple[Path, str]]:
+    for codec in _CODEC_EXT:
+        p = _object_path(sha, codec)
+        if p.exists():
+            return p, codec
+    return None
+
+
+def _compress(data: bytes) -> Tuple[bytes, str]:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=ARCHIVE_ZSTD_LEVEL).compress(data), "zstd"
+    # mtime=0 keeps the blob byte-identical across runs
+    return gzip.compress(data, compresslevel=ARCHIVE_GZIP_LEVEL, mtime=0), "gzip"
+
+
+def _decompress(blob: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("archive object is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return gzip.decompress(blob)
+
+
+def store(body, url: str, fetched_at: Optional[datetime] = None) -> dict:
+    """Archive one fetched schedule body; returns its index record.
+
+    ``body`` may be text (encoded as UTF-8) or bytes. The blob is only written
+    when no object with the same SHA-256 exists yet.
+    """
+    data = body.encode("utf-8") if isinstance(body, str) else bytes(body)
+    sha = hashlib.sha256(data).hexdigest()
+
+    found = _find_object(sha)
+    if found is None:
+        blob, codec = _compress(data)
+        path = _object_path(sha, codec)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_fd, tmp_path = tempfile.mkstemp(prefix="obj", dir=str(path.parent))
+        with open(tmp_fd, "wb") as f:
+            f.write(blob)
+        Path(tmp_path).replace(path)
+        stored_bytes, new = len(blob), True
+    else:
+        path, codec = found
+        stored_bytes, new = path.stat().st_size, False
+
+    record = {
+        "fetched_at": (fetched_at or datetime.utcnow()).isoformat() + "Z",
+        "url": url,
+        "sha256": sha,
+        "bytes": len(data),
+        "stored_bytes": stored_bytes,
+        "codec": codec,
+        "new": new,
+    }
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    # One short line per append, so concurrent writers don't interleave
+    with open(_index_path(), "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    global _stores_since_prune
+    if _stores_since_prune is None or _stores_since_prune >= ARCHIVE_PRUNE_EVERY:
+        _stores_since_prune = 0
+        prune(now=fetched_at)
+    _stores_since_prune += 1
+    return record
+
+
+def prune(now: Optional[datetime] = None, retention_days: Optional[int] = None, max_records: Optional[int] = None) -> dict:
+    """Apply the retention caps: rewrite the index and delete unreferenced objects.
+
+    ``retention_days`` and ``max_records`` default to ``ARCHIVE_RETENTION_DAYS``
+    and ``ARCHIVE_MAX_RECORDS``. Returns how many records and objects went.
+    """
+    retention_days = ARCHIVE_RETENTION_DAYS if retention_days is None else retention_days
+    max_records = ARCHIVE_MAX_RECORDS if max_records is None else max_records
+    records = list(iter_index())
+    kept = records
+    if retention_days is not None:
+        cutoff = ((now or datetime.utcnow()) - timedelta(days=retention_days)).isoformat() + "Z"
+        kept = [r for r in kept if r.get("fetched_at", "") >= cutoff]
+    if max_records is not None and len(kept) > max_records:
+        kept = kept[len(kept) - max_records:]
+    result = {"records": len(records) - len(kept), "objects": 0}
+    if not result["records"]:
+        return result
+
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix="index", dir=str(ARCHIVE_DIR))
+    with open(tmp_fd, "w", encoding="utf-8") as f:
+        for rec in kept:
+            f.write(json.dumps(rec, separators=(",", ":")) + "\n")
+    Path(tmp_path).replace(_index_path())
+
+    live = {r["sha256"] for r in kept}
+    for sha in {r["sha256"] for r in records} - live:
+        found = _find_object(sha)
+        if found is not None:
+            found[0].unlink(missing_ok=True)
+            result["objects"] += 1
+    return result
+
+
+def iter_index(since: Optional[str] = None, until: Optional[str] = None) -> Iterator[dict]:
+    """Index records in fetch order, optionally limited to ``since <= fetched_at < until``.
+
+    Bounds are ISO timestamps compared as strings (the index stores UTC ``...Z``).
+    """
+    path = _index_path()
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from an interrupted write
+                continue
+            ts = rec.get("fetched_at", "")
+            if since and ts < since:
+                continue
+            if until and ts >= until:
+                continue
+            yield rec
+
+
+def load(sha: str) -> str:
+    """Decompressed body of an archived object."""
+    found = _find_object(sha)
+    if found is None:
+        raise FileNotFoundError(f"no archived schedule body {sha}")
+    path, codec = found
+    return _decompress(path.read_bytes(), codec).decode("utf-8", errors="replace")
+
+
+def replay(
+    parse: Optional[Callable] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    unique: bool = True,
+) -> Iterator[Tuple[dict, list]]:
+    """Parse archived schedule pages in fetch order, yielding ``(record, entries)``.
+
+    ``parse(html, base_url=...)`` defaults to ``schedule._parse_schedule_html``.
+    With ``unique`` each distinct body is parsed once (at its first fetch).
+    """
+    if parse is None:
+        from estimates_monitor.schedule import _parse_schedule_html as parse
+    done = set()
+    for rec in iter_index(since=since, until=until):
+        sha = rec["sha256"]
+        if unique:
+            if sha in done:
+                continue
+            done.add(sha)
+        yield rec, parse(load(sha), base_url=rec.get("url"))
+
+
+def replay_entries(since: Optional[str] = None, until: Optional[str] = None) -> List:
+    """Every entry seen across the archive, one per ``page_url``; later fetches win."""
+    latest = {}
+    for _, entries in replay(since=since, until=until):
+        for e in entries:
+            latest[e.page_url] = e
+    return list(latest.values())
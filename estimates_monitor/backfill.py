@@ -0,0 +1,261 @@
+"""Historical backfill: resolve and download every published transcript.
+
+Enumerates the live schedule (plus any archived copies of it), resolves each
+entry's PDF and downloads it into ``downloader.PDF_DIR`` on a thread pool, with
+a cap on concurrent requests per host. Finished entries are written to
+``storage`` every ``BACKFILL_FLUSH_EVERY`` completions and once more at the end
+(or on interrupt), so an interrupted run picks up where it left off: entries
+that already have a ``pdf_path`` are skipped. Only downloads go into ``seen``;
+failed, blocked and unresolved entries are kept under ``backfill_failures``.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+import re
+import threading
+import time
+
+import requests
+
+from estimates_monitor import downloader, http, schedule, storage
+from estimates_monitor.schedule import TranscriptEntry
+
+BACKFILL_MAX_WORKERS = 8
+
+# Completed entries between state file writes; the whole file is rewritten each time
+BACKFILL_FLUSH_EVERY = 50
+
+# Concurrent requests allowed per host; ParlInfo sits behind a WAF, keep it low.
+BACKFILL_HOST_LIMITS = {"parlinfo.aph.gov.au": 2}
+BACKFILL_DEFAULT_HOST_LIMIT = 4
+
+# Wayback Machine copies of the schedule rewrite links to point back at the archive
+_WAYBACK_RE = re.compile(r"^https?://web\.archive\.org/web/[^/]+/(?P<url>https?://.+)$")
+
+
+class _HostLimiter:
+    """One bounded semaphore per host, created on first use."""
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None, default: int = BACKFILL_DEFAULT_HOST_LIMIT):
+        self.limits = dict(BACKFILL_HOST_LIMITS if limits is None else limits)
+        self.default = default
+        self._sems: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def slot(self, url: str) -> threading.BoundedSemaphore:
+        host = (urlparse(url).hostname or "").lower()
+        with self._lock:
+            sem = self._sems.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(max(1, self.limits.get(host, self.default)))
+                self._sems[host] = sem
+        return sem
+
+
+@dataclass
+class BackfillStats:
+    entries: int = 0
+    downloaded: int = 0
+    skipped: int = 0
+    unresolved: int = 0
+    # The PDF URL answered with a WAF challenge page: needs the browser, not a retry
+    blocked: int = 0
+    failed: int = 0
+    bytes: int = 0
+    elapsed_s: float = 0.0
+    errors: List[dict] = field(default_factory=list)
+    browser_fetch: List[dict] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        elapsed = self.elapsed_s or 1e-9
+        processed = self.downloaded + self.unresolved + self.blocked + self.failed
+        return {
+            "entries": self.entries,
+            "downloaded": self.downloaded,
+            "skipped": self.skipped,
+            "unresolved": self.unresolved,
+            "blocked": self.blocked,
+            "failed": self.failed,
+            "bytes": self.bytes,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "entries_per_s": round(processed / elapsed, 3),
+            "mb_per_s": round(self.bytes / 1e6 / elapsed, 3),
+            "errors": self.errors,
+            "browser_fetch": self.browser_fetch,
+        }
+
+
+def _unwrap_wayback(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return url
+    m = _WAYBACK_RE.match(url)
+    return m.group("url") if m else url
+
+
+def collect_entries(
+    session: Optional[requests.Session] = None,
+    timeout_s: int = 30,
+    archive_urls: Iterable[str] = (),
+) -> List[TranscriptEntry]:
+    """Every published entry from the live schedule and ``archive_urls``, newest first.
+
+    Archived pages (saved copies or Wayback Machine snapshots of the schedule)
+    are parsed with the same parser; rows are de-duplicated by ``page_url`` with
+    the live schedule winning.
+    """
+    s = session or http.get_session()
+    entries = list(schedule.get_schedule(session=session, timeout_s=timeout_s))
+    for url in archive_urls:
+        resp = s.get(url, headers=schedule.DEFAULT_HEADERS, timeout=timeout_s)
+        resp.raise_for_status()
+        for e in schedule._parse_schedule_html(resp.text, base_url=url):
+            e.page_url = _unwrap_wayback(e.page_url)
+            e.committee_url = _unwrap_wayback(e.committee_url)
+            entries.append(e)
+
+    unique: Dict[str, TranscriptEntry] = {}
+    for e in entries:
+        unique.setdefault(e.page_url, e)
+    return sorted(unique.values(), key=schedule._sort_key_latest, reverse=True)
+
+
+def _base_name(entry: TranscriptEntry) -> str:
+    # Date plus committee: several committees sit on the same day
+    date = entry.published_date.date().isoformat() if entry.published_date else ""
+    return f"{date} {entry.title or 'transcript'}".strip()
+
+
+def _fetch_one(entry: TranscriptEntry, session, limiter: _HostLimiter, timeout_s: int):
+    with limiter.slot(entry.page_url):
+        schedule.resolve_pdf(entry, session=session, timeout_s=timeout_s)
+    if not entry.pdf_url:
+        return None
+    with limiter.slot(entry.pdf_url):
+        return downloader.download_pdf_deterministic(entry.pdf_url, _base_name(entry), session=session, timeout=timeout_s)
+
+
+def _flush_state(batch_seen: Dict[str, dict], batch_failures: Dict[str, Optional[dict]]) -> None:
+    """Merge a batch of results into the state file in one write, then clear it.
+
+    The file is re-read first so anything another command saved meanwhile is
+    kept. A ``None`` failure clears an earlier one for that entry.
+    """
+    if not batch_seen and not batch_failures:
+        return
+    state = storage.load_state()
+    seen = state.setdefault("seen", {})
+    for id, record in batch_seen.items():
+        seen[id] = {**seen.get(id, {}), **record}
+    failures = state.setdefault("backfill_failures", {})
+    for id, failure in batch_failures.items():
+        if failure is None:
+            failures.pop(id, None)
+        else:
+            failures[id] = failure
+    storage.save_state(state)
+    batch_seen.clear()
+    batch_failures.clear()
+
+
+def run_backfill(
+    session: Optional[requests.Session] = None,
+    archive_urls: Iterable[str] = (),
+    max_workers: int = BACKFILL_MAX_WORKERS,
+    host_limits: Optional[Dict[str, int]] = None,
+    timeout_s: int = 60,
+    limit: Optional[int] = None,
+    now_func=None,
+    progress: Optional[Callable[[TranscriptEntry, str], None]] = None,
+) -> dict:
+    """Resolve and download every published transcript not yet on disk.
+
+    Workers only touch the network; results are collected on the calling
+    thread (the state file isn't safe for concurrent writers) and saved in
+    batches. Per-entry failures are counted, reported and recorded under
+    ``backfill_failures`` rather than aborting the run or marking the entry
+    seen. Returns counts plus entries/s and MB/s throughput.
+    """
+    started = time.monotonic()
+    stats = BackfillStats()
+    entries = collect_entries(session=session, timeout_s=timeout_s, archive_urls=archive_urls)
+    stats.entries = len(entries)
+
+    seen = storage.load_state().get("seen", {})
+    todo = [e for e in entries if not (seen.get(e.page_url) or {}).get("pdf_path")]
+    stats.skipped = len(entries) - len(todo)
+    if limit is not None:
+        todo = todo[:limit]
+
+    limiter = _HostLimiter(host_limits)
+    workers = max(1, min(max_workers, len(todo) or 1))
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill")
+    batch_seen: Dict[str, dict] = {}
+    batch_failures: Dict[str, Optional[dict]] = {}
+    try:
+        futures = {pool.submit(_fetch_one, e, session, limiter, timeout_s): e for e in todo}
+        for fut in as_completed(futures):
+            entry = futures[fut]
+            now = (now_func or datetime.utcnow)().isoformat() + "Z"
+            existing = seen.get(entry.page_url) or {}
+            record = {
+                "first_seen_at": existing.get("first_seen_at") or now,
+                "title": entry.title,
+                "pdf_url": entry.pdf_url,
+                "published_date": entry.published_date.isoformat() if entry.published_date else None,
+                "status": entry.status,
+            }
+            failure = {"at": now, "title": entry.title, "pdf_url": entry.pdf_url}
+            try:
+                dl = fut.result()
+            except downloader.WafChallengeError as e:
+                stats.blocked += 1
+                stats.browser_fetch.append({"id": entry.page_url, "title": entry.title, "pdf_url": entry.pdf_url, "waf": e.as_dict()})
+                outcome = "blocked"
+                failure["waf"] = e.as_dict()
+            except Exception as e:
+                stats.failed += 1
+                stats.errors.append({"id": entry.page_url, "error": str(e)})
+                outcome = "failed"
+                failure["error"] = str(e)
+            else:
+                if dl is None and entry.parlinfo_blocked:
+                    # Display page 403'd (or the circuit is open): the browser has to resolve it
+                    stats.blocked += 1
+                    stats.browser_fetch.append({"id": entry.page_url, "title": entry.title, "pdf_url": None})
+                    outcome = "blocked"
+                elif dl is None:
+                    stats.unresolved += 1
+                    outcome = "unresolved"
+                else:
+                    stats.downloaded += 1
+                    stats.bytes += dl["bytes"]
+                    record.update({
+                        "downloaded_at": now,
+                        "pdf_path": dl["path"],
+                        "pdf_sha256": dl["sha256"],
+                        "pdf_bytes": dl["bytes"],
+                        "pdf_etag": dl.get("etag"),
+                        "pdf_last_modified": dl.get("last_modified"),
+                    })
+                    outcome = "downloaded"
+            if outcome == "downloaded":
+                batch_seen[entry.page_url] = record
+                batch_failures[entry.page_url] = None
+            else:
+                failure["outcome"] = outcome
+                batch_failures[entry.page_url] = failure
+            # Every completed entry has a batch_failures key (None clears an old failure)
+            if len(batch_failures) >= BACKFILL_FLUSH_EVERY:
+                _flush_state(batch_seen, batch_failures)
+            if progress:
+                progress(entry, outcome)
+    finally:
+        # On interrupt, drop queued entries and save whatever finished
+        pool.shutdown(wait=True, cancel_futures=True)
+        _flush_state(batch_seen, batch_failures)
+
+    stats.elapsed_s = time.monotonic() - started
+    return stats.as_dict()
@@ -0,0 +1,195 @@
+"""Record/replay HTTP cassettes for offline benchmarks and regression tests.
+
+``RecordingSession`` wraps a real session and writes every response it sees
+into a cassette directory:
+
+    interactions.jsonl        one line per request: method, url, Range, status,
+                              final url, headers, elapsed, body sha
+    bodies/<sha256>           response bodies, stored once
+
+``ReplaySession`` serves a cassette back as real ``requests.Response`` objects,
+so the pipeline (``cli.run_download_latest``, ``backfill``, ...) runs unchanged
+without touching APH. Requests for the same method/url/Range are answered in
+recorded order, the last answer repeating once they run out. Latency can be
+injected per request (``latency_s``) or taken from the recording
+(``recorded_latency=True``).
+
+Redirect chains are collapsed: the replayed response carries the final URL but
+no ``history``.
+"""
+
+from datetime import timedelta
+from http import HTTPStatus
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import hashlib
+import io
+import json
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Recorded bodies are already decoded, so these no longer describe them
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class CassetteMissError(requests.exceptions.ConnectionError):
+    """The cassette has no recorded answer for this request."""
+
+
+def _key(method: str, url: str, headers: Optional[dict]) -> Tuple[str, str, Optional[str]]:
+    rng = None
+    for k, v in (headers or {}).items():
+        if k.lower() == "range":
+            rng = v
+    return method.upper(), url, rng
+
+
+class RecordingSession:
+    """Pass requests through to ``session`` and record each response into ``cassette_dir``."""
+
+    def __init__(self, cassette_dir, session=None):
+        if session is None:
+            from estimates_monitor import http
+            session = http.make_session()
+        self.session = session
+        self.cassette_dir = Path(cassette_dir)
+        (self.cassette_dir / "bodies").mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # headers, cookies, mount, close, ... come from the wrapped session
+        return getattr(self.session, name)
+
+    def _record(self, method: str, url: str, headers: Optional[dict], resp) -> None:
+        body = resp.content or b""  # reads streamed bodies; iter_content() still works afterwards
+        sha = hashlib.sha256(body).hexdigest()
+        body_path = self.cassette_dir / "bodies" / sha
+        method, url, rng = _key(method, url, headers)
+        elapsed = getattr(resp, "elapsed", None)
+        keep = {k: v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS}
+        if method == "HEAD" and "Content-Length" in resp.headers:
+            # A HEAD answer's Content-Length describes the resource, so keep it
+            keep["Content-Length"] = resp.headers["Content-Length"]
+        rec = {
+            "method": method,
+            "url": url,
+            "range": rng,
+            "status": resp.status_code,
+            "final_url": resp.url,
+            "headers": keep,
+            "elapsed_s": elapsed.total_seconds() if elapsed is not None else 0.0,
+            "sha256": sha,
+            "bytes": len(body),
+        }
+        with self._lock:
+            if not body_path.exists():
+                body_path.write_bytes(body)
+            with open(self.cassette_dir / "interactions.jsonl", "a", encoding="utf-8") as f:
+                f.write(json.dumps(rec, sort_keys=True) + "\n")
+
+    def request(self, method, url, **kwargs):
+        resp = self.session.request(method, url, **kwargs)
+        self._record(method, url, kwargs.get("headers"), resp)
+        return resp
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url, data=None, json=None, **kwargs):
+        return self.request("POST", url, data=data, json=json, **kwargs)
+
+
+def load_interactions(cassette_dir) -> List[dict]:
+    path = Path(cassette_dir) / "interactions.jsonl"
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class ReplaySession:
+    """Answer requests from a cassette recorded by ``RecordingSession``; never touches the network."""
+
+    def __init__(
+        self,
+        cassette_dir,
+        latency_s: float = 0.0,
+        recorded_latency: bool = False,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.cassette_dir = Path(cassette_dir)
+        self.latency_s = latency_s
+        self.recorded_latency = recorded_latency
+        self.sleep = sleep
+        self.headers = CaseInsensitiveDict()
+        self.cookies = requests.cookies.RequestsCookieJar()
+        self.calls: List[Tuple[str, str]] = []
+        self._by_key: Dict[tuple, List[dict]] = {}
+        for rec in load_interactions(self.cassette_dir):
+            self._by_key.setdefault((rec["method"], rec["url"], rec.get("range")), []).append(rec)
+        self._next: Dict[tuple, int] = {}
+        self._bodies: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key) -> dict:
+        with self._lock:
+            recs = self._by_key.get(key)
+            if not recs:
+                raise CassetteMissError(f"no recorded {key[0]} {key[1]}" + (f" Range={key[2]}" if key[2] else ""))
+            i = self._next.get(key, 0)
+            self._next[key] = i + 1
+            return recs[min(i, len(recs) - 1)]
+
+    def _body(self, sha: str) -> bytes:
+        body = self._bodies.get(sha)
+        if body is None:
+            body = self._bodies[sha] = (self.cassette_dir / "bodies" / sha).read_bytes()
+        return body
+
+    def _build_response(self, rec: dict, method: str, body: bytes) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = rec["status"]
+        try:
+            resp.reason = HTTPStatus(rec["status"]).phrase
+        except ValueError:
+            resp.reason = ""
+        resp.headers = CaseInsensitiveDict(rec.get("headers") or {})
+        if method != "HEAD":
+            resp.headers["Content-Length"] = str(len(body))
+        resp.url = rec.get("final_url") or rec["url"]
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.elapsed = timedelta(seconds=rec.get("elapsed_s") or 0.0)
+        resp.raw = io.BytesIO(body)
+        resp._content = b"" if method == "HEAD" else body
+        resp._content_consumed = True
+        resp.request = requests.Request(method, rec["url"]).prepare()
+        return resp
+
+    def request(self, method, url, headers=None, **kwargs):
+        key = _key(method, url, headers)
+        self.calls.append((key[0], url))
+        rec = self._lookup(key)
+        delay = (rec.get("elapsed_s") or 0.0) if self.recorded_latency else self.latency_s
+        if delay > 0:
+            self.sleep(delay)
+        return self._build_response(rec, key[0], self._body(rec["sha256"]))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        pass
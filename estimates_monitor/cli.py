@@ -1,6 +1,7 @@
 """CLI entrypoint for estimates-monitor commands."""
 import argparse
-from estimates_monitor import downloader, pending, storage, schedule, x_client
+import atexit
+from estimates_monitor import backfill, cookies, downloader, http, parlinfo, parser, pending, storage, schedule, watch, x_client
 from pathlib import Path
 import json
 from datetime import datetime
@@ -45,16 +46,34 @@ def run_latest_absolute(session=None):
     }
 
 
+def _entry_json(entry):
+    return {
+        "id": entry.page_url,
+        "title": entry.title,
+        "ref_no": entry.ref_no,
+        "published_date": entry.published_date.isoformat() if entry.published_date else None,
+        "status": entry.status,
+    }
+
+
+def run_diff(session=None):
+    """Report schedule rows added, changed or removed since the previous run."""
+    delta = schedule.diff(session=session)
+    return {
+        "added": [_entry_json(e) for e in delta.added],
+        "changed": [_entry_json(e) for e in delta.changed],
+        "removed": [_entry_json(e) for e in delta.removed],
+    }
+
+
 def run_resolve_pdf(display_url, session=None):
     """Fetch given parlInfo display URL and extract pdf_url without mutating state.
 
-    Uses requests only. Raises on 403 (WAF) — browser bypass is handled by
+    Uses requests only; repeat lookups are served from the display-page cache. Raises on 403 (WAF) — browser bypass is handled by
     the OpenClaw agent.
     """
-    import requests
-    from estimates_monitor.parlinfo import extract_pdf_url
-    s = session or requests
-    resp = s.get(display_url)
+    from estimates_monitor.parlinfo import extract_pdf_url, fetch_display_page
+    resp = fetch_display_page(display_url, session=session)
     resp.raise_for_status()
     html = resp.text
     pdf = extract_pdf_url(display_url, html)
@@ -67,7 +86,7 @@ def _base_name_from_entry(entry):
     return entry.title or "transcript"
 
 
-def run_download_latest(session=None, now_func=None, force_download: bool = False, dry_run: bool = False, timeout_s: int = 60, verbose: bool = False):
+def run_download_latest(session=None, now_func=None, force_download: bool = False, dry_run: bool = False, timeout_s: int = 60, verbose: bool = False, extract: bool = False):
     def _v(msg: str):
         if verbose:
             print(f"[download-latest] {msg}", file=sys.stdout, flush=True)
@@ -94,6 +113,27 @@ def run_download_latest(session=None, now_func=None, force_download: bool = Fals
     if storage.is_posted(entry.page_url):
         _v("refusing: already posted")
         raise SystemExit(2)
+    return _download_entry(entry, session, now_func=now_func, force_download=force_download, dry_run=dry_run, timeout_s=timeout_s, extract=extract, _v=_v)
+
+
+def run_download_entry(entry, session=None, now_func=None, timeout_s: int = 60, verbose: bool = False):
+    """Resolve and download one schedule row; ``watch`` calls this for every new or changed row."""
+    def _v(msg: str):
+        if verbose:
+            print(f"[download] {msg}", file=sys.stdout, flush=True)
+
+    if storage.is_posted(entry.page_url):
+        _v(f"skipping ref_no={entry.ref_no}: already posted")
+        return {"id": entry.page_url, "title": entry.title, "posted": True, "skipped": True}
+    existing = storage.get_seen(entry.page_url)
+    if existing and existing.get("pdf_path"):
+        # Already on disk; a changed row doesn't mean a different PDF
+        return {"id": entry.page_url, "title": entry.title, "pdf_path": existing["pdf_path"], "skipped": True}
+    schedule.resolve_pdf(entry, session=session, timeout_s=timeout_s)
+    return _download_entry(entry, session, now_func=now_func, timeout_s=timeout_s, _v=_v)
+
+
+def _download_entry(entry, session, now_func=None, force_download: bool = False, dry_run: bool = False, timeout_s: int = 60, extract: bool = False, _v=lambda msg: None):
     if not entry.pdf_url and getattr(entry, 'parlinfo_blocked', False):
         _v("ParlInfo blocked by WAF — browser bypass needed")
         published = entry.published_date.isoformat() if entry.published_date else None
@@ -145,13 +185,38 @@ def run_download_latest(session=None, now_func=None, force_download: bool = Fals
 
     base_name = _base_name_from_entry(entry)
     _v(f"downloading pdf base_name={base_name!r}")
-    dl = downloader.download_pdf_deterministic(
-        entry.pdf_url,
-        base_name,
-        session=session,
-        timeout=timeout_s,
-    )
-    _v(f"downloaded bytes={dl.get('bytes')} sha256={dl.get('sha256')}")
+    # With --force-download, a HEAD against the recorded ETag/Last-Modified
+    # still avoids re-pulling a PDF that hasn't changed.
+    try:
+        pdf = downloader.fetch_pdf(
+            entry.pdf_url,
+            base_name,
+            session=session,
+            timeout=timeout_s,
+            known=existing if existing and existing.get("pdf_url") == entry.pdf_url else None,
+        )
+    except downloader.WafChallengeError as e:
+        # The PDF URL itself served a challenge page: same browser detour as a blocked detail page
+        _v(f"WAF challenge instead of PDF: {e}")
+        published = entry.published_date.isoformat() if entry.published_date else None
+        return {
+            "id": entry.page_url,
+            "title": entry.title,
+            "pdf_url": entry.pdf_url,
+            "published_date": published,
+            "status": entry.status,
+            "parlinfo_blocked": True,
+            "parlinfo_url": entry.page_url,
+            "waf": e.as_dict(),
+            "action": "browser_fetch",
+            "instructions": (
+                "ParlInfo answered the PDF URL with a WAF challenge page. Use browser tool to: "
+                f"1) Open {entry.pdf_url} "
+                "2) Download the PDF to data/pdfs/"
+            ),
+        }
+    dl = pdf.result
+    _v(f"{'unchanged on server' if dl.get('not_modified') else 'downloaded'} bytes={dl.get('bytes')} sha256={dl.get('sha256')}")
     now = (now_func or datetime.utcnow)().isoformat() + "Z"
     published = entry.published_date.isoformat() if entry.published_date else None
     storage.update_seen(entry.page_url, {
@@ -164,8 +229,10 @@ def run_download_latest(session=None, now_func=None, force_download: bool = Fals
         "pdf_path": dl["path"],
         "pdf_sha256": dl["sha256"],
         "pdf_bytes": dl["bytes"],
+        "pdf_etag": dl.get("etag"),
+        "pdf_last_modified": dl.get("last_modified"),
     })
-    return {
+    result = {
         "id": entry.page_url,
         "title": entry.title,
         "pdf_url": entry.pdf_url,
@@ -174,6 +241,52 @@ def run_download_latest(session=None, now_func=None, force_download: bool = Fals
         "pdf_bytes": dl["bytes"],
         "skipped": False,
     }
+    if extract:
+        # Straight from the downloaded (mapped) PDF; nothing is re-read from its path
+        with pdf:
+            result["text_path"] = str(parser.save_text(pdf))
+        _v(f"extracted text to {result['text_path']}")
+    return result
+
+
+def run_backfill(session=None, archive_urls=(), max_workers=None, limit=None, timeout_s: int = 60, verbose: bool = False):
+    """Download every published transcript not yet on disk; resumable."""
+    def _progress(entry, outcome):
+        if verbose:
+            print(f"[backfill] {outcome} ref_no={entry.ref_no} title={entry.title!r}", file=sys.stdout, flush=True)
+
+    return backfill.run_backfill(
+        session=session,
+        archive_urls=archive_urls,
+        max_workers=max_workers or backfill.BACKFILL_MAX_WORKERS,
+        limit=limit,
+        timeout_s=timeout_s,
+        progress=_progress,
+    )
+
+
+def run_watch(fast_s=None, slow_s=None, max_iterations=None, timeout_s: int = 60, verbose: bool = False, sleep_func=None):
+    """Stay resident: poll the schedule adaptively and download new transcripts."""
+    def _on_entry(entry, session):
+        return run_download_entry(entry, session=session, timeout_s=timeout_s, verbose=verbose)
+
+    def _report(event):
+        print(json.dumps(event, ensure_ascii=False), flush=True)
+
+    watch.run_watch(
+        _on_entry,
+        session=http.get_session(),
+        fast_s=fast_s or watch.WATCH_FAST_S,
+        slow_s=slow_s or watch.WATCH_SLOW_S,
+        max_iterations=max_iterations,
+        sleep_func=sleep_func,
+        report=_report,
+    )
+
+
+def run_import_cookies(export_path, all_domains: bool = False):
+    """Import a browser cookie export so plain HTTP reuses its WAF clearance."""
+    return cookies.import_cookies(export_path, domains=None if all_domains else cookies.COOKIE_DOMAINS)
 
 
 # ── Pending thread commands ──────────────────────────────────────
@@ -243,13 +356,40 @@ if __name__ == "__main__":
     sub = parser_arg.add_subparsers(dest="command")
     latest_parser = sub.add_parser("latest", help="Fetch latest published schedule entry and mark seen")
     latest_parser.add_argument("--absolute", action="store_true", dest="absolute", help="Ignore seen state and return absolute latest")
+    latest_parser.add_argument("--hedge-delay", type=float, default=None, dest="hedge_delay", help="Race the fallback schedule URL if the primary hasn't answered after this many seconds")
+    latest_parser.add_argument("--no-synth", action="store_true", dest="no_synth", help="Always resolve the PDF via the ParlInfo detail page")
     dl_parser = sub.add_parser("download-latest", help="Download latest published transcript PDF")
     dl_parser.add_argument("--force-download", action="store_true")
     dl_parser.add_argument("--dry-run", action="store_true", dest="dry_run")
     dl_parser.add_argument("--timeout", type=int, default=60, help="Timeout seconds for network operations")
     dl_parser.add_argument("--verbose", action="store_true", help="Verbose logging")
+    dl_parser.add_argument("--extract", action="store_true", help="Also extract the transcript text (markitdown) into data/text/")
+    dl_parser.add_argument("--hedge-delay", type=float, default=None, dest="hedge_delay", help="Race the fallback schedule URL if the primary hasn't answered after this many seconds")
+    dl_parser.add_argument("--no-synth", action="store_true", dest="no_synth", help="Always resolve the PDF via the ParlInfo detail page")
+    sub.add_parser("diff", help="Show schedule rows added/changed/removed since the last diff")
     resolve = sub.add_parser("resolve-pdf", help="Resolve a ParlInfo display URL to its PDF without mutating state")
     resolve.add_argument("display_url")
+    bf_parser = sub.add_parser("backfill", help="Resolve and download every published transcript (resumable)")
+    bf_parser.add_argument("--archive-url", action="append", default=[], dest="archive_urls", help="Extra archived schedule page to enumerate (repeatable)")
+    bf_parser.add_argument("--workers", type=int, default=None, help="Concurrent resolve/download workers")
+    bf_parser.add_argument("--limit", type=int, default=None, help="Stop after this many new entries")
+    bf_parser.add_argument("--timeout", type=int, default=60, help="Timeout seconds for network operations")
+    bf_parser.add_argument("--verbose", action="store_true", help="Print each entry as it finishes")
+    bf_parser.add_argument("--no-synth", action="store_true", dest="no_synth", help="Always resolve the PDF via the ParlInfo detail page")
+    watch_parser = sub.add_parser("watch", help="Stay resident, poll the schedule adaptively and download new transcripts")
+    watch_parser.add_argument("--fast", type=float, default=None, help="Poll interval (s) in sitting weeks at busy hours")
+    watch_parser.add_argument("--slow", type=float, default=None, help="Poll interval (s) outside sitting periods")
+    watch_parser.add_argument("--iterations", type=int, default=None, help="Stop after this many polls")
+    watch_parser.add_argument("--timeout", type=int, default=60, help="Timeout seconds for network operations")
+    watch_parser.add_argument("--verbose", action="store_true", help="Verbose download logging")
+    watch_parser.add_argument("--no-synth", action="store_true", dest="no_synth", help="Always resolve the PDF via the ParlInfo detail page")
+    for p in (dl_parser, bf_parser, watch_parser):
+        p.add_argument("--segments", type=int, default=None, help="Fetch large PDFs over this many parallel byte-range connections")
+    for p in (latest_parser, dl_parser, resolve, bf_parser):
+        p.add_argument("--no-cache", action="store_true", dest="no_cache", help="Bypass the schedule and ParlInfo page caches")
+    cookie_parser = sub.add_parser("import-cookies", help="Import browser cookies (Netscape cookies.txt or JSON export) for ParlInfo")
+    cookie_parser.add_argument("export_path")
+    cookie_parser.add_argument("--all-domains", action="store_true", dest="all_domains", help="Keep cookies for every domain, not just aph.gov.au")
     status_parser = sub.add_parser("status", help="List pending/approved/published threads")
     status_parser.add_argument("--filter", dest="status_filter", default=None, help="Filter by status: pending, approved, published, failed, rejected")
     approve_parser = sub.add_parser("approve", help="Approve a pending thread for publishing")
@@ -260,6 +400,18 @@ if __name__ == "__main__":
     publish_parser = sub.add_parser("publish", help="Publish an approved thread to X")
     publish_parser.add_argument("thread_id")
     args = parser_arg.parse_args()
+    # Keep WAF cookies the server refreshed during this run (also on Ctrl-C / SystemExit)
+    atexit.register(http.save_shared_cookies)
+    if getattr(args, 'no_cache', False):
+        schedule.SCHEDULE_CACHE_ENABLED = False
+        parlinfo.DISPLAY_CACHE_ENABLED = False
+    if getattr(args, 'hedge_delay', None) is not None:
+        schedule.SCHEDULE_HEDGE_DELAY_S = args.hedge_delay
+    if getattr(args, 'segments', None) is not None:
+        downloader.DOWNLOAD_SEGMENTS = args.segments
+    if args.command in ("latest", "download-latest", "backfill", "watch") and not getattr(args, 'no_synth', False):
+        # Guess the PDF URL from previously resolved ones before touching the detail page
+        schedule.TOC_PDF_TEMPLATE = parlinfo.learn_toc_pdf_template(storage.load_state().get("seen", {}))
     if args.command == "latest":
         if getattr(args, 'absolute', False):
             result = run_latest_absolute()
@@ -274,12 +426,40 @@ if __name__ == "__main__":
             dry_run=getattr(args, 'dry_run', False),
             timeout_s=timeout_s,
             verbose=verbose,
+            extract=getattr(args, 'extract', False),
+        )
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    elif args.command == "backfill":
+        result = run_backfill(
+            session=http.get_session(),
+            archive_urls=args.archive_urls,
+            max_workers=args.workers,
+            limit=args.limit,
+            timeout_s=args.timeout,
+            verbose=args.verbose,
         )
         print(json.dumps(result, indent=2, ensure_ascii=False))
+    elif args.command == "watch":
+        try:
+            run_watch(
+                fast_s=args.fast,
+                slow_s=args.slow,
+                max_iterations=args.iterations,
+                timeout_s=args.timeout,
+                verbose=args.verbose,
+            )
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "diff":
+        result = run_diff()
+        print(json.dumps(result, indent=2, ensure_ascii=False))
     elif args.command == "resolve-pdf":
         url = args.display_url
         pdf = run_resolve_pdf(url)
         print(json.dumps({"display_url": url, "pdf_url": pdf}, indent=2, ensure_ascii=False))
+    elif args.command == "import-cookies":
+        result = run_import_cookies(args.export_path, all_domains=args.all_domains)
+        print(json.dumps(result, indent=2, ensure_ascii=False))
     elif args.command == "status":
         result = run_status(status_filter=getattr(args, 'status_filter', None))
         print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -0,0 +1,178 @@
+"""Bridge WAF clearance cookies from the agent's browser into plain HTTP.
+
+Once the browser has solved ParlInfo's Azure WAF challenge, its cookies are
+good for a while. Exporting them (Netscape ``cookies.txt`` or the JSON written
+by Playwright ``storage_state()`` / browser cookie extensions) and importing
+them here lets follow-up fetches and downloads in the same clearance window
+succeed over requests instead of another browser detour.
+
+Imported cookies are persisted with their expiry in ``COOKIE_JAR_PATH``
+(Mozilla format, owner-only permissions) and loaded into the shared session by
+``http.get_session()``. Cookies the server sets or refreshes during a CLI run
+are written back on exit (``http.save_shared_cookies()``).
+"""
+
+from http.cookiejar import Cookie, CookieJar, LoadError, MozillaCookieJar
+from pathlib import Path
+from typing import Iterable, List, Optional
+import json
+import os
+import tempfile
+import time
+
+COOKIE_JAR_PATH = Path("data/cookies.txt")
+# Only cookies for these domains (and their subdomains) are imported
+COOKIE_DOMAINS = ("aph.gov.au",)
+
+
+def _make_cookie(name, value, domain, path="/", expires=None, secure=False, http_only=False) -> Cookie:
+    domain = domain or ""
+    if expires is not None:
+        expires = int(float(expires))
+        if expires <= 0:  # -1 / 0 mark session cookies in browser exports
+            expires = None
+    rest = {"HttpOnly": None} if http_only else {}
+    return Cookie(
+        version=0, name=name, value=value,
+        port=None, port_specified=False,
+        domain=domain, domain_specified=bool(domain), domain_initial_dot=domain.startswith("."),
+        path=path or "/", path_specified=True,
+        secure=bool(secure), expires=expires, discard=expires is None,
+        comment=None, comment_url=None, rest=rest,
+    )
+
+
+def _parse_netscape(text: str) -> List[Cookie]:
+    out = []
+    for line in text.splitlines():
+        http_only = line.startswith("#HttpOnly_")
+        if http_only:
+            line = line[len("#HttpOnly_"):]
+        if not line.strip() or line.startswith("#"):
+            continue
+        fields = line.rstrip("\n").split("\t")
+        if len(fields) != 7:
+            continue
+        domain, _, path, secure, expires, name, value = fields
+        out.append(_make_cookie(name, value, domain, path, expires or None, secure.upper() == "TRUE", http_only))
+    return out
+
+
+def _parse_json(data) -> List[Cookie]:
+    if isinstance(data, dict):
+        data = data.get("cookies", [])  # Playwright storage_state()
+    out = []
+    for c in data or []:
+        if not isinstance(c, dict) or "name" not in c:
+            continue
+        out.append(_make_cookie(
+            c["name"], c.get("value", ""), c.get("domain", ""), c.get("path", "/"),
+            # Playwright: "expires"; Chrome extensions: "expirationDate"; "session": true has neither
+            c.get("expires", c.get("expirationDate")),
+            c.get("secure", False), c.get("httpOnly", False),
+        ))
+    return out
+
+
+def parse_cookie_export(path) -> List[Cookie]:
+    """Cookies from a Netscape ``cookies.txt`` or a JSON cookie export."""
+    text = Path(path).read_text(encoding="utf-8")
+    stripped = text.lstrip()
+    if stripped.startswith("[") or stripped.startswith("{"):
+        return _parse_json(json.loads(text))
+    return _parse_netscape(text)
+
+
+def _domain_allowed(domain: str, domains: Optional[Iterable[str]]) -> bool:
+    if domains is None:
+        return True
+    d = domain.lstrip(".").lower()
+    return any(d == allowed or d.endswith("." + allowed) for allowed in domains)
+
+
+def _open_jar(jar_path: Optional[Path] = None) -> MozillaCookieJar:
+    jar = MozillaCookieJar(str(jar_path or COOKIE_JAR_PATH))
+    try:
+        # WAF clearance cookies are often session cookies; keep them too
+        jar.load(ignore_discard=True, ignore_expires=False)
+    except (FileNotFoundError, LoadError):
+        pass
+    return jar
+
+
+def save_cookies(cookies: CookieJar, jar_path: Optional[Path] = None) -> int:
+    """Merge ``cookies`` into the persisted jar; returns how many it now holds.
+
+    The jar holds WAF clearance tokens, so it is written atomically with mode 0600.
+    """
+    jar = _open_jar(jar_path)
+    for c in cookies:
+        jar.set_cookie(c)
+    jar.clear_expired_cookies()
+    path = Path(jar.filename)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # mkstemp creates the file 0600; save() reopens it without changing the mode
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix="cookies", dir=str(path.parent))
+    os.close(tmp_fd)
+    try:
+        jar.save(tmp_path, ignore_discard=True, ignore_expires=False)
+        Path(tmp_path).replace(path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return len(jar)
+
+
+def save_session_cookies(session_cookies: CookieJar, jar_path: Optional[Path] = None, domains: Optional[Iterable[str]] = COOKIE_DOMAINS) -> int:
+    """Persist cookies a session picked up (e.g. a WAF cookie the server refreshed).
+
+    Only ``domains`` are kept, as on import; returns how many were saved, and
+    writes nothing when there are none.
+    """
+    keep = CookieJar()
+    for c in session_cookies:
+        if _domain_allowed(c.domain, domains):
+            keep.set_cookie(c)
+    if not len(keep):
+        return 0
+    save_cookies(keep, jar_path)
+    return len(keep)
+
+
+def load_saved_cookies(target: CookieJar, jar_path: Optional[Path] = None) -> int:
+    """Copy unexpired persisted cookies into ``target`` (e.g. ``session.cookies``)."""
+    jar = _open_jar(jar_path)
+    now = time.time()
+    n = 0
+    for c in jar:
+        if not c.is_expired(now):
+            target.set_cookie(c)
+            n += 1
+    return n
+
+
+def import_cookies(export_path, session=None, jar_path: Optional[Path] = None, domains: Optional[Iterable[str]] = COOKIE_DOMAINS) -> dict:
+    """Import a browser cookie export into ``session`` (default: the shared one) and persist it.
+
+    Expired cookies and cookies outside ``domains`` (None = all) are skipped.
+    """
+    if session is None:
+        from estimates_monitor import http
+        session = http.get_session()
+    now = time.time()
+    accepted = CookieJar()
+    skipped = 0
+    for c in parse_cookie_export(export_path):
+        if c.is_expired(now) or not _domain_allowed(c.domain, domains):
+            skipped += 1
+            continue
+        accepted.set_cookie(c)
+        session.cookies.set_cookie(c)
+    stored = save_cookies(accepted, jar_path)
+    return {
+        "imported": len(accepted),
+        "skipped": skipped,
+        "stored": stored,
+        "jar": str(jar_path or COOKIE_JAR_PATH),
+        "domains": sorted({c.domain for c in accepted}),
+    }
@@ -6,16 +6,198 @@ downloads via plain HTTP requests.
 """
 
 import requests
+import urllib3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
 from urllib.parse import urlsplit, urlunsplit
 import hashlib
+import io
+import json
+import mmap
+import os
 import re
+import shutil
 import tempfile
-from typing import Optional
+import threading
+from typing import Optional, Tuple
+
+from estimates_monitor import http
 
 PDF_DIR = Path("data/pdfs")
 PDF_DIR.mkdir(parents=True, exist_ok=True)
 
+# iter_content() chunk size, for responses the buffered read below can't take
+DOWNLOAD_CHUNK_BYTES = 8192
+# Read unencoded bodies from urllib3 in large reads into one reusable buffer (False = always iter_content)
+DOWNLOAD_READINTO = True
+# Buffered reads start here and double while they keep filling the buffer
+DOWNLOAD_READ_MIN_BYTES = 64 * 1024
+DOWNLOAD_READ_MAX_BYTES = 1024 * 1024
+# Partial downloads live here (under the output dir) until complete
+PART_DIRNAME = ".parts"
+# Finished PDFs are stored once by content: objects/<sha[:2]>/<sha[2:4]>/<sha>.pdf
+OBJECTS_DIRNAME = "objects"
+# Mid-stream failures resumed within one call before giving up (the .part file is kept)
+DOWNLOAD_RESUME_RETRIES = 2
+# Parallel byte-range connections per PDF (1 = single stream; `--segments` on the CLI)
+DOWNLOAD_SEGMENTS = 1
+# Smaller PDFs aren't worth the extra HEAD and connections
+SEGMENTED_MIN_BYTES = 4 * 1024 * 1024
+SEGMENT_CHUNK_BYTES = 256 * 1024
+# "%PDF-" may follow up to this much leading junk; the "%%EOF" trailer must be this close to the end
+PDF_SNIFF_BYTES = 1024
+
+_RESUMABLE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class WafChallengeError(requests.exceptions.HTTPError):
+    """The server answered a PDF URL with an HTML (WAF challenge) page instead of the PDF.
+
+    Raised as soon as the first bytes arrive, whether the page came with a 403
+    or a 200. Carries what the challenge looked like for the browser fallback.
+    """
+
+    def __init__(self, url: str, status_code=None, content_type=None, title=None, snippet: str = "", reference=None, response=None):
+        super().__init__(f"WAF challenge page ({status_code}, {content_type or 'no Content-Type'}) instead of PDF for url: {url}", response=response)
+        self.url = url
+        self.status_code = status_code
+        self.content_type = content_type
+        self.title = title
+        self.snippet = snippet
+        self.reference = reference
+
+    @classmethod
+    def from_response(cls, resp, url: str, head: bytes) -> "WafChallengeError":
+        headers = getattr(resp, "headers", None) or {}
+        text = head[:PDF_SNIFF_BYTES].decode("utf-8", "replace")
+        m = re.search(r"<title[^>]*>(.*?)</title>", text, re.I | re.S)
+        return cls(
+            url,
+            status_code=getattr(resp, "status_code", None) or getattr(resp, "status", None),
+            content_type=headers.get("Content-Type"),
+            title=m.group(1).strip() if m else None,
+            snippet=text[:200],
+            reference=headers.get("X-Azure-Ref") or headers.get("x-azure-ref"),
+            response=resp if hasattr(resp, "status_code") else None,
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "status_code": self.status_code,
+            "content_type": self.content_type,
+            "title": self.title,
+            "reference": self.reference,
+        }
+
+
+class InvalidPdfError(ValueError):
+    """The downloaded body isn't a complete PDF (no ``%PDF-`` header or ``%%EOF`` trailer)."""
+
+
+def _looks_like_html(head: bytes) -> bool:
+    start = head[:PDF_SNIFF_BYTES].lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    return start.startswith((b"<!doctype", b"<html", b"<head", b"<body", b"<script", b"<?xml", b"<meta", b"<title"))
+
+
+def check_pdf_start(head: bytes, resp, url: str):
+    """Raise unless ``head`` (the first bytes of the body) starts a PDF."""
+    if b"%PDF-" in head[:PDF_SNIFF_BYTES]:
+        return
+    content_type = ((getattr(resp, "headers", None) or {}).get("Content-Type") or "")
+    if _looks_like_html(head) or "html" in content_type.lower():
+        raise WafChallengeError.from_response(resp, url, head)
+    raise InvalidPdfError(f"not a PDF ({content_type or 'no Content-Type'}, starts {head[:16]!r}): {url}")
+
+
+def check_pdf_trailer(path: Path):
+    """Raise ``InvalidPdfError`` unless the file ends with a ``%%EOF`` marker."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - PDF_SNIFF_BYTES))
+        tail = f.read()
+    if b"%%EOF" not in tail:
+        raise InvalidPdfError(f"PDF has no %%EOF trailer (truncated?): {path}")
+
+
+def _sniffed(chunks, resp, url: str):
+    """Pass ``chunks`` through after checking the first bytes are a PDF, not a challenge page."""
+    it = iter(chunks)
+    head = b""
+    for chunk in it:
+        head += chunk
+        if len(head) >= PDF_SNIFF_BYTES:
+            break
+    check_pdf_start(head, resp, url)
+    yield head
+    yield from it
+
+
+def _unread_stream(resp) -> bool:
+    """True when nothing has read ``resp``'s body yet.
+
+    requests has no public flag for this. ``Response._content_consumed`` is
+    what its own ``iter_content``/``content`` check, so it is used here only
+    when present: without it (stand-ins, or a requests that renamed it) the
+    answer is False and callers keep to ``iter_content``.
+    """
+    return getattr(resp, "_content_consumed", None) is False
+
+
+def _body_chunks(resp, chunk_size: int):
+    """Yield the body of a streamed response.
+
+    A fresh, unencoded urllib3 stream is read with ``raw.readinto`` into one
+    reusable buffer, in reads that grow from ``DOWNLOAD_READ_MIN_BYTES`` to
+    ``DOWNLOAD_READ_MAX_BYTES``. urllib3 still copies each read into the
+    buffer; the gain (about 2x less CPU per MB in
+    scripts/bench_download_write.py) comes from a 30 MB PDF taking a few dozen
+    large reads instead of thousands of 8 KB ones. The yielded memoryviews are
+    only valid until the next one is requested. Anything else (stand-ins,
+    replayed or already-read bodies, compressed ones) goes through
+    ``iter_content(chunk_size)``.
+    """
+    raw = getattr(resp, "raw", None)
+    encoding = ((getattr(resp, "headers", None) or {}).get("Content-Encoding") or "identity").lower()
+    if not (DOWNLOAD_READINTO and hasattr(raw, "readinto") and _unread_stream(resp) and encoding == "identity"):
+        yield from resp.iter_content(chunk_size)
+        return
+
+    buf = memoryview(bytearray(DOWNLOAD_READ_MAX_BYTES))
+    size = min(DOWNLOAD_READ_MIN_BYTES, len(buf))
+    while True:
+        # The same translation iter_content does, so callers see requests exceptions either way
+        try:
+            n = raw.readinto(buf[:size])
+        except urllib3.exceptions.ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.exceptions.ConnectionError(e)
+        except urllib3.exceptions.SSLError as e:
+            raise requests.exceptions.SSLError(e)
+        if not n:
+            # As iter_content does once drained, so a later .content raises instead of returning b""
+            resp._content_consumed = True
+            return
+        yield buf[:n]
+        if n == size and size < len(buf):
+            size = min(size * 2, len(buf))
+
+
+def _raise_for_status(resp, url: str):
+    """``raise_for_status``, but a 403 HTML page raises ``WafChallengeError``."""
+    if getattr(resp, "status_code", 200) == 403:
+        content_type = ((getattr(resp, "headers", None) or {}).get("Content-Type") or "").lower()
+        head = next(iter(resp.iter_content(PDF_SNIFF_BYTES)), b"") if hasattr(resp, "iter_content") else b""
+        if "html" in content_type or _looks_like_html(head):
+            raise WafChallengeError.from_response(resp, url, head)
+    resp.raise_for_status()
+
 
 def _slugify(text: str) -> str:
     if not text:
@@ -49,6 +231,274 @@ def _cleanup_manual_download_artifacts(out_dir: Path):
         return
 
 
+def _part_paths(out_dir: Path, url: str):
+    """``.part`` body and its ``.json`` metadata for ``url``, stable across runs."""
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+    d = out_dir / PART_DIRNAME
+    return d / f"{key}.part", d / f"{key}.json"
+
+
+def _load_part_meta(meta_path: Path) -> Optional[dict]:
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _resumable(meta: Optional[dict]) -> bool:
+    """Only resume when the server takes byte ranges and gave a validator for If-Range."""
+    return bool(meta and meta.get("accept_ranges") and (meta.get("etag") or meta.get("last_modified")))
+
+
+def _close_quietly(resp):
+    close = getattr(resp, "close", None)
+    if close:
+        try:
+            close()
+        except Exception:
+            pass
+
+
+def _discard_part(part: Path, meta_path: Path):
+    part.unlink(missing_ok=True)
+    meta_path.unlink(missing_ok=True)
+
+
+def _hash_file(path: Path):
+    """Rebuild the incremental SHA-256 state from what is already on disk."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(block)
+    return hasher
+
+
+def _content_range_start(resp) -> Optional[int]:
+    m = re.match(r"bytes (\d+)-", (getattr(resp, "headers", None) or {}).get("Content-Range", ""))
+    return int(m.group(1)) if m else None
+
+
+def _open_stream(s, url: str, timeout, part: Path, meta_path: Path):
+    """GET ``url``, continuing ``part`` with a Range request when possible.
+
+    Returns ``(resp, offset, hasher)``: the body from ``resp`` belongs at
+    ``offset`` and ``hasher`` already covers the bytes before it.
+    """
+    meta = _load_part_meta(meta_path)
+    offset = part.stat().st_size if part.exists() else 0
+    resp = None
+    if offset and _resumable(meta) and meta.get("url") == url:
+        resp = s.get(url, stream=True, timeout=timeout, headers={
+            "Range": f"bytes={offset}-",
+            "If-Range": meta.get("etag") or meta["last_modified"],
+        })
+        status = getattr(resp, "status_code", 200)
+        if status == 206 and _content_range_start(resp) == offset:
+            return resp, offset, _hash_file(part)
+        if status != 200:
+            # 416 or an odd range: start over. A 200 means the PDF changed; use it as is.
+            _close_quietly(resp)
+            resp = None
+    if resp is None:
+        resp = s.get(url, stream=True, timeout=timeout)
+    _raise_for_status(resp, url)
+
+    headers = getattr(resp, "headers", None) or {}
+    length = headers.get("Content-Length")
+    part.parent.mkdir(parents=True, exist_ok=True)
+    part.write_bytes(b"")
+    meta_path.write_text(json.dumps({
+        "url": url,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "length": int(length) if length and length.isdigit() and not headers.get("Content-Encoding") else None,
+        "accept_ranges": headers.get("Accept-Ranges", "").lower() == "bytes",
+    }), encoding="utf-8")
+    return resp, 0, hashlib.sha256()
+
+
+def object_path(sha: str, out_dir: Optional[Path] = None) -> Path:
+    """Where the PDF with SHA-256 ``sha`` lives in the content-addressed store."""
+    return (out_dir or PDF_DIR) / OBJECTS_DIRNAME / sha[:2] / sha[2:4] / f"{sha}.pdf"
+
+
+def _link_readable(obj: Path, target: Path):
+    """Point the human-readable ``target`` at ``obj``: hardlink, else symlink, else copy."""
+    if target.exists() or target.is_symlink():
+        try:
+            if os.path.samefile(obj, target):
+                return
+        except OSError:
+            pass
+        target.unlink()
+    try:
+        os.link(obj, target)
+        return
+    except OSError:
+        pass
+    try:
+        target.symlink_to(os.path.relpath(obj, target.parent))
+        return
+    except OSError:
+        pass
+    shutil.copyfile(obj, target)
+
+
+def _store(tmp: Path, sha: str, base_name: str, out_dir: Path, hash_prefix_len: int) -> Tuple[Path, Path]:
+    """Move a finished download into the store; returns ``(readable path, object path)``.
+
+    A PDF already stored (e.g. reached through another URL) is kept and ``tmp``
+    is dropped, so identical bytes are only ever on disk once.
+    """
+    obj = object_path(sha, out_dir)
+    obj.parent.mkdir(parents=True, exist_ok=True)
+    if obj.exists():
+        tmp.unlink(missing_ok=True)
+    else:
+        tmp.replace(obj)
+    final_path = out_dir / f"{_slugify(base_name)}_{sha[:hash_prefix_len]}.pdf"
+    _link_readable(obj, final_path)
+    return final_path, obj
+
+
+def _stored_object(known: dict, out_dir: Path) -> Optional[Path]:
+    """The store object for a previously downloaded PDF, adopting a pre-store file if needed."""
+    obj = object_path(known["pdf_sha256"], out_dir)
+    if obj.exists():
+        return obj
+    legacy = Path(known.get("pdf_path") or "")
+    if not known.get("pdf_path") or not legacy.is_file() or legacy.stat().st_size != known.get("pdf_bytes"):
+        return None
+    obj.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(legacy, obj)
+    except OSError:
+        shutil.copyfile(legacy, obj)
+    return obj
+
+
+def _head(s, url: str, timeout):
+    """HEAD ``url`` following redirects; None when it fails or isn't a 200."""
+    try:
+        resp = s.head(url, timeout=timeout, allow_redirects=True)
+    except requests.exceptions.RequestException:
+        return None
+    return resp if getattr(resp, "status_code", None) == 200 else None
+
+
+def _unchanged_on_server(head, known: dict) -> Optional[dict]:
+    """Compare a HEAD answer with what was recorded at download time.
+
+    Returns the server's validators when they show the PDF is unchanged: the
+    ETag matches, or (without ETags) Last-Modified and Content-Length both do.
+    Anything else, including a failed HEAD, returns None.
+    """
+    if head is None:
+        return None
+    headers = getattr(head, "headers", None) or {}
+    etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+    length = headers.get("Content-Length")
+    if length and not headers.get("Content-Encoding") and length != str(known.get("pdf_bytes")):
+        return None
+    if etag and known.get("pdf_etag"):
+        same = etag == known["pdf_etag"]
+    elif last_modified and known.get("pdf_last_modified"):
+        same = bool(length) and last_modified == known["pdf_last_modified"]
+    else:
+        same = False
+    return {"etag": etag, "last_modified": last_modified} if same else None
+
+
+class _RangeRefused(Exception):
+    """The server answered a segment request with something other than that byte range."""
+
+
+def _range_info(head) -> Optional[dict]:
+    """Size and validators from a HEAD answer, if the body can be fetched in byte ranges."""
+    headers = (getattr(head, "headers", None) or {}) if head is not None else {}
+    length = headers.get("Content-Length", "")
+    validator = headers.get("ETag") or headers.get("Last-Modified")
+    if headers.get("Accept-Ranges", "").lower() != "bytes" or headers.get("Content-Encoding") or not length.isdigit() or not validator:
+        return None
+    return {"length": int(length), "validator": validator, "etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+
+
+def _segment_bounds(size: int, segments: int):
+    step = -(-size // segments)
+    return [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+
+def _fetch_segment(s, url: str, timeout, path: str, start: int, end: int, validator: str, stop: threading.Event) -> int:
+    """Write bytes ``start``..``end`` of ``url`` into their place in ``path``, resuming on drops."""
+    pos = start
+    failures = 0
+    with open(path, "r+b") as f:
+        while pos <= end and not stop.is_set():
+            try:
+                resp = s.get(url, stream=True, timeout=timeout, headers={"Range": f"bytes={pos}-{end}", "If-Range": validator})
+                try:
+                    _raise_for_status(resp, url)
+                    # A 200 here means no ranges after all, or the PDF changed under If-Range
+                    if resp.status_code != 206 or _content_range_start(resp) != pos:
+                        raise _RangeRefused(f"{resp.status_code} for bytes={pos}-{end}")
+                    f.seek(pos)
+                    chunks = _body_chunks(resp, SEGMENT_CHUNK_BYTES)
+                    for chunk in (_sniffed(chunks, resp, url) if pos == 0 else chunks):
+                        if stop.is_set():
+                            break
+                        if chunk:
+                            f.write(chunk)
+                            pos += len(chunk)
+                finally:
+                    _close_quietly(resp)
+                if pos > end + 1:
+                    raise _RangeRefused(f"segment overran: {pos - start} bytes for bytes={start}-{end}")
+                if pos <= end and not stop.is_set():
+                    raise requests.exceptions.ChunkedEncodingError(f"segment ended at {pos} of {start}-{end}")
+            except _RESUMABLE_ERRORS:
+                failures += 1
+                if failures > DOWNLOAD_RESUME_RETRIES:
+                    raise
+    return pos - start
+
+
+def _download_segmented(s, url: str, timeout, out_dir: Path, info: dict, segments: int):
+    """Fetch ``url`` as ``segments`` parallel byte ranges into a preallocated file.
+
+    Returns ``(path, sha256 hasher, size)``, or None when the server won't serve
+    the ranges (the caller then falls back to a single stream).
+    """
+    size = info["length"]
+    parts_dir = out_dir / PART_DIRNAME
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix="seg", suffix=".part", dir=str(parts_dir))
+    try:
+        os.ftruncate(fd, size)
+    finally:
+        os.close(fd)
+
+    stop = threading.Event()
+    bounds = _segment_bounds(size, segments)
+    try:
+        with ThreadPoolExecutor(max_workers=len(bounds), thread_name_prefix="segment") as pool:
+            futures = [pool.submit(_fetch_segment, s, url, timeout, tmp, a, b, info["validator"], stop) for a, b in bounds]
+            try:
+                for fut in as_completed(futures):
+                    fut.result()
+            except BaseException:
+                stop.set()
+                raise
+        check_pdf_trailer(Path(tmp))
+    except _RangeRefused:
+        Path(tmp).unlink(missing_ok=True)
+        return None
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    # Segments land out of order, so the combined SHA-256 is taken over the assembled file
+    return Path(tmp), _hash_file(Path(tmp)), size
+
+
 def download_pdf_deterministic(
     pdf_url: str,
     base_name: str,
@@ -56,43 +506,227 @@ def download_pdf_deterministic(
     timeout: int = 30,
     hash_prefix_len: int = 8,
     out_dir: Optional[Path] = None,
+    known: Optional[dict] = None,
+    segments: Optional[int] = None,
     **kwargs,
 ):
     """Download a PDF deterministically with content-hash naming.
 
-    Uses requests streaming.  Raises requests.HTTPError on failure (including
-    403 WAF blocks — callers that need browser-based bypass should handle this
-    at the orchestration layer via the OpenClaw browser tool).
+    PDFs are stored once by content under ``<out_dir>/objects/`` and the
+    returned ``path`` (``<slug>_<sha8>.pdf``) links to the stored object.
+    ``known`` is the state record of an earlier download of this URL
+    (``pdf_sha256``, ``pdf_bytes``, ``pdf_etag``, ``pdf_last_modified``): when a
+    HEAD shows the server's copy is unchanged, nothing is transferred and the
+    result has ``not_modified`` set.
+
+    With ``segments`` (default ``DOWNLOAD_SEGMENTS``) above 1, PDFs of at least
+    ``SEGMENTED_MIN_BYTES`` whose server takes byte ranges are fetched over that
+    many parallel connections into a preallocated file; anything else falls
+    back to the single stream below.
+
+    Uses requests streaming into ``<out_dir>/.parts/<url key>.part``. When the
+    server advertises ``Accept-Ranges: bytes`` (and an ETag/Last-Modified for
+    ``If-Range``), a dropped connection leaves the partial file in place: the
+    download is resumed with a Range request up to ``DOWNLOAD_RESUME_RETRIES``
+    times, and again on the next call, so only the missing tail is transferred.
+
+    Raises requests.HTTPError on failure (including 403 WAF blocks — callers
+    that need browser-based bypass should handle this at the orchestration
+    layer via the OpenClaw browser tool).
     """
     out_dir = out_dir or PDF_DIR
     out_dir.mkdir(parents=True, exist_ok=True)
 
     url = _strip_url_fragment(pdf_url)
-    s = session or requests
+    s = session or http.get_session()
 
-    resp = s.get(url, stream=True, timeout=timeout)
-    resp.raise_for_status()
+    segments = DOWNLOAD_SEGMENTS if segments is None else segments
+    obj = _stored_object(known, out_dir) if known and known.get("pdf_sha256") else None
+    head = _head(s, url, timeout) if obj or segments > 1 else None
 
-    hasher = hashlib.sha256()
-    total = 0
-    tmp_fd, tmp_path = tempfile.mkstemp(prefix="pdf", dir=str(out_dir))
+    validators = _unchanged_on_server(head, known) if obj else None
+    if validators is not None:
+        sha = known["pdf_sha256"]
+        final_path = out_dir / f"{_slugify(base_name)}_{sha[:hash_prefix_len]}.pdf"
+        _link_readable(obj, final_path)
+        return {
+            "path": str(final_path), "sha256": sha, "bytes": obj.stat().st_size,
+            "object_path": str(obj), "not_modified": True, **validators,
+        }
+
+    info = _range_info(head) if segments > 1 else None
+    if info and info["length"] >= SEGMENTED_MIN_BYTES:
+        done = _download_segmented(s, url, timeout, out_dir, info, segments)
+        if done is not None:
+            tmp, hasher, total = done
+            sha = hasher.hexdigest()
+            final_path, obj = _store(tmp, sha, base_name, out_dir, hash_prefix_len)
+            _cleanup_manual_download_artifacts(out_dir)
+            return {
+                "path": str(final_path), "sha256": sha, "bytes": total, "object_path": str(obj),
+                "etag": info["etag"], "last_modified": info["last_modified"], "segments": segments,
+            }
 
-    with open(tmp_fd, "wb") as f:
-        for chunk in resp.iter_content(8192):
-            if chunk:
-                f.write(chunk)
-                hasher.update(chunk)
-                total += len(chunk)
+    part, meta_path = _part_paths(out_dir, url)
+
+    failures = 0
+    while True:
+        resp, total, hasher = _open_stream(s, url, timeout, part, meta_path)
+        try:
+            chunks = _body_chunks(resp, DOWNLOAD_CHUNK_BYTES)
+            with open(part, "ab") as f:
+                # A resumed tail was preceded by an already-checked start
+                for chunk in (chunks if total else _sniffed(chunks, resp, url)):
+                    if chunk:
+                        f.write(chunk)
+                        hasher.update(chunk)
+                        total += len(chunk)
+            expected = (_load_part_meta(meta_path) or {}).get("length")
+            if expected and total < expected:
+                raise requests.exceptions.ChunkedEncodingError(f"incomplete body: {total} of {expected} bytes")
+            check_pdf_trailer(part)
+            break
+        except (WafChallengeError, InvalidPdfError):
+            # Never keep (or later resume) a body that isn't the PDF
+            _discard_part(part, meta_path)
+            raise
+        except _RESUMABLE_ERRORS:
+            failures += 1
+            if not _resumable(_load_part_meta(meta_path)):
+                _discard_part(part, meta_path)
+                raise
+            if failures > DOWNLOAD_RESUME_RETRIES:
+                raise  # the .part file stays for the next run
+        except BaseException:
+            if not _resumable(_load_part_meta(meta_path)):
+                _discard_part(part, meta_path)
+            raise
+        finally:
+            _close_quietly(resp)
 
     sha = hasher.hexdigest()
-    base = _slugify(base_name)
-    filename = f"{base}_{sha[:hash_prefix_len]}.pdf"
-    final_path = out_dir / filename
-    Path(tmp_path).replace(final_path)
+    meta = _load_part_meta(meta_path) or {}
+    final_path, obj = _store(part, sha, base_name, out_dir, hash_prefix_len)
+    meta_path.unlink(missing_ok=True)
 
     # Best-effort cleanup: if a previous manual download attempt wrote an Azure WAF
     # HTML challenge to a file like manual_download.pdf, remove it now that we have
     # a confirmed good PDF on disk.
     _cleanup_manual_download_artifacts(out_dir)
 
-    return {"path": str(final_path), "sha256": sha, "bytes": total}
+    return {
+        "path": str(final_path), "sha256": sha, "bytes": total, "object_path": str(obj),
+        "etag": meta.get("etag"), "last_modified": meta.get("last_modified"),
+    }
+
+
+def fetch_pdf(pdf_url: str, base_name: str, **kwargs) -> "PdfHandle":
+    """``download_pdf_deterministic``, returning the finished PDF as a ``PdfHandle``.
+
+    The handle carries the hash and size computed while streaming plus the
+    result dict (``handle.result``), so extraction and state recording use the
+    mapped file without reading or hashing it again.
+    """
+    return PdfHandle.from_download(download_pdf_deterministic(pdf_url, base_name, **kwargs))
+
+
+class _BufferReader(io.RawIOBase):
+    """Seekable read-only file object over a buffer.
+
+    Nothing is copied up front; each ``read`` copies just the bytes asked for,
+    and ``readinto`` copies straight into the caller's buffer.
+    """
+
+    def __init__(self, buf):
+        self._view = memoryview(buf)
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def read(self, size=-1):
+        end = len(self._view) if size is None or size < 0 else min(self._pos + size, len(self._view))
+        data = self._view[self._pos:end].tobytes() if end > self._pos else b""
+        self._pos += len(data)
+        return data
+
+    def readall(self):
+        return self.read()
+
+    def readinto(self, b):
+        end = min(self._pos + len(b), len(self._view))
+        n = max(0, end - self._pos)
+        memoryview(b).cast("B")[:n] = self._view[self._pos:end]
+        self._pos += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+@dataclass
+class PdfHandle:
+    """A finished PDF, memory-mapped for the steps after the download.
+
+    ``fetch_pdf`` returns one; built from a download result nothing is hashed
+    or read again: ``sha256`` and ``bytes`` are the values computed while
+    streaming, and ``result`` is the downloader's dict. ``buffer`` maps the
+    file read-only, and ``stream()`` gives the seekable file object that
+    ``parser.extract_text_with_markitdown`` reads. Close streams before the handle.
+    """
+
+    path: Path
+    sha256: str
+    bytes: int
+    object_path: Optional[Path] = None
+    result: dict = field(default_factory=dict, repr=False, compare=False)
+    _map: Optional[mmap.mmap] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_download(cls, dl: dict) -> "PdfHandle":
+        """Handle for a ``download_pdf_deterministic`` result."""
+        obj = dl.get("object_path")
+        return cls(Path(dl["path"]), dl["sha256"], dl["bytes"], Path(obj) if obj else None, result=dl)
+
+    @classmethod
+    def from_path(cls, path) -> "PdfHandle":
+        """Handle for a PDF that didn't come through the downloader, hashed in 1 MB blocks."""
+        path = Path(path)
+        return cls(path, _hash_file(path).hexdigest(), path.stat().st_size)
+
+    @property
+    def buffer(self):
+        """The PDF's bytes, mapped read-only (``b""`` for an empty file)."""
+        if self._map is None:
+            if not self.bytes:
+                return b""
+            with open(self.object_path or self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def stream(self) -> io.RawIOBase:
+        return _BufferReader(self.buffer)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,220 @@
+"""Columnar store for large collections of ``TranscriptEntry``.
+
+A backfill materialises tens of thousands of entries, each a dataclass with its
+own ``__dict__``, a ``datetime`` and several long URL strings. ``EntryTable``
+keeps the same information in parallel columns instead:
+
+* ``ref_no`` and ``published_date`` as signed 64-bit ``array`` columns
+  (-1 for missing; dates as ``ordinal * 86400 + second of day``)
+* titles, statuses and committee URLs interned into small lookup lists, with
+  per-row indices in ``array('I')`` columns
+* ``page_url`` split into an interned prefix (the shared ParlInfo query up to
+  the estimate id) and a short per-row tail
+* ``pdf_url`` and ``resolve_error`` as sparse dicts keyed by row
+
+Sorting uses a single integer key per row, so ordering is one ``list.sort``
+over ints rather than tuple comparisons over dataclasses. Filtering scans
+the columns directly.
+"""
+
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+import re
+import sys
+
+from estimates_monitor.schedule import TranscriptEntry
+
+# ParlInfo display/download URLs share everything up to the estimate id
+_URL_SPLIT_RE = re.compile(r"committees(?:/|%2F)estimate(?:/|%2F)", re.I)
+_NONE = 0xFFFFFFFF  # interned-index sentinel for None
+_DAY_S = 86400
+# Bits reserved for the date part of the combined sort key
+_DATE_BITS = 40
+
+
+class _Interner:
+    __slots__ = ("values", "index")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.index: Dict[str, int] = {}
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NONE
+        i = self.index.get(value)
+        if i is None:
+            i = len(self.values)
+            self.values.append(value)
+            self.index[value] = i
+        return i
+
+    def get(self, i: int) -> Optional[str]:
+        return None if i == _NONE else self.values[i]
+
+
+def _split_url(url: str):
+    m = _URL_SPLIT_RE.search(url)
+    cut = m.end() if m else url.rfind("/") + 1
+    return url[:cut], url[cut:]
+
+
+def _date_key(dt: Optional[datetime]) -> int:
+    if dt is None:
+        return -1
+    return dt.toordinal() * _DAY_S + dt.hour * 3600 + dt.minute * 60 + dt.second
+
+
+def _date_from_key(key: int) -> Optional[datetime]:
+    if key < 0:
+        return None
+    days, secs = divmod(key, _DAY_S)
+    return datetime.fromordinal(days) + timedelta(seconds=secs)
+
+
+class EntryTable:
+    """Column-per-field table of schedule entries; see module docstring."""
+
+    __slots__ = (
+        "ref_no", "date_key", "title_idx", "status_idx", "committee_idx",
+        "page_prefix_idx", "page_tail", "pdf_url", "resolve_error", "blocked",
+        "_titles", "_statuses", "_committees", "_prefixes",
+    )
+
+    def __init__(self, _shared: Optional["EntryTable"] = None):
+        self.ref_no = array("q")
+        self.date_key = array("q")
+        self.title_idx = array("I")
+        self.status_idx = array("I")
+        self.committee_idx = array("I")
+        self.page_prefix_idx = array("I")
+        self.page_tail: List[str] = []
+        # Sparse: most schedule entries have no pdf_url until resolved
+        self.pdf_url: Dict[int, str] = {}
+        self.resolve_error: Dict[int, str] = {}
+        self.blocked = bytearray()
+        # Tables derived by take()/filter() share the interned values
+        src = _shared
+        self._titles = src._titles if src else _Interner()
+        self._statuses = src._statuses if src else _Interner()
+        self._committees = src._committees if src else _Interner()
+        self._prefixes = src._prefixes if src else _Interner()
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[TranscriptEntry]) -> "EntryTable":
+        table = cls()
+        for e in entries:
+            table.append(e)
+        return table
+
+    def append(self, e: TranscriptEntry) -> None:
+        prefix, tail = _split_url(e.page_url or "")
+        if e.pdf_url:
+            self.pdf_url[len(self.page_tail)] = e.pdf_url
+        if e.resolve_error is not None:
+            self.resolve_error[len(self.page_tail)] = e.resolve_error
+        self.ref_no.append(-1 if e.ref_no is None else e.ref_no)
+        self.date_key.append(_date_key(e.published_date))
+        self.title_idx.append(self._titles.add(e.title))
+        self.status_idx.append(self._statuses.add(e.status))
+        self.committee_idx.append(self._committees.add(e.committee_url))
+        self.page_prefix_idx.append(self._prefixes.add(prefix))
+        self.page_tail.append(tail)
+        self.blocked.append(1 if e.parlinfo_blocked else 0)
+
+    def __len__(self) -> int:
+        return len(self.page_tail)
+
+    def __getitem__(self, i: int) -> TranscriptEntry:
+        if i < 0:
+            i += len(self)
+        ref = self.ref_no[i]
+        return TranscriptEntry(
+            title=self._titles.get(self.title_idx[i]),
+            page_url=self._prefixes.get(self.page_prefix_idx[i]) + self.page_tail[i],
+            pdf_url=self.pdf_url.get(i),
+            published_date=_date_from_key(self.date_key[i]),
+            status=self._statuses.get(self.status_idx[i]),
+            committee_url=self._committees.get(self.committee_idx[i]),
+            ref_no=None if ref < 0 else ref,
+            parlinfo_blocked=bool(self.blocked[i]),
+            resolve_error=self.resolve_error.get(i),
+        )
+
+    def __iter__(self) -> Iterator[TranscriptEntry]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_entries(self) -> List[TranscriptEntry]:
+        return list(self)
+
+    def take(self, indices: Sequence[int]) -> "EntryTable":
+        """New table holding rows ``indices`` in that order."""
+        out = EntryTable(_shared=self)
+        for name in ("ref_no", "date_key", "title_idx", "status_idx", "committee_idx", "page_prefix_idx"):
+            col = getattr(self, name)
+            getattr(out, name).extend(col[i] for i in indices)
+        out.page_tail = [self.page_tail[i] for i in indices]
+        out.blocked = bytearray(self.blocked[i] for i in indices)
+        out.pdf_url = {j: self.pdf_url[i] for j, i in enumerate(indices) if i in self.pdf_url}
+        out.resolve_error = {j: self.resolve_error[i] for j, i in enumerate(indices) if i in self.resolve_error}
+        return out
+
+    def sort_keys(self) -> List[int]:
+        """One int per row ordering like ``schedule._sort_key_latest``.
+
+        Missing ref_no/date encode as 0, so they sort below any real value.
+        """
+        return [((r + 1) << _DATE_BITS) | (d + 1) for r, d in zip(self.ref_no, self.date_key)]
+
+    def argsort_latest(self, reverse: bool = True) -> List[int]:
+        keys = self.sort_keys()
+        return sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+
+    def sort_latest(self, reverse: bool = True) -> "EntryTable":
+        return self.take(self.argsort_latest(reverse=reverse))
+
+    def filter(
+        self,
+        status: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        ref_min: Optional[int] = None,
+        ref_max: Optional[int] = None,
+    ) -> "EntryTable":
+        """Rows matching every given bound (dates and refs inclusive).
+
+        A bound on dates or refs excludes rows where that field is missing.
+        """
+        keep = range(len(self))
+        if status is not None:
+            code = self._statuses.index.get(status)
+            col = self.status_idx
+            keep = [i for i in keep if col[i] == code]
+        if date_from is not None or date_to is not None:
+            lo = _date_key(date_from) if date_from is not None else 0
+            hi = _date_key(date_to) if date_to is not None else sys.maxsize
+            col = self.date_key
+            keep = [i for i in keep if col[i] >= 0 and lo <= col[i] <= hi]
+        if ref_min is not None or ref_max is not None:
+            lo = ref_min if ref_min is not None else 0
+            hi = ref_max if ref_max is not None else sys.maxsize
+            col = self.ref_no
+            keep = [i for i in keep if col[i] >= 0 and lo <= col[i] <= hi]
+        return self.take(keep)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the table (columns, tails and interned values)."""
+        total = sum(
+            getattr(self, name).buffer_info()[1] * getattr(self, name).itemsize
+            for name in ("ref_no", "date_key", "title_idx", "status_idx", "committee_idx", "page_prefix_idx")
+        )
+        total += len(self.blocked) + sys.getsizeof(self.page_tail)
+        total += sys.getsizeof(self.pdf_url) + sys.getsizeof(self.resolve_error)
+        total += sum(sys.getsizeof(s) for s in self.page_tail)
+        total += sum(sys.getsizeof(s) for s in self.pdf_url.values())
+        total += sum(sys.getsizeof(s) for s in self.resolve_error.values())
+        for interner in (self._titles, self._statuses, self._committees, self._prefixes):
+            total += sum(sys.getsizeof(s) for s in interner.values)
+        return total
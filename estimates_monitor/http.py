@@ -0,0 +1,413 @@
+"""Shared HTTP client for every network call in the package.
+
+``get_session()`` hands out one process-wide ``requests.Session`` with:
+
+* per-host keep-alive connection pools (``HTTP_POOL_CONNECTIONS`` hosts,
+  ``HTTP_POOL_MAXSIZE`` connections each)
+* retries with jittered exponential backoff on connection errors and on
+  429/5xx answers to idempotent requests (``Retry-After`` is honoured)
+* gzip/deflate, plus brotli and zstd when their decoders are installed
+* ``DEFAULT_HEADERS`` set once on the session
+* a token bucket per host (``HTTP_RATE_LIMITS``) so bulk runs stay under the
+  ParlInfo WAF threshold, and a circuit breaker per host that fails fast with
+  ``CircuitOpenError`` after ``HTTP_BREAKER_THRESHOLD`` consecutive 403/5xx
+  answers, letting one probe through after ``HTTP_BREAKER_COOLDOWN_S``; both
+  apply to each retry attempt, not just the first
+
+Every module falls back to it when no session is injected, so tests keep
+passing their own dummy sessions. The on-disk caches and the schedule archive
+are only used by default for sessions this package built (``is_own_session``),
+so an injected double never leaves fixture pages in ``data/``.
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+import threading
+import time
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from estimates_monitor import cookies
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; estimates-monitor/0.1; +https://github.com/openclaw/openclaw)",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+
+HTTP_POOL_CONNECTIONS = 8
+HTTP_POOL_MAXSIZE = 8
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+# Up to this many seconds of random jitter added to each backoff sleep
+HTTP_BACKOFF_JITTER = 0.5
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# POST is deliberately absent: retrying a tweet could post it twice
+HTTP_RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# (requests per second, burst) by host. A host not listed falls back to its
+# parent domain, so www.aph.gov.au uses "aph.gov.au"; unlisted domains are unlimited.
+HTTP_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "parlinfo.aph.gov.au": (1.0, 3),
+    "aph.gov.au": (4.0, 8),
+}
+# Consecutive 403/5xx/connection failures that open a host's circuit
+HTTP_BREAKER_THRESHOLD = 3
+HTTP_BREAKER_COOLDOWN_S = 120.0
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """A host's circuit is open: recent requests kept failing, so don't send this one."""
+
+    def __init__(self, host: str, retry_in_s: float):
+        super().__init__(f"circuit open for {host}; retry in {retry_in_s:.0f}s")
+        self.host = host
+        self.retry_in_s = retry_in_s
+
+
+def _lookup_host(table: dict, host: str):
+    """``table`` entry for ``host`` or its nearest listed parent domain."""
+    parts = host.split(".")
+    for i in range(len(parts) - 1):
+        value = table.get(".".join(parts[i:]))
+        if value is not None:
+            return value
+    return None
+
+
+class RateLimiter:
+    """Token bucket per host; ``acquire`` sleeps until a token is available."""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, int]]] = None, clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.limits = limits
+        self.clock = clock
+        self.sleep = sleep
+        self._buckets: Dict[str, list] = {}  # host -> [tokens, last refill]
+        self._lock = threading.Lock()
+
+    def _reserve(self, host: str) -> float:
+        """Take a token (possibly going into debt); seconds the caller must wait."""
+        limit = _lookup_host(HTTP_RATE_LIMITS if self.limits is None else self.limits, host)
+        if not limit:
+            return 0.0
+        rate, burst = limit
+        with self._lock:
+            now = self.clock()
+            bucket = self._buckets.setdefault(host, [float(burst), now])
+            bucket[0] = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            bucket[0] -= 1.0
+            return 0.0 if bucket[0] >= 0 else -bucket[0] / rate
+
+    def acquire(self, host: str) -> float:
+        wait = self._reserve(host)
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures -> half-open probe after cooldown."""
+
+    def __init__(self, threshold: int = None, cooldown_s: float = None, clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.cooldown_s = cooldown_s
+        self.clock = clock
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._probing: set = set()
+        self._lock = threading.Lock()
+
+    def _cooldown(self) -> float:
+        return HTTP_BREAKER_COOLDOWN_S if self.cooldown_s is None else self.cooldown_s
+
+    def before_request(self, host: str) -> None:
+        """Raise ``CircuitOpenError`` unless ``host`` may be contacted now."""
+        with self._lock:
+            opened = self._opened_at.get(host)
+            if opened is None:
+                return
+            remaining = opened + self._cooldown() - self.clock()
+            if remaining > 0 or host in self._probing:
+                raise CircuitOpenError(host, max(remaining, 0.0))
+            # Half-open: this request is the single probe
+            self._probing.add(host)
+
+    def record(self, host: str, ok: bool) -> None:
+        threshold = HTTP_BREAKER_THRESHOLD if self.threshold is None else self.threshold
+        with self._lock:
+            self._probing.discard(host)
+            if ok:
+                self._failures.pop(host, None)
+                self._opened_at.pop(host, None)
+                return
+            n = self._failures[host] = self._failures.get(host, 0) + 1
+            if n >= threshold or host in self._opened_at:
+                self._opened_at[host] = self.clock()
+
+    def release_probe(self, host: str) -> None:
+        """End a half-open probe without judging the host (e.g. a local error)."""
+        with self._lock:
+            self._probing.discard(host)
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            return host in self._opened_at
+
+
+# Process-wide guards shared by every session from make_session()
+RATE_LIMITER = RateLimiter()
+CIRCUIT_BREAKER = CircuitBreaker()
+
+
+def _is_failure_status(status: int) -> bool:
+    return status == 403 or status >= 500
+
+
+class _CircuitOpenedDuringRetry(Exception):
+    """Carries a ``CircuitOpenError`` out of urllib3 without being wrapped as a connection error."""
+
+    def __init__(self, error: CircuitOpenError):
+        super().__init__(str(error))
+        self.error = error
+
+
+class GuardedRetry(Retry):
+    """``Retry`` that sends every retry attempt through the rate limiter and breaker.
+
+    urllib3 retries inside one adapter ``send``, so without this a 5xx burst
+    would re-hit the host ``total`` times on a single token. Each failed
+    attempt that is retried is recorded with the breaker here (the adapter
+    judges the last one), and before the next attempt the host must pass the
+    breaker and take a token.
+    """
+
+    rate_limiter: Optional[RateLimiter] = None
+    breaker: Optional[CircuitBreaker] = None
+    host: Optional[str] = None
+
+    def bind(self, rate_limiter: Optional[RateLimiter], breaker: Optional[CircuitBreaker]) -> "GuardedRetry":
+        retry = self.new()
+        retry.rate_limiter = rate_limiter
+        retry.breaker = breaker
+        return retry
+
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.rate_limiter, retry.breaker, retry.host = self.rate_limiter, self.breaker, self.host
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        # Raises once retries are exhausted; the adapter then judges this attempt
+        retry = super().increment(method, url, response=response, error=error, _pool=_pool, _stacktrace=_stacktrace)
+        host = (getattr(_pool, "host", None) or "").lower()
+        retry.host = host or None
+        if host and (error is not None or (response is not None and _is_failure_status(response.status))):
+            (self.breaker or CIRCUIT_BREAKER).record(host, ok=False)
+        return retry
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if not self.host:
+            return
+        try:
+            (self.breaker or CIRCUIT_BREAKER).before_request(self.host)
+        except CircuitOpenError as e:
+            raise _CircuitOpenedDuringRetry(e) from None
+        (self.rate_limiter or RATE_LIMITER).acquire(self.host)
+
+
+class GuardedAdapter(HTTPAdapter):
+    """``HTTPAdapter`` that applies the per-host rate limiter and circuit breaker.
+
+    Uses the module's ``RATE_LIMITER``/``CIRCUIT_BREAKER`` unless given its own.
+    With a ``GuardedRetry`` (as from ``make_retry()``) every urllib3 retry
+    attempt is limited and judged too, not just the first.
+    """
+
+    def __init__(self, *args, rate_limiter: Optional[RateLimiter] = None, breaker: Optional[CircuitBreaker] = None, **kwargs):
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker
+        super().__init__(*args, **kwargs)
+        if isinstance(self.max_retries, GuardedRetry):
+            self.max_retries = self.max_retries.bind(rate_limiter, breaker)
+
+    def send(self, request, **kwargs):
+        host = (urlparse(request.url).hostname or "").lower()
+        breaker = self.breaker or CIRCUIT_BREAKER
+        breaker.before_request(host)
+        (self.rate_limiter or RATE_LIMITER).acquire(host)
+        try:
+            resp = super().send(request, **kwargs)
+        except _CircuitOpenedDuringRetry as e:
+            # The retry that opened the circuit has already been recorded
+            raise e.error from None
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            breaker.record(host, ok=False)
+            raise
+        except BaseException:
+            breaker.release_probe(host)
+            raise
+        breaker.record(host, ok=not _is_failure_status(resp.status_code))
+        return resp
+
+
+_shared: Optional[requests.Session] = None
+_shared_lock = threading.Lock()
+# Sessions from make_session() / aio.make_session(); see is_own_session()
+_own_sessions = weakref.WeakSet()
+
+
+def mark_own_session(s):
+    """Record ``s`` as built by this package; returns it."""
+    try:
+        _own_sessions.add(s)
+    except TypeError:  # not weak-referenceable
+        pass
+    return s
+
+
+def is_own_session(s) -> bool:
+    """True for no session (the shared one is used) or one from ``make_session()``.
+
+    Callers injecting anything else (test doubles, scripts like run_check.py)
+    get no on-disk caching or archiving unless they ask for it explicitly.
+    """
+    return s is None or s in _own_sessions
+
+
+def accept_encoding() -> str:
+    """Content codings urllib3 can decode here."""
+    codings = ["gzip", "deflate"]
+    try:
+        import brotli  # noqa: F401
+        codings.append("br")
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            codings.append("br")
+        except ImportError:
+            pass
+    try:
+        import zstandard  # noqa: F401
+        from urllib3.response import ZstdDecoder  # noqa: F401  (urllib3 >= 2)
+        codings.append("zstd")
+    except ImportError:
+        pass
+    return ", ".join(codings)
+
+
+def make_retry(retries: int = None, backoff_factor: float = None) -> GuardedRetry:
+    kwargs = dict(
+        total=HTTP_RETRIES if retries is None else retries,
+        backoff_factor=HTTP_BACKOFF_FACTOR if backoff_factor is None else backoff_factor,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=HTTP_RETRY_METHODS,
+        respect_retry_after_header=True,
+        # Hand the last 5xx/429 back to the caller's raise_for_status()
+        raise_on_status=False,
+    )
+    try:
+        return GuardedRetry(backoff_jitter=HTTP_BACKOFF_JITTER, **kwargs)
+    except TypeError:  # urllib3 < 2 has no jitter
+        return GuardedRetry(**kwargs)
+
+
+def make_session(
+    retries: int = None,
+    pool_connections: int = None,
+    pool_maxsize: int = None,
+    headers: Optional[dict] = None,
+) -> requests.Session:
+    """A new pooled, retrying session; most callers want ``get_session()``."""
+    s = requests.Session()
+    adapter = GuardedAdapter(
+        pool_connections=pool_connections or HTTP_POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize or HTTP_POOL_MAXSIZE,
+        max_retries=make_retry(retries),
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers.update(DEFAULT_HEADERS)
+    s.headers["Accept-Encoding"] = accept_encoding()
+    if headers:
+        s.headers.update(headers)
+    return mark_own_session(s)
+
+
+def get_session() -> requests.Session:
+    """The process-wide shared session, created on first use with saved cookies loaded."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                s = make_session()
+                # Browser WAF clearance imported with `cli import-cookies`
+                cookies.load_saved_cookies(s.cookies)
+                _shared = s
+    return _shared
+
+
+def save_shared_cookies() -> int:
+    """Write the shared session's ParlInfo cookies back to the jar.
+
+    The WAF rotates its clearance cookies on responses; saving them at the end
+    of a run lets the next one start with the fresh ones. No-op when the shared
+    session was never created.
+    """
+    s = _shared
+    if s is None:
+        return 0
+    return cookies.save_session_cookies(s.cookies, domains=cookies.COOKIE_DOMAINS)
+
+
+def no_retry_session(s):
+    """``s`` without urllib3's automatic retries, for callers with their own deadline.
+
+    The schedule fetch falls back (or hedges) to another candidate URL within
+    its timeout; backoff sleeps hidden inside each GET would eat that budget.
+    Only sessions from ``make_session()`` get a sibling, made once per session:
+    it shares ``s``'s settings (headers, cookies, auth, proxies, verify, hooks)
+    and mounted adapters, with each ``GuardedAdapter`` swapped for a copy that
+    doesn't retry. Any other session (test doubles, a caller's own
+    ``requests.Session`` with a mounted adapter) is returned unchanged.
+    """
+    if not isinstance(s, requests.Session) or not is_own_session(s):
+        return s
+    sibling = getattr(s, "_no_retry_session", None)
+    if sibling is None:
+        with _shared_lock:
+            sibling = getattr(s, "_no_retry_session", None)
+            if sibling is None:
+                sibling = requests.Session()
+                for attr in requests.Session.__attrs__:
+                    if attr != "adapters":
+                        setattr(sibling, attr, getattr(s, attr))
+                sibling.adapters.clear()
+                for prefix, adapter in s.adapters.items():
+                    sibling.mount(prefix, _without_retries(adapter))
+                s._no_retry_session = sibling
+    return sibling
+
+
+def _without_retries(adapter):
+    if not isinstance(adapter, GuardedAdapter):
+        return adapter
+    return GuardedAdapter(
+        pool_connections=adapter._pool_connections,
+        pool_maxsize=adapter._pool_maxsize,
+        max_retries=make_retry(0),
+        rate_limiter=adapter.rate_limiter,
+        breaker=adapter.breaker,
+    )
+
+
+def reset_session() -> None:
+    """Drop the shared session (closing its pools); the next call makes a fresh one."""
+    global _shared
+    with _shared_lock:
+        old, _shared = _shared, None
+    if old is not None:
+        old.close()
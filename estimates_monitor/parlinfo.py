@@ -1,5 +1,34 @@
-from urllib.parse import urljoin, urlparse, urlunparse
-from bs4 import BeautifulSoup
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import List, Optional
+from collections import Counter
+from datetime import datetime
+from urllib.parse import quote, unquote, urljoin, urlparse, urlunparse
+import codecs
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+import requests
+
+from estimates_monitor import http
+
+# Read-through cache of ParlInfo display pages. These sit behind the Azure WAF,
+# so every avoided request lowers our 403 risk.
+DISPLAY_CACHE_DIR = Path("data/parlinfo_cache")
+DISPLAY_CACHE_TTL_S = 6 * 3600
+DISPLAY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Cleared by the CLI's --no-cache flag
+DISPLAY_CACHE_ENABLED = True
+# Read size when streaming a display page looking for its toc_pdf link
+DISPLAY_STREAM_CHUNK_BYTES = 16 * 1024
+# The Azure WAF interstitial, which can come back with a 200
+_CHALLENGE_PAGE_RE = re.compile(r"<title[^>]*>\s*(?:azure waf|just a moment|attention required)|checking your browser|captcha", re.I)
+
 
 def _force_https(url):
     p = urlparse(url)
@@ -9,16 +38,114 @@ def _force_https(url):
     return url
 
 
+_ESTIMATE_ID_RE = re.compile(r"committees/estimate/(\d+)/")
+
+
+class PdfLink:
+    """One anchor from a detail page, decoded once."""
+    __slots__ = ("href", "decoded", "text", "fragment", "estimate_id", "toc_pdf", "download", "pdf")
+
+    def __init__(self, href: str, text: str = ""):
+        self.href = href
+        self.text = text
+        self.decoded = unquote(href)
+        self.fragment = urlparse(href).fragment or ""
+        m = _ESTIMATE_ID_RE.search(self.decoded)
+        self.estimate_id = m.group(1) if m else None
+        self.toc_pdf = "/toc_pdf/" in self.decoded
+        self.download = "parlinfo/download" in self.decoded
+        href_l = href.lower()
+        self.pdf = ".pdf" in href_l or "application%2fpdf" in href_l or "application/pdf" in href_l
+
+    def __repr__(self):
+        return f"PdfLink({self.href!r}, text={self.text!r})"
+
+
+class _AnchorTokenizer(HTMLParser):
+    """Collects ``<a href>`` anchors and their text; nothing else is kept."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links: List[PdfLink] = []
+        self._href = None
+        self._text: List[str] = []
+        self._skip = 0
+
+    def _flush(self):
+        if self._href:
+            self.links.append(PdfLink(self._href, " ".join(self._text)))
+        self._href = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self._flush()
+            self._href = dict(attrs).get("href")
+        elif tag in ("script", "style"):
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag == "a":
+            self._flush()
+        elif tag in ("script", "style") and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if self._href and not self._skip:
+            data = data.strip()
+            if data:
+                self._text.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+class PdfLinkIndex:
+    """Every anchor of a detail page, tokenised in a single pass.
+
+    Both ``extract_pdf_url`` and ``schedule._pick_pdf_link`` query the same index,
+    so resolving a page costs one parse however many strategies run.
+    """
+
+    def __init__(self, links: Optional[List[PdfLink]] = None):
+        self.links = links or []
+
+    @classmethod
+    def from_html(cls, html_text: str) -> "PdfLinkIndex":
+        tok = _AnchorTokenizer()
+        tok.feed(html_text or "")
+        tok.close()
+        return cls(tok.links)
+
+    @classmethod
+    def of(cls, html_or_index) -> "PdfLinkIndex":
+        if isinstance(html_or_index, cls):
+            return html_or_index
+        return cls.from_html(html_or_index)
+
+    def pdf_links(self) -> List[PdfLink]:
+        return [link for link in self.links if link.pdf]
+
+    def for_estimate(self, estimate_id: str) -> List[PdfLink]:
+        return [link for link in self.links if link.estimate_id == estimate_id]
+
+
+def _is_toc_pdf_href(href: str) -> bool:
+    return '/toc_pdf/' in href and (href.lower().endswith('.pdf') or 'fileType' in href)
+
+
 def extract_pdf_url(display_url, html_text):
-    """Given a ParlInfo display page URL and its HTML, return absolute pdf download URL if found.
+    """Given a ParlInfo display page URL and its HTML (or a PdfLinkIndex of it),
+    return absolute pdf download URL if found.
     Normalises parlinfo.aph.gov.au links to https.
     Prefers '/toc_pdf/' links when present.
     """
-    soup = BeautifulSoup(html_text, "html.parser")
-    links = [a['href'] for a in soup.find_all('a', href=True) if a.get('href')]
+    index = PdfLinkIndex.of(html_text)
+    links = [link.href for link in index.links]
     # Prefer toc_pdf links
     for href in links:
-        if '/toc_pdf/' in href and (href.lower().endswith('.pdf') or 'fileType' in href):
+        if _is_toc_pdf_href(href):
             return _force_https(urljoin(display_url, href))
     # Next prefer explicit download links (parlinfo/download) with pdf
     for href in links:
@@ -29,3 +156,296 @@ def extract_pdf_url(display_url, html_text):
         if href.lower().endswith('.pdf'):
             return _force_https(urljoin(display_url, href))
     return None
+
+
+_ESTIMATE_DOC_RE = re.compile(r"committees/estimate/(\d+)/(\d+)")
+# Date spellings seen in toc_pdf file names, e.g. ..._2026_02_10.pdf
+_TEMPLATE_DATE_FORMATS = ("%Y_%m_%d", "%Y-%m-%d", "%d%m%Y")
+
+
+def _template_from_record(display_url: str, rec: dict) -> Optional[str]:
+    pdf_url = rec.get("pdf_url") or ""
+    title = rec.get("title")
+    published = rec.get("published_date")
+    m = _ESTIMATE_DOC_RE.search(unquote(display_url or ""))
+    if "/toc_pdf/" not in pdf_url or not (m and title and published):
+        return None
+    est, doc = m.groups()
+    try:
+        date = datetime.fromisoformat(published)
+    except ValueError:
+        return None
+
+    t = pdf_url.replace("{", "{{").replace("}", "}}")
+    t = t.replace(f"committees/estimate/{est}/{doc}", "committees/estimate/{ref}/{doc}")
+    t = t.replace(f"committees/estimate/{est}/", "committees/estimate/{ref}/")
+    quoted_title = quote(title)
+    if quoted_title not in t:
+        return None
+    t = t.replace(quoted_title, "{title}")
+    for fmt in _TEMPLATE_DATE_FORMATS:
+        stamp = date.strftime(fmt)
+        if stamp in t:
+            t = t.replace(stamp, "{date:" + fmt + "}")
+            break
+    else:
+        return None
+    if "{ref}" not in t:
+        return None
+    return t
+
+
+def learn_toc_pdf_template(seen: dict) -> Optional[str]:
+    """Learn the toc_pdf URL pattern from previously resolved entries.
+
+    ``seen`` is ``state["seen"]`` (display URL -> record with pdf_url, title,
+    published_date). Each resolved toc_pdf link is generalised by swapping its
+    estimate id, doc number, quoted committee title and hearing date for
+    placeholders; the most common resulting template wins.
+    """
+    counts = Counter()
+    for display_url, rec in (seen or {}).items():
+        t = _template_from_record(display_url, rec or {})
+        if t:
+            counts[t] += 1
+    if not counts:
+        return None
+    return counts.most_common(1)[0][0]
+
+
+def synthesise_toc_pdf_url(template: str, display_url: str, title: str, published_date) -> Optional[str]:
+    """Fill a learned template for a schedule entry; None if the entry lacks a field."""
+    m = _ESTIMATE_DOC_RE.search(unquote(display_url or ""))
+    if not (template and m and title and published_date):
+        return None
+    est, doc = m.groups()
+    try:
+        return template.format(ref=est, doc=doc, title=quote(title), date=published_date)
+    except (KeyError, ValueError, IndexError):
+        return None
+
+
+def probe_pdf_url(pdf_url: str, session=None, timeout=15) -> bool:
+    """Cheaply check that a (synthesised) URL serves a PDF.
+
+    Sends a HEAD; servers that refuse HEAD get a one-range GET of the first bytes.
+    """
+    s = session or http.get_session()
+    url = urlunparse(urlparse(pdf_url)._replace(fragment=""))
+    try:
+        resp = s.head(url, timeout=timeout, allow_redirects=True)
+        status = getattr(resp, "status_code", None)
+        if status in (405, 501):
+            resp = s.get(url, headers={"Range": "bytes=0-7"}, timeout=timeout, stream=True)
+            status = getattr(resp, "status_code", None)
+            if status in (200, 206):
+                head = next(iter(resp.iter_content(8)), b"")
+                resp.close()
+                return head.startswith(b"%PDF")
+            return False
+        content_type = (getattr(resp, "headers", None) or {}).get("Content-Type", "")
+        return status == 200 and "pdf" in content_type.lower()
+    except requests.exceptions.RequestException:
+        return False
+
+
+@dataclass
+class DisplayPage:
+    """A fetched (or cached) display page; quacks like the bits of a Response we use."""
+    url: str
+    status_code: int
+    text: str
+    fetched_at: float
+    from_cache: bool = False
+    # False when streaming stopped at the decisive toc_pdf link; text is then a prefix
+    complete: bool = True
+    links: Optional[PdfLinkIndex] = None
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def link_index(self) -> PdfLinkIndex:
+        if self.links is None:
+            self.links = PdfLinkIndex.from_html(self.text)
+        return self.links
+
+
+def normalise_display_url(url: str) -> str:
+    """Cache key for a display URL: decoded, https, lower-case host, no fragment.
+
+    The schedule links ``query=Id%3A%22committees%2F...`` while other places use
+    ``query=Id:"committees/..."``; both refer to the same page.
+    """
+    p = urlparse(unquote(url or "").strip())
+    host = (p.hostname or "").lower()
+    netloc = host + (f":{p.port}" if p.port else "")
+    scheme = "https" if host.endswith("parlinfo.aph.gov.au") else (p.scheme or "https")
+    return urlunparse((scheme, netloc, p.path, p.params, p.query, ""))
+
+
+def _display_cache_path(url: str) -> Path:
+    key = hashlib.sha256(normalise_display_url(url).encode("utf-8")).hexdigest()[:32]
+    return DISPLAY_CACHE_DIR / f"{key}.json"
+
+
+def _read_display_cache(url: str, ttl_s: float, allow_partial: bool = False):
+    path = _display_cache_path(url)
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            rec = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - rec.get("fetched_at", 0) > ttl_s:
+        return None
+    if not rec.get("complete", True) and not allow_partial:
+        return None
+    if not (rec.get("body") or "").strip():
+        # Written before bodies were checked; never worth serving
+        return None
+    try:
+        # mtime doubles as the LRU clock
+        os.utime(path)
+    except OSError:
+        pass
+    return DisplayPage(
+        url=rec["final_url"],
+        status_code=rec["status"],
+        text=rec["body"],
+        fetched_at=rec["fetched_at"],
+        from_cache=True,
+        complete=rec.get("complete", True),
+    )
+
+
+def _cacheable(page: DisplayPage) -> bool:
+    """Only real display pages are cached: a non-empty 2xx body, no challenge, some PDF links.
+
+    Anything else (a WAF page served as 200, an empty body, a page that hasn't
+    got its transcript link yet) would hide the real page for the whole TTL.
+    """
+    if not 200 <= page.status_code < 300 or not page.text.strip():
+        return False
+    if _CHALLENGE_PAGE_RE.search(page.text[:4096]):
+        return False
+    return bool(page.link_index().pdf_links())
+
+
+def _write_display_cache(url: str, page: DisplayPage):
+    DISPLAY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    rec = {
+        "url": normalise_display_url(url),
+        "final_url": page.url,
+        "status": page.status_code,
+        "fetched_at": page.fetched_at,
+        "complete": page.complete,
+        "body": page.text,
+    }
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix="display", dir=str(DISPLAY_CACHE_DIR))
+    with open(tmp_fd, "w", encoding="utf-8") as f:
+        json.dump(rec, f, ensure_ascii=False)
+    Path(tmp_path).replace(_display_cache_path(url))
+    _evict_display_cache()
+
+
+def _evict_display_cache():
+    """Drop least-recently-used pages until the cache fits DISPLAY_CACHE_MAX_BYTES."""
+    try:
+        files = [(p.stat(), p) for p in DISPLAY_CACHE_DIR.glob("*.json")]
+    except OSError:
+        return
+    total = sum(st.st_size for st, _ in files)
+    for st, p in sorted(files, key=lambda item: item[0].st_mtime):
+        if total <= DISPLAY_CACHE_MAX_BYTES:
+            break
+        p.unlink(missing_ok=True)
+        total -= st.st_size
+
+
+def clear_display_cache():
+    for p in DISPLAY_CACHE_DIR.glob("*.json"):
+        p.unlink(missing_ok=True)
+
+
+def _stream_links(resp, estimate_id: str, chunk_size: int):
+    """Tokenise ``resp`` as it arrives, stopping at the decisive toc_pdf link.
+
+    Decisive means the first toc_pdf link in the document (the one
+    ``extract_pdf_url`` would pick) belongs to ``committees/estimate/<estimate_id>/``.
+    Returns ``(text_read, PdfLinkIndex, complete)``.
+    """
+    decoder = codecs.getincrementaldecoder(getattr(resp, "encoding", None) or "utf-8")(errors="replace")
+    tok = _AnchorTokenizer()
+    parts: List[str] = []
+    checked = 0
+    first_toc_seen = False
+    decisive = False
+    for chunk in resp.iter_content(chunk_size):
+        if not chunk:
+            continue
+        piece = chunk if isinstance(chunk, str) else decoder.decode(chunk)
+        parts.append(piece)
+        tok.feed(piece)
+        while checked < len(tok.links) and not first_toc_seen:
+            link = tok.links[checked]
+            checked += 1
+            if _is_toc_pdf_href(link.href):
+                first_toc_seen = True
+                decisive = link.estimate_id == estimate_id
+        if decisive:
+            break
+    if decisive:
+        # Stop reading the socket; the rest of the page can't change the answer
+        close = getattr(resp, "close", None)
+        if close:
+            close()
+    else:
+        parts.append(decoder.decode(b"", final=True))
+        tok.feed(parts[-1])
+    tok.close()
+    return "".join(parts), PdfLinkIndex(tok.links), not decisive
+
+
+def fetch_display_page(display_url, session=None, timeout=30, headers=None, use_cache=None, ttl_s=None, stream_for_estimate=None) -> DisplayPage:
+    """Fetch a ParlInfo display page through the on-disk cache.
+
+    Display pages with PDF links are cached for ``ttl_s`` (default
+    ``DISPLAY_CACHE_TTL_S``); errors, empty bodies and WAF challenge pages are
+    returned but never cached. By default the cache is only used for the
+    package's own sessions (``http.is_own_session``); pass ``use_cache=True``
+    to cache pages fetched through an injected one. Does not raise on HTTP
+    errors — call ``raise_for_status()`` on the result.
+
+    With ``stream_for_estimate`` the body is tokenised while it downloads and the
+    read stops once the decisive toc_pdf link for that estimate id has been seen
+    (the page then has ``complete=False``; ``link_index()`` is already built).
+    Pages without such a link are read in full.
+    """
+    if use_cache is None:
+        use_cache = DISPLAY_CACHE_ENABLED and http.is_own_session(session)
+    ttl_s = DISPLAY_CACHE_TTL_S if ttl_s is None else ttl_s
+    if use_cache:
+        cached = _read_display_cache(display_url, ttl_s, allow_partial=bool(stream_for_estimate))
+        if cached is not None:
+            return cached
+
+    s = session or http.get_session()
+    kwargs = {"timeout": timeout}
+    if headers is not None:
+        kwargs["headers"] = headers
+    if stream_for_estimate:
+        kwargs["stream"] = True
+    resp = s.get(display_url, **kwargs)
+    page = DisplayPage(
+        url=getattr(resp, "url", None) or display_url,
+        status_code=getattr(resp, "status_code", None) or 200,
+        text="",
+        fetched_at=time.time(),
+    )
+    if stream_for_estimate and page.status_code < 400 and hasattr(resp, "iter_content"):
+        page.text, page.links, page.complete = _stream_links(resp, stream_for_estimate, DISPLAY_STREAM_CHUNK_BYTES)
+    else:
+        page.text = resp.text
+    if use_cache and _cacheable(page):
+        _write_display_cache(display_url, page)
+    return page
@@ -1,12 +1,44 @@
 from pathlib import Path
+import tempfile
 
+# Extracted transcript text, one Markdown file per PDF (see save_text)
+TEXT_DIR = Path("data/text")
 
-def extract_text_with_markitdown(pdf_path: str) -> str:
-    """Extract text from a PDF using markitdown. Returns plain text."""
-    p = Path(pdf_path)
-    if not p.exists():
+
+def extract_text_with_markitdown(pdf_path) -> str:
+    """Extract text from a PDF using markitdown. Returns plain text.
+
+    ``pdf_path`` may also be a ``downloader.PdfHandle``; its mapped bytes are
+    handed to markitdown without reopening the file.
+    """
+    is_handle = hasattr(pdf_path, "stream")
+    if not is_handle and not Path(pdf_path).exists():
         raise FileNotFoundError(pdf_path)
-    from markitdown import MarkItDown
+    from markitdown import MarkItDown, StreamInfo
     md = MarkItDown()
-    result = md.convert(str(p))
+    if is_handle:
+        with pdf_path.stream() as f:
+            result = md.convert_stream(f, stream_info=StreamInfo(extension=".pdf", mimetype="application/pdf"))
+    else:
+        result = md.convert(str(Path(pdf_path)))
     return result.text_content
+
+
+# Name used by the agent skill
+extract_text = extract_text_with_markitdown
+
+
+def save_text(pdf, out_dir=None) -> Path:
+    """Extract ``pdf`` (a path or ``PdfHandle``) and write ``<out_dir>/<pdf name>.md``.
+
+    Returns the written path; the file is replaced atomically.
+    """
+    out_dir = Path(out_dir or TEXT_DIR)
+    text = extract_text_with_markitdown(pdf)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / (Path(getattr(pdf, "path", pdf)).stem + ".md")
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix="text", dir=str(out_dir))
+    with open(tmp_fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    Path(tmp_path).replace(out_path)
+    return out_path
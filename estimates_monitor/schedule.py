@@ -1,13 +1,27 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, field
 from typing import Optional, List
 from bs4 import BeautifulSoup
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import requests
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
+from pathlib import Path
+import json
+import logging
 import re
+import tempfile
+import threading
 import time
 
-from estimates_monitor import parlinfo
+from estimates_monitor import archive, http, parlinfo
+
+log = logging.getLogger(__name__)
+
+try:  # optional: ~10x faster schedule parsing
+    import lxml.etree
+    import lxml.html
+except ImportError:  # pragma: no cover - depends on environment
+    lxml = None
 
 
 @dataclass
@@ -21,6 +35,8 @@ class TranscriptEntry:
     ref_no: Optional[int] = None
     # True if ParlInfo returned 403 (WAF block) — agent must use browser to resolve PDF
     parlinfo_blocked: bool = False
+    # Set by resolve_many() when resolving this entry failed for another reason
+    resolve_error: Optional[str] = None
 
 
 # Canonical schedule URL (APH has moved this at least once)
@@ -31,6 +47,38 @@ SCHEDULE_URL_CANDIDATES = [
     "https://www.aph.gov.au/About_Parliament/Estimates/Transcript_Schedule",
 ]
 
+# Per-candidate ETag/Last-Modified validators plus the entries parsed from that
+# response, so an unchanged schedule (HTTP 304) costs no download and no parse.
+SCHEDULE_CACHE_PATH = Path("data/schedule_cache.json")
+# Cleared by the CLI's --no-cache flag
+SCHEDULE_CACHE_ENABLED = True
+
+# Compact per-row fingerprints of the last schedule seen, for diff().
+SCHEDULE_SNAPSHOT_PATH = Path("data/schedule_snapshot.json")
+
+# Seconds to wait on a schedule candidate before racing the next one.
+# None tries candidates strictly one after another.
+SCHEDULE_HEDGE_DELAY_S: Optional[float] = None
+
+# Concurrent ParlInfo detail-page fetches in resolve_many(); kept small for the WAF.
+RESOLVE_MAX_WORKERS = 4
+
+# Learned toc_pdf URL template (see parlinfo.learn_toc_pdf_template). When set,
+# resolve_pdf() tries the synthesised PDF URL before fetching the detail page.
+# The CLI fills this from state; None always goes via the detail page.
+TOC_PDF_TEMPLATE: Optional[str] = None
+
+# The template assumes the schedule date is the date in the PDF file name, which
+# doesn't always hold (ref 29366 is listed as 2025-02-10, its file says
+# 2026_02_10). After a failed probe the template isn't tried again for that
+# committee, and after this many misses not at all for that host (per process).
+TOC_PDF_TEMPLATE_HOST_MISSES = 3
+_template_misses: dict = {}
+_template_misses_lock = threading.Lock()
+
+# Schedule HTML parser: "lxml", "bs4" or "auto" (lxml when installed).
+SCHEDULE_PARSER_BACKEND = "auto"
+
 
 def _parse_date(text: str) -> Optional[datetime]:
     if not text:
@@ -64,7 +112,97 @@ def _normalize_status(text: str) -> str:
     return t
 
 
-def _parse_schedule_html(html: str, base_url: str = SCHEDULE_URL) -> List[TranscriptEntry]:
+def _parse_schedule_html(html: str, base_url: str = SCHEDULE_URL, backend: Optional[str] = None) -> List[TranscriptEntry]:
+    backend = backend or SCHEDULE_PARSER_BACKEND
+    if backend == "auto":
+        backend = "lxml" if lxml is not None else "bs4"
+    if backend not in _PARSER_BACKENDS:
+        raise ValueError(f"Unknown schedule parser backend {backend!r} (choose from {sorted(_PARSER_BACKENDS)})")
+    if backend != "bs4":
+        entries = _PARSER_BACKENDS[backend](html, base_url)
+        if entries is not None:
+            return entries
+    return _parse_schedule_html_bs4(html, base_url)
+
+
+def _lxml_text(el) -> str:
+    # Same result as BeautifulSoup's get_text(" ", strip=True)
+    return " ".join(t.strip() for t in el.itertext() if t.strip())
+
+
+def _parse_schedule_rows_lxml(html: str, base_url: str = SCHEDULE_URL) -> Optional[List[TranscriptEntry]]:
+    """Pruned scan that only visits transcript table rows.
+
+    Produces the same entries as the BeautifulSoup parser for the real APH page,
+    but skips the navigation lists. Returns None when the page needs the generic
+    fallback (no usable table rows, or rows that aren't date/committee/ref/transcript
+    shaped) so the caller can hand it to the BeautifulSoup parser instead.
+    """
+    if lxml is None:
+        return None
+    try:
+        doc = lxml.html.document_fromstring(html)
+    except (ValueError, lxml.etree.ParserError):
+        return None
+    # BeautifulSoup leaves script/style strings out of get_text()
+    lxml.etree.strip_elements(doc, "script", "style", "template", with_tail=False)
+
+    entries: List[TranscriptEntry] = []
+    seen_links = set()
+    for tr in doc.xpath("//table//tbody//tr"):
+        tds = tr.xpath(".//td")
+        if len(tds) < 3:
+            if tr.xpath(".//a[@href]"):
+                return None
+            continue
+
+        # Cheap pre-check before any text extraction: the transcript cell needs
+        # a "published" link, otherwise the row is skipped anyway.
+        transcript_a = None
+        for a in tds[-1].xpath(".//a[@href]"):
+            if "published" in _lxml_text(a).lower():
+                transcript_a = a
+                break
+        if transcript_a is None:
+            continue
+
+        href = transcript_a.get("href")
+        if href in seen_links:
+            continue
+        seen_links.add(href)
+
+        status = _normalize_status(_lxml_text(transcript_a))
+        if not (status.lower().startswith("published") or "published" in status.lower()):
+            continue
+
+        date_text = _lxml_text(tds[0])
+        published_date = _parse_date(date_text) if date_text else None
+
+        committee_links = tds[1].xpath(".//a[@href]")
+        committee_a = committee_links[0] if committee_links else None
+        committee_url = urljoin(base_url, committee_a.get("href")) if committee_a is not None else None
+        title = _lxml_text(committee_a) if committee_a is not None else _lxml_text(tds[1])
+
+        m_ref = re.search(r"(\d+)", _lxml_text(tds[2]))
+        ref_no = int(m_ref.group(1)) if m_ref else None
+
+        entries.append(
+            TranscriptEntry(
+                title=title,
+                page_url=urljoin(base_url, href),
+                pdf_url=None,
+                published_date=published_date,
+                status=status,
+                committee_url=committee_url,
+                ref_no=ref_no,
+            )
+        )
+    if not entries:
+        return None
+    return entries
+
+
+def _parse_schedule_html_bs4(html: str, base_url: str = SCHEDULE_URL) -> List[TranscriptEntry]:
     soup = BeautifulSoup(html, "html.parser")
     entries: List[TranscriptEntry] = []
     # Prefer structured rows (table rows, list items); fall back to any links
@@ -173,6 +311,12 @@ def _parse_schedule_html(html: str, base_url: str = SCHEDULE_URL) -> List[Transc
     return entries
 
 
+_PARSER_BACKENDS = {
+    "lxml": _parse_schedule_rows_lxml,
+    "bs4": _parse_schedule_html_bs4,
+}
+
+
 def _looks_like_aph_404(resp) -> bool:
     # APH sometimes returns a 404 helper page URL like /Help/404?item=...
     url = getattr(resp, "url", "") or ""
@@ -182,14 +326,161 @@ def _looks_like_aph_404(resp) -> bool:
     return status == 404
 
 
-DEFAULT_HEADERS = {
-    "User-Agent": "Mozilla/5.0 (compatible; estimates-monitor/0.1; +https://github.com/openclaw/openclaw)",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-}
+# Kept for callers that pass headers explicitly (e.g. with an injected session)
+DEFAULT_HEADERS = http.DEFAULT_HEADERS
 
 
-def _fetch_schedule(session: Optional[requests.Session] = None, timeout_s: int = 30):
-    s = session or requests
+def _entry_to_dict(e: TranscriptEntry) -> dict:
+    d = asdict(e)
+    d["published_date"] = e.published_date.isoformat() if e.published_date else None
+    return d
+
+
+def _entry_from_dict(d: dict) -> TranscriptEntry:
+    d = dict(d)
+    if d.get("published_date"):
+        d["published_date"] = datetime.fromisoformat(d["published_date"])
+    return TranscriptEntry(**d)
+
+
+def _load_schedule_cache() -> dict:
+    if not SCHEDULE_CACHE_PATH.exists():
+        return {}
+    try:
+        with SCHEDULE_CACHE_PATH.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # A corrupt cache only costs us one unconditional fetch
+        return {}
+
+
+def _save_schedule_cache(cache: dict):
+    SCHEDULE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix="schedule_cache", dir=str(SCHEDULE_CACHE_PATH.parent))
+    with open(tmp_fd, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    Path(tmp_path).replace(SCHEDULE_CACHE_PATH)
+
+
+def _conditional_headers(record: Optional[dict]) -> dict:
+    headers = {}
+    if not record:
+        return headers
+    if record.get("etag"):
+        headers["If-None-Match"] = record["etag"]
+    if record.get("last_modified"):
+        headers["If-Modified-Since"] = record["last_modified"]
+    return headers
+
+
+class _SkipCandidate(Exception):
+    """Candidate answered with APH's 404 helper page; move on to the next one."""
+
+
+def _get_schedule_candidate(s, url: str, timeout, validators: Optional[dict] = None):
+    headers = dict(DEFAULT_HEADERS)
+    headers.update(_conditional_headers((validators or {}).get(url)))
+    resp = s.get(url, headers=headers, timeout=timeout)
+
+    # if requests, resp.url is the final URL after redirects
+    if _looks_like_aph_404(resp):
+        raise _SkipCandidate(url)
+
+    status = getattr(resp, "status_code", None)
+    if status and status >= 500:
+        raise requests.exceptions.HTTPError(f"{status} Server Error for url: {url}", response=resp)
+
+    resp.raise_for_status()
+    return resp
+
+
+def _close_quietly(resp):
+    try:
+        resp.close()
+    except Exception:
+        pass
+
+
+def _fetch_schedule_hedged(s, timeout_s: int, validators: Optional[dict], hedge_delay_s: float):
+    """Race the schedule candidates: each one not answered within ``hedge_delay_s``
+    gets the next candidate fired alongside it. First valid response wins.
+    """
+    deadline = time.time() + max(1, timeout_s)
+    queue = list(SCHEDULE_URL_CANDIDATES)
+    in_flight = {}
+    last_exc = None
+
+    def _discard_loser(fut):
+        # Requests already on the wire can't be aborted; release their connection when they land
+        if not fut.cancelled() and fut.exception() is None:
+            _close_quietly(fut.result())
+
+    def _launch(pool):
+        url = queue.pop(0)
+        remaining = max(1, int(deadline - time.time()))
+        # Separate connect/read timeouts. Keep connect tight so we fail fast on network issues.
+        fut = pool.submit(_get_schedule_candidate, s, url, (5, remaining), validators)
+        in_flight[fut] = url
+
+    pool = ThreadPoolExecutor(max_workers=max(1, len(queue)), thread_name_prefix="schedule-hedge")
+    try:
+        if queue:
+            _launch(pool)
+        while in_flight:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            wait_s = min(hedge_delay_s, remaining) if queue else remaining
+            done, _ = wait(list(in_flight), timeout=wait_s, return_when=FIRST_COMPLETED)
+            if not done:
+                # Hedge delay elapsed without an answer: race the next candidate
+                if queue:
+                    _launch(pool)
+                continue
+            for fut in done:
+                url = in_flight.pop(fut)
+                try:
+                    resp = fut.result()
+                except _SkipCandidate:
+                    continue
+                except Exception as e:
+                    last_exc = e
+                    continue
+                for other in in_flight:
+                    other.cancel()
+                    other.add_done_callback(_discard_loser)
+                return url, resp
+            # Every finished candidate failed; fall back without waiting out the delay
+            if queue:
+                _launch(pool)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    if last_exc:
+        raise last_exc
+    raise RuntimeError("Failed to fetch schedule")
+
+
+def _fetch_schedule_from(
+    session: Optional[requests.Session] = None,
+    timeout_s: int = 30,
+    validators: Optional[dict] = None,
+    hedge_delay_s: Optional[float] = None,
+):
+    """Fetch the schedule page, returning ``(candidate_url, response)``.
+
+    ``validators`` maps candidate URLs to cache records; when a record exists its
+    ETag/Last-Modified are sent so APH can answer ``304 Not Modified``.
+    ``hedge_delay_s`` (default ``SCHEDULE_HEDGE_DELAY_S``) switches from trying
+    candidates one after another to hedged requests.
+    """
+    # Falling back to the next candidate is the retry; urllib3's own would overrun timeout_s
+    s = http.no_retry_session(session or http.get_session())
+    if hedge_delay_s is None:
+        hedge_delay_s = SCHEDULE_HEDGE_DELAY_S
+    if hedge_delay_s is not None:
+        return _fetch_schedule_hedged(s, timeout_s, validators, hedge_delay_s)
+
     last_exc = None
 
     # Be resilient to transient APH outages (502/503/504) and slow responses.
@@ -202,19 +493,9 @@ def _fetch_schedule(session: Optional[requests.Session] = None, timeout_s: int =
             break
         try:
             # Separate connect/read timeouts. Keep connect tight so we fail fast on network issues.
-            resp = s.get(url, headers=DEFAULT_HEADERS, timeout=(5, remaining))
-
-            # if requests, resp.url is the final URL after redirects
-            if _looks_like_aph_404(resp):
-                continue
-
-            status = getattr(resp, "status_code", None)
-            if status and status >= 500:
-                last_exc = requests.exceptions.HTTPError(f"{status} Server Error for url: {url}", response=resp)
-                continue
-
-            resp.raise_for_status()
-            return resp
+            return url, _get_schedule_candidate(s, url, (5, remaining), validators)
+        except _SkipCandidate:
+            continue
         except Exception as e:
             last_exc = e
             continue
@@ -224,10 +505,164 @@ def _fetch_schedule(session: Optional[requests.Session] = None, timeout_s: int =
     raise RuntimeError("Failed to fetch schedule")
 
 
-def get_schedule(session: Optional[requests.Session] = None, timeout_s: int = 30) -> List[TranscriptEntry]:
-    resp = _fetch_schedule(session=session, timeout_s=timeout_s)
+def _fetch_schedule(session: Optional[requests.Session] = None, timeout_s: int = 30):
+    _, resp = _fetch_schedule_from(session=session, timeout_s=timeout_s)
+    return resp
+
+
+def get_schedule(
+    session: Optional[requests.Session] = None,
+    timeout_s: int = 30,
+    use_cache: bool = True,
+    hedge_delay_s: Optional[float] = None,
+    archive_pages: Optional[bool] = None,
+) -> List[TranscriptEntry]:
+    """Fetch and parse the schedule.
+
+    With ``use_cache`` the request is conditional: a 304 returns the entries
+    parsed on the previous poll straight from ``SCHEDULE_CACHE_PATH``.
+    Fetched pages go to the schedule archive when ``archive_pages`` is true;
+    by default only for the package's own sessions (``http.is_own_session``),
+    so an injected double's fixture HTML never turns up in ``replay_entries``.
+    """
+    use_cache = use_cache and SCHEDULE_CACHE_ENABLED
+    cache = _load_schedule_cache() if use_cache else {}
+    url, resp = _fetch_schedule_from(session=session, timeout_s=timeout_s, validators=cache, hedge_delay_s=hedge_delay_s)
+
+    if getattr(resp, "status_code", None) == 304:
+        record = cache.get(url)
+        if record is not None:
+            return [_entry_from_dict(d) for d in record.get("entries", [])]
+        # Validators without a matching record should not happen; refetch in full.
+        url, resp = _fetch_schedule_from(session=session, timeout_s=timeout_s, hedge_delay_s=hedge_delay_s)
+
     base_url = getattr(resp, "url", None) or SCHEDULE_URL
-    return _parse_schedule_html(resp.text, base_url=base_url)
+    if archive_pages is None:
+        archive_pages = http.is_own_session(session)
+    if archive_pages and archive.ARCHIVE_ENABLED:
+        try:
+            archive.store(resp.text, base_url)
+        except OSError as e:
+            # The archive is a record, not a dependency of polling
+            log.warning("schedule archive write failed: %s", e)
+    entries = _parse_schedule_html(resp.text, base_url=base_url)
+
+    if use_cache:
+        headers = getattr(resp, "headers", None) or {}
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if etag or last_modified:
+            cache[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "final_url": base_url,
+                "entries": [_entry_to_dict(e) for e in entries],
+            }
+            _save_schedule_cache(cache)
+        elif cache.pop(url, None) is not None:
+            # Server stopped sending validators; don't replay a stale record.
+            _save_schedule_cache(cache)
+    return entries
+
+
+@dataclass
+class ScheduleDelta:
+    """Rows that differ between a previous schedule snapshot and the current one."""
+    added: List[TranscriptEntry] = field(default_factory=list)
+    changed: List[TranscriptEntry] = field(default_factory=list)
+    removed: List[TranscriptEntry] = field(default_factory=list)
+    # Snapshot of the current schedule; pass it to the next diff() call
+    snapshot: dict = field(default_factory=dict)
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+
+# Column order of a snapshot row; (ref_no, status, page_url) is the fingerprint
+_SNAPSHOT_FIELDS = ("ref_no", "status", "page_url", "title", "published_date", "committee_url")
+
+
+def _row_key(e: TranscriptEntry) -> str:
+    # Ref No. identifies a hearing row; older layouts without one fall back to the link
+    return str(e.ref_no) if e.ref_no is not None else e.page_url
+
+
+def snapshot_entries(entries: List[TranscriptEntry]) -> dict:
+    rows = {}
+    for e in entries:
+        d = _entry_to_dict(e)
+        rows[_row_key(e)] = [d[k] for k in _SNAPSHOT_FIELDS]
+    return {"rows": rows}
+
+
+def _entry_from_snapshot_row(row: list) -> TranscriptEntry:
+    d = dict(zip(_SNAPSHOT_FIELDS, row))
+    d["pdf_url"] = None
+    return _entry_from_dict(d)
+
+
+def load_schedule_snapshot(path: Optional[Path] = None) -> dict:
+    path = path or SCHEDULE_SNAPSHOT_PATH
+    if not path.exists():
+        return {"rows": {}}
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_schedule_snapshot(snapshot: dict, path: Optional[Path] = None):
+    path = path or SCHEDULE_SNAPSHOT_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.stem, dir=str(path.parent))
+    with open(tmp_fd, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+    Path(tmp_path).replace(path)
+
+
+def diff(
+    previous_snapshot: Optional[dict] = None,
+    entries: Optional[List[TranscriptEntry]] = None,
+    session: Optional[requests.Session] = None,
+    timeout_s: int = 30,
+    use_cache: bool = True,
+    save: bool = True,
+    snapshot_path: Optional[Path] = None,
+) -> ScheduleDelta:
+    """Compare the current schedule against a previous snapshot.
+
+    ``previous_snapshot`` defaults to the one persisted at ``SCHEDULE_SNAPSHOT_PATH``
+    and ``entries`` to a fresh ``get_schedule()``. Rows are matched by Ref No.; a row
+    whose status or transcript link moved (e.g. "Published" -> "Published in full")
+    is reported as changed. Added and changed rows are ordered latest first.
+    With ``save`` the current snapshot replaces the persisted one. ``snapshot_path``
+    keeps a separate snapshot (``watch`` has its own, so ``cli diff`` isn't consumed).
+    """
+    if previous_snapshot is None:
+        previous_snapshot = load_schedule_snapshot(snapshot_path)
+    if entries is None:
+        entries = get_schedule(session=session, timeout_s=timeout_s, use_cache=use_cache)
+
+    current = snapshot_entries(entries)
+    prev_rows = previous_snapshot.get("rows", {})
+    cur_rows = current["rows"]
+    # ref_no, status and page_url lead each row
+    fingerprint = slice(0, 3)
+
+    delta = ScheduleDelta(snapshot=current)
+    for e in entries:
+        old = prev_rows.get(_row_key(e))
+        if old is None:
+            delta.added.append(e)
+        elif old[fingerprint] != cur_rows[_row_key(e)][fingerprint]:
+            delta.changed.append(e)
+    for key, row in prev_rows.items():
+        if key not in cur_rows:
+            delta.removed.append(_entry_from_snapshot_row(row))
+    delta.added.sort(key=_sort_key_latest, reverse=True)
+    delta.changed.sort(key=_sort_key_latest, reverse=True)
+
+    if save:
+        save_schedule_snapshot(current, snapshot_path)
+    return delta
 
 
 def _sort_key_latest(e: TranscriptEntry):
@@ -250,67 +685,161 @@ def _extract_estimate_id_parts(display_url: str):
     return est, doc, f"committees/estimate/{est}/{doc}"
 
 
-def _pick_pdf_link(html: str, base_url: str, estimate_id: str = None, id_str: str = None):
-    soup = BeautifulSoup(html, "html.parser")
-    links = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if not href:
-            continue
-        href_l = href.lower()
-        if ".pdf" not in href_l and "application%2fpdf" not in href_l and "application/pdf" not in href_l:
-            continue
-        if "parlinfo/download" not in href_l and not href_l.endswith(".pdf"):
-            # allow generic .pdf links too
-            pass
-        links.append((a.get_text(" ", strip=True) or "", href))
-
+def _pick_pdf_link(html, base_url: str, estimate_id: str = None, id_str: str = None):
+    # html may be the raw detail page or an already-built parlinfo.PdfLinkIndex
+    links = parlinfo.PdfLinkIndex.of(html).pdf_links()
     if not links:
         return None
 
     # Filter to matching estimate id if possible
     if estimate_id:
-        decoded_links = []
-        from urllib.parse import unquote, urlparse
-        for txt, href in links:
-            decoded_links.append((txt, href, unquote(href)))
         # Prefer explicit ParlInfo download links for this estimate id
-        matching = [(txt, href, dec) for (txt, href, dec) in decoded_links if f"parlinfo/download" in dec and f"committees/estimate/{estimate_id}/" in dec]
+        matching = [link for link in links if link.download and f"committees/estimate/{estimate_id}/" in link.decoded]
         if matching:
             # Hard preference: if any toc_pdf links exist, restrict to those
-            toc = [(txt, href, dec) for (txt, href, dec) in matching if "/toc_pdf/" in dec]
+            toc = [link for link in matching if link.toc_pdf]
             if toc:
                 matching = toc
             # Prefer ones whose fragment references the exact id_str (e.g. #search=...)
             if id_str:
-                exact = []
-                for (txt, href, dec) in matching:
-                    parsed = urlparse(href)
-                    frag = parsed.fragment or ""
-                    if id_str in frag or id_str in dec:
-                        exact.append((txt, href, dec))
+                exact = [link for link in matching if id_str in link.fragment or id_str in link.decoded]
                 if exact:
                     matching = exact
             # pick first after filtering
-            _, href, dec = matching[0]
+            chosen = matching[0]
             # validate final choice contains committees/estimate/<id>/
-            if f"committees/estimate/{estimate_id}/" in dec:
-                return urljoin(base_url, href)
+            if f"committees/estimate/{estimate_id}/" in chosen.decoded:
+                return urljoin(base_url, chosen.href)
             # otherwise fall through to allow other heuristics
         # Additional preference: if any link explicitly contains /toc_pdf/ for this estimate id, pick it
-        for txt, href, dec in decoded_links:
-            if f"committees/estimate/{estimate_id}/" in dec and "/toc_pdf/" in dec:
-                return urljoin(base_url, href)
+        for link in links:
+            if f"committees/estimate/{estimate_id}/" in link.decoded and link.toc_pdf:
+                return urljoin(base_url, link.href)
 
     # Fallback: first pdf link
-    return urljoin(base_url, links[0][1])
+    return urljoin(base_url, links[0].href)
+
+
+def _template_keys(entry: TranscriptEntry):
+    host = (urlparse(entry.page_url).hostname or "").lower()
+    return ("host", host), ("committee", host, entry.title)
+
+
+def _template_usable(entry: TranscriptEntry) -> bool:
+    host_key, committee_key = _template_keys(entry)
+    with _template_misses_lock:
+        return committee_key not in _template_misses and _template_misses.get(host_key, 0) < TOC_PDF_TEMPLATE_HOST_MISSES
+
+
+def _record_template_miss(entry: TranscriptEntry) -> None:
+    host_key, committee_key = _template_keys(entry)
+    with _template_misses_lock:
+        _template_misses[committee_key] = 1
+        _template_misses[host_key] = _template_misses.get(host_key, 0) + 1
+    log.info("toc_pdf template missed for %s (%s); using the detail page", entry.title, host_key[1])
+
+
+def resolve_pdf(
+    entry: TranscriptEntry,
+    session: Optional[requests.Session] = None,
+    timeout_s: int = 30,
+    toc_pdf_template: Optional[str] = None,
+) -> TranscriptEntry:
+    """Fill in ``entry.pdf_url`` from its ParlInfo detail page (in place).
+
+    With a toc_pdf template (argument, else ``TOC_PDF_TEMPLATE``) the PDF URL is
+    synthesised from the entry and probed first; the detail page is only fetched
+    when that probe fails, and a miss stops the template being tried for that
+    committee (or, after ``TOC_PDF_TEMPLATE_HOST_MISSES``, that host). A 403 (WAF block) on the detail page sets
+    ``parlinfo_blocked`` and leaves ``pdf_url`` as None; any other failure propagates.
+    """
+    if entry.pdf_url:
+        return entry
+    s = session or http.get_session()
+    template = toc_pdf_template or TOC_PDF_TEMPLATE
+    if template and _template_usable(entry):
+        candidate = parlinfo.synthesise_toc_pdf_url(template, entry.page_url, entry.title, entry.published_date)
+        if candidate:
+            if parlinfo.probe_pdf_url(candidate, session=s, timeout=timeout_s):
+                entry.pdf_url = candidate
+                return entry
+            _record_template_miss(entry)
+    # ensure pdf_url resolved: if missing, fetch detail page and look for .pdf link
+    detail_base = entry.page_url
+    parsed_page = urlparse(entry.page_url)
+    hostname = (parsed_page.hostname or "").lower()
+    est_id, _, id_str = _extract_estimate_id_parts(entry.page_url)
+    try:
+        # Served from the on-disk display-page cache when we've seen it recently.
+        # On ParlInfo, stop downloading once the estimate's toc_pdf link has streamed past.
+        detail_resp = parlinfo.fetch_display_page(
+            entry.page_url,
+            session=s,
+            timeout=timeout_s,
+            headers=DEFAULT_HEADERS,
+            stream_for_estimate=est_id if "parlinfo.aph.gov.au" in hostname else None,
+        )
+        detail_resp.raise_for_status()
+        detail_base = detail_resp.url or entry.page_url
+    except Exception as e:
+        # If we got a 403 from ParlInfo (WAF block), mark the entry so the
+        # agent workflow can use its browser tool to bypass the WAF.
+        # Do NOT fall back to the committee page — it has unrelated PDFs.
+        # An open circuit means recent requests were 403s too: fail fast the same way.
+        resp_obj = getattr(e, 'response', None)
+        resp_status = getattr(resp_obj, 'status_code', None)
+        if resp_status == 403 or isinstance(e, http.CircuitOpenError):
+            entry.parlinfo_blocked = True
+            return entry  # pdf_url stays None; agent handles browser bypass
+        else:
+            # propagate original exception for non-403 errors
+            raise
+
+    # Tokenise the page once; both strategies below query the same link index
+    links = detail_resp.link_index()
+
+    # Try the specialised ParlInfo extractor first (knows about toc_pdf links)
+    if "parlinfo.aph.gov.au" in hostname:
+        entry.pdf_url = parlinfo.extract_pdf_url(entry.page_url, links)
+
+    # Generic fallback: scan HTML for any PDF link matching the estimate ID
+    if not entry.pdf_url:
+        entry.pdf_url = _pick_pdf_link(links, detail_base, estimate_id=est_id, id_str=id_str)
+    return entry
+
+
+def resolve_many(
+    entries: List[TranscriptEntry],
+    session: Optional[requests.Session] = None,
+    max_workers: Optional[int] = None,
+    timeout_s: int = 30,
+) -> List[TranscriptEntry]:
+    """Resolve ``pdf_url`` for every entry concurrently, in place.
+
+    Detail pages are fetched on a bounded thread pool of ``max_workers``
+    (default ``RESOLVE_MAX_WORKERS``); each entry is handled as in
+    ``resolve_pdf`` (403 sets ``parlinfo_blocked``). Any other failure is
+    recorded on that entry's ``resolve_error`` and the rest are still returned,
+    in the order given, i.e. schedule order.
+    """
+    todo = [e for e in entries if not e.pdf_url]
+    if todo:
+        workers = max(1, min(max_workers or RESOLVE_MAX_WORKERS, len(todo)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resolve") as pool:
+            futures = [pool.submit(resolve_pdf, e, session=session, timeout_s=timeout_s) for e in todo]
+        for e, fut in zip(todo, futures):
+            try:
+                fut.result()
+            except Exception as exc:
+                e.resolve_error = f"{type(exc).__name__}: {exc}"
+                log.warning("resolving %s failed: %s", e.page_url, e.resolve_error)
+            else:
+                e.resolve_error = None
+    return list(entries)
 
 
-def get_latest_published(session: Optional[requests.Session] = None, is_seen_func=None, timeout_s: int = 30) -> Optional[TranscriptEntry]:
-    s = session or requests
-    resp = _fetch_schedule(session=session, timeout_s=timeout_s)
-    base_url = getattr(resp, "url", None) or SCHEDULE_URL
-    entries = _parse_schedule_html(resp.text, base_url=base_url)
+def get_latest_published(session: Optional[requests.Session] = None, is_seen_func=None, timeout_s: int = 30, use_cache: bool = True) -> Optional[TranscriptEntry]:
+    entries = get_schedule(session=session, timeout_s=timeout_s, use_cache=use_cache)
     if not entries:
         return None
 
@@ -325,40 +854,4 @@ def get_latest_published(session: Optional[requests.Session] = None, is_seen_fun
                 break
     if chosen is None:
         chosen = entries[0]
-    # ensure pdf_url resolved: if missing, fetch detail page and look for .pdf link
-    if not chosen.pdf_url:
-        detail_html = None
-        detail_base = chosen.page_url
-        try:
-            detail_resp = s.get(chosen.page_url, headers=DEFAULT_HEADERS, timeout=timeout_s)
-            # Some session implementations (tests) may not raise a requests HTTPError with a response attached
-            # so normalise: if status_code==403, raise an HTTPError to trigger fallback behaviour below.
-            if getattr(detail_resp, 'status_code', None) == 403:
-                raise requests.exceptions.HTTPError(response=detail_resp)
-            detail_resp.raise_for_status()
-            detail_html = detail_resp.text
-            detail_base = getattr(detail_resp, "url", None) or chosen.page_url
-        except Exception as e:
-            # If we got a 403 from ParlInfo (WAF block), mark the entry so the
-            # agent workflow can use its browser tool to bypass the WAF.
-            # Do NOT fall back to the committee page — it has unrelated PDFs.
-            resp_obj = getattr(e, 'response', None)
-            resp_status = getattr(resp_obj, 'status_code', None)
-            if resp_status == 403:
-                chosen.parlinfo_blocked = True
-                return chosen  # pdf_url stays None; agent handles browser bypass
-            else:
-                # propagate original exception for non-403 errors
-                raise
-
-        # Try the specialised ParlInfo extractor first (knows about toc_pdf links)
-        parsed_page = urlparse(chosen.page_url)
-        hostname = (parsed_page.hostname or "").lower()
-        if "parlinfo.aph.gov.au" in hostname:
-            chosen.pdf_url = parlinfo.extract_pdf_url(chosen.page_url, detail_html or "")
-
-        # Generic fallback: scan HTML for any PDF link matching the estimate ID
-        if not chosen.pdf_url:
-            est_id, _, id_str = _extract_estimate_id_parts(chosen.page_url)
-            chosen.pdf_url = _pick_pdf_link(detail_html, detail_base, estimate_id=est_id, id_str=id_str)
-    return chosen
+    return resolve_pdf(chosen, session=session, timeout_s=timeout_s)
@@ -0,0 +1,403 @@
+"""Local stand-in for the APH schedule and ParlInfo, for load and failure testing.
+
+``StandinServer`` runs a threaded stdlib HTTP server on localhost that serves:
+
+* ``/schedule``: a synthetic schedule table with ``rows`` transcript rows
+* ``/old-schedule``: redirects to APH's ``/Help/404`` page, like a dead candidate
+* ParlInfo-shaped display pages and ``toc_pdf`` PDF downloads for every row
+* PDFs of ``pdf_bytes`` with ETag/Last-Modified, HEAD and single-range support
+* 5xx bursts: every ``burst_every``-th request starts ``burst_len`` ``burst_status`` answers
+* WAF-style 403 challenge pages for every ``waf_every``-th ref unless the request
+  carries ``waf_cookie``
+* optional per-request latency, PDF bandwidth throttling and dropped connections
+
+Point the package at it by setting ``schedule.SCHEDULE_URL_CANDIDATES`` to
+``server.schedule_candidates``; display and PDF links on the pages lead back
+to the server. ``server.hits`` counts what was served, by kind (and PDF body
+bytes under ``"pdf_bytes"``).
+
+Run standalone with ``python -m estimates_monitor.standin --rows 5000``.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, timedelta
+from email.utils import format_datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+from urllib.parse import quote, unquote
+import argparse
+import datetime as _dt
+import hashlib
+import random
+import re
+import threading
+import time
+
+_COMMITTEES = (
+    "Community Affairs",
+    "Economics",
+    "Education and Employment",
+    "Environment and Communications",
+    "Finance and Public Administration",
+    "Foreign Affairs, Defence and Trade",
+    "Legal and Constitutional Affairs",
+    "Rural and Regional Affairs and Transport",
+)
+
+_REF_RE = re.compile(r"committees/estimate/(\d+)/")
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+WAF_CHALLENGE_HTML = (
+    "<!DOCTYPE html><html><head><title>Azure WAF</title></head><body>"
+    "<h1>Checking your browser before accessing parlinfo.aph.gov.au</h1>"
+    "<script>/* challenge */</script></body></html>"
+)
+HELP_404_HTML = "<html><head><title>Page not found</title></head><body><h1>Sorry, the page you requested could not be found.</h1></body></html>"
+
+
+@dataclass
+class StandinConfig:
+    rows: int = 2000
+    first_ref: int = 20000
+    # Every Nth row is still a proof/draft with no transcript link (0 = none)
+    unpublished_every: int = 9
+    pdf_bytes: int = 256 * 1024
+    # False: no Accept-Ranges header and Range requests get the whole body
+    accept_ranges: bool = True
+    # Every Nth ref sits behind the WAF challenge (0 = none)
+    waf_every: int = 0
+    waf_cookie: str = "waf_clearance=ok"
+    # Azure answers 403, but challenge pages served with 200 happen too
+    waf_status: int = 403
+    # Every Nth request starts a burst of burst_len error answers (0 = none)
+    burst_every: int = 0
+    burst_len: int = 3
+    burst_status: int = 503
+    latency_s: float = 0.0
+    # PDF bytes per second (0 = unthrottled)
+    bandwidth_bps: int = 0
+    # Drop the connection after this many bytes the first time each PDF is sent from offset 0 (0 = never)
+    drop_after_bytes: int = 0
+    seed: int = 0
+
+
+@dataclass
+class StandinRow:
+    ref: int
+    title: str
+    published: date
+    status: str
+
+
+def _rows(config: StandinConfig) -> List[StandinRow]:
+    rng = random.Random(config.seed)
+    day = date(2026, 2, 27)
+    out = []
+    for i in range(config.rows):
+        if i and i % 4 == 0:
+            day -= timedelta(days=rng.choice((1, 1, 2, 7)))
+        published = not (config.unpublished_every and i % config.unpublished_every == config.unpublished_every - 1)
+        out.append(StandinRow(
+            ref=config.first_ref + config.rows - i,
+            title=rng.choice(_COMMITTEES),
+            published=day,
+            status="Published in full" if published else "Proof",
+        ))
+    return out
+
+
+@lru_cache(maxsize=32)
+def pdf_body(ref: int, size: int) -> bytes:
+    """Deterministic PDF-shaped body of exactly ``size`` bytes (at least the header and trailer)."""
+    head = f"%PDF-1.4\n% estimate {ref}\n".encode()
+    tail = b"\n%%EOF\n"
+    block = hashlib.sha256(str(ref).encode()).hexdigest().encode() + b"\n"
+    fill = max(0, size - len(head) - len(tail))
+    return head + (block * (fill // len(block) + 1))[:fill] + tail
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so client connection pools get exercised
+    server_version = "standin/1.0"
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def standin(self) -> "StandinServer":
+        return self.server.standin
+
+    def do_HEAD(self):
+        self._dispatch(head=True)
+
+    def do_GET(self):
+        self._dispatch(head=False)
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "text/html; charset=utf-8", headers=(), head=False):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        if not head and body:
+            self.wfile.write(body)
+
+    def _dispatch(self, head: bool):
+        srv = self.standin
+        cfg = srv.config
+        if cfg.latency_s:
+            time.sleep(cfg.latency_s)
+        if srv._take_burst():
+            srv._hit("5xx")
+            self._send(cfg.burst_status, b"<html><body>Service Unavailable</body></html>", head=head)
+            return
+
+        path = unquote(self.path)
+        if self.path == "/schedule":
+            srv._hit("schedule")
+            self._send(200, srv.schedule_html().encode("utf-8"), head=head)
+        elif self.path == "/old-schedule":
+            srv._hit("redirect")
+            self._send(302, headers=[("Location", "/Help/404?item=%2fold-schedule")], head=head)
+        elif self.path.startswith("/Help/404"):
+            srv._hit("help404")
+            self._send(200, HELP_404_HTML.encode(), head=head)
+        elif "/parlInfo/" in self.path and _REF_RE.search(path):
+            ref = int(_REF_RE.search(path).group(1))
+            row = srv.row(ref)
+            if row is None:
+                srv._hit("404")
+                self._send(404, b"<html><body>Not found</body></html>", head=head)
+            elif srv.behind_waf(ref) and cfg.waf_cookie not in (self.headers.get("Cookie") or ""):
+                srv._hit("waf")
+                self._send(cfg.waf_status, WAF_CHALLENGE_HTML.encode(), headers=[("X-Azure-Ref", f"standin-{ref}")], head=head)
+            elif "/toc_pdf/" in path:
+                self._send_pdf(row, head)
+            else:
+                srv._hit("display")
+                self._send(200, srv.display_html(row).encode("utf-8"), head=head)
+        else:
+            srv._hit("404")
+            self._send(404, b"<html><body>Not found</body></html>", head=head)
+
+    def _send_pdf(self, row: StandinRow, head: bool):
+        srv = self.standin
+        body = pdf_body(row.ref, srv.config.pdf_bytes)
+        etag = f'"pdf-{row.ref}-{len(body)}"'
+        last_modified = format_datetime(_dt.datetime(row.published.year, row.published.month, row.published.day, tzinfo=_dt.timezone.utc), usegmt=True)
+        headers = [("ETag", etag), ("Last-Modified", last_modified)]
+        if srv.config.accept_ranges:
+            headers.append(("Accept-Ranges", "bytes"))
+
+        start, end, status = 0, len(body) - 1, 200
+        rng = self.headers.get("Range") if srv.config.accept_ranges else None
+        if_range = self.headers.get("If-Range")
+        if rng and (not if_range or if_range in (etag, last_modified)):
+            parsed = self._parse_range(rng, len(body))
+            if parsed is None:
+                srv._hit("416")
+                self._send(416, headers=[("Content-Range", f"bytes */{len(body)}")], content_type="text/plain", head=head)
+                return
+            start, end = parsed
+            status = 206
+            headers.append(("Content-Range", f"bytes {start}-{end}/{len(body)}"))
+            srv._hit("range")
+        srv._hit("head" if head else "pdf")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(end - start + 1))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        if head:
+            return
+        chunk = 64 * 1024
+        bps = srv.config.bandwidth_bps
+        stop = end + 1
+        if srv.config.drop_after_bytes and start == 0 and srv._first_send(row.ref):
+            stop = min(stop, srv.config.drop_after_bytes)
+        try:
+            for i in range(start, stop, chunk):
+                piece = body[i:min(i + chunk, stop)]
+                self.wfile.write(piece)
+                srv._hit("pdf_bytes", len(piece))
+                if bps:
+                    time.sleep(len(piece) / bps)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        if stop <= end:
+            srv._hit("dropped")
+            self.wfile.flush()
+            self.close_connection = True
+
+    @staticmethod
+    def _parse_range(value: str, size: int) -> Optional[Tuple[int, int]]:
+        m = _RANGE_RE.match(value.strip())
+        if not m or (not m.group(1) and not m.group(2)):
+            return None
+        if not m.group(1):  # suffix range: last N bytes
+            n = int(m.group(2))
+            return (max(0, size - n), size - 1) if n else None
+        start = int(m.group(1))
+        end = int(m.group(2)) if m.group(2) else size - 1
+        if start >= size or end < start:
+            return None
+        return start, min(end, size - 1)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class StandinServer:
+    """Threaded local APH/ParlInfo stand-in; use as a context manager or start()/stop()."""
+
+    def __init__(self, config: Optional[StandinConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StandinConfig()
+        self.rows = _rows(self.config)
+        self._by_ref = {r.ref: r for r in self.rows}
+        self.hits: Counter = Counter()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._burst_left = 0
+        self._sent_refs = set()
+        self._schedule_html: Optional[str] = None
+        self._httpd = _Server((host, port), _Handler)
+        self._httpd.standin = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def schedule_url(self) -> str:
+        return self.url + "/schedule"
+
+    @property
+    def schedule_candidates(self) -> List[str]:
+        """A dead candidate (redirects to /Help/404) followed by the live one."""
+        return [self.url + "/old-schedule", self.schedule_url]
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def row(self, ref: int) -> Optional[StandinRow]:
+        return self._by_ref.get(ref)
+
+    def behind_waf(self, ref: int) -> bool:
+        return bool(self.config.waf_every) and ref % self.config.waf_every == 0
+
+    def published_rows(self) -> List[StandinRow]:
+        return [r for r in self.rows if r.status.startswith("Published")]
+
+    def display_url(self, ref: int) -> str:
+        return self.url + f"/parlInfo/search/display/display.w3p;query=Id:%22committees/estimate/{ref}/0000%22"
+
+    def pdf_url(self, ref: int) -> str:
+        row = self._by_ref[ref]
+        name = quote(f"{row.title} {row.published:%Y_%m_%d}".replace(",", ""))
+        return self.url + f"/parlInfo/download/committees/estimate/{ref}/toc_pdf/{name}.pdf;fileType=application%2Fpdf"
+
+    def pdf_body(self, ref: int) -> bytes:
+        return pdf_body(ref, self.config.pdf_bytes)
+
+    def schedule_html(self) -> str:
+        if self._schedule_html is None:
+            parts = [
+                "<html><body><table><thead><tr><th>Date</th><th>Committee</th><th>Ref</th><th>Transcript</th></tr></thead><tbody>"
+            ]
+            for r in self.rows:
+                if r.status.startswith("Published"):
+                    transcript = f'<a href="{self.display_url(r.ref)}">{r.status}</a>'
+                else:
+                    transcript = r.status
+                parts.append(
+                    f"<tr><td>{r.published:%d/%m/%Y}</td>"
+                    f'<td><a href="/Parliamentary_Business/Senate_Estimates/{r.title.split()[0].lower()}">{r.title}</a></td>'
+                    f"<td>{r.ref}</td><td>{transcript}</td></tr>"
+                )
+            parts.append("</tbody></table></body></html>")
+            self._schedule_html = "\n".join(parts)
+        return self._schedule_html
+
+    def display_html(self, row: StandinRow) -> str:
+        # Related-document PDFs first, as on the real page, then the estimate's own toc_pdf
+        return (
+            f"<html><head><title>{row.title}</title></head><body>"
+            f'<a href="/parlInfo/download/committees/estimate/{row.ref + 1}/toc_pdf/other.pdf">Related</a>'
+            f'<a href="{self.pdf_url(row.ref)}">Download PDF</a>'
+            "</body></html>"
+        )
+
+    def _hit(self, kind: str, n: int = 1) -> None:
+        with self._lock:
+            self.hits[kind] += n
+
+    def _first_send(self, ref: int) -> bool:
+        with self._lock:
+            first = ref not in self._sent_refs
+            self._sent_refs.add(ref)
+            return first
+
+    def _take_burst(self) -> bool:
+        cfg = self.config
+        with self._lock:
+            self._requests += 1
+            if cfg.burst_every and self._requests % cfg.burst_every == 0:
+                self._burst_left = cfg.burst_len
+            if self._burst_left > 0:
+                self._burst_left -= 1
+                return True
+            return False
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve a local APH/ParlInfo stand-in")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--rows", type=int, default=2000)
+    ap.add_argument("--pdf-kb", type=int, default=256)
+    ap.add_argument("--waf-every", type=int, default=0)
+    ap.add_argument("--burst-every", type=int, default=0)
+    ap.add_argument("--burst-len", type=int, default=3)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--bandwidth-kbps", type=int, default=0, help="PDF throughput cap in KB/s")
+    args = ap.parse_args()
+
+    config = StandinConfig(
+        rows=args.rows, pdf_bytes=args.pdf_kb * 1024, waf_every=args.waf_every,
+        burst_every=args.burst_every, burst_len=args.burst_len,
+        latency_s=args.latency_ms / 1000.0, bandwidth_bps=args.bandwidth_kbps * 1024,
+    )
+    server = StandinServer(config, host=args.host, port=args.port)
+    print(f"schedule: {server.schedule_url} ({len(server.published_rows())} published of {len(server.rows)} rows)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -36,6 +36,8 @@ def mark_seen(id: str, meta: dict):
         "pdf_path": meta.get("pdf_path"),
         "pdf_sha256": meta.get("pdf_sha256"),
         "pdf_bytes": meta.get("pdf_bytes"),
+        "pdf_etag": meta.get("pdf_etag"),
+        "pdf_last_modified": meta.get("pdf_last_modified"),
     }
     save_state(state)
 
@@ -0,0 +1,171 @@
+"""Resident schedule watcher with an adaptive polling interval.
+
+One process, one shared ``http`` session: the schedule is polled with conditional
+GETs (see ``schedule.get_schedule``) over kept-alive connections, and the wait
+between polls follows what state says about when transcripts turn up:
+
+* Estimates run in sitting weeks, so a transcript published in the last
+  ``WATCH_ACTIVE_DAYS`` days, or in the same weeks of an earlier year (the
+  estimates calendar repeats annually), means more are likely soon.
+* Transcripts appear at characteristic times of day; ``first_seen_at`` hours
+  are histogrammed and hours with a good share of past sightings count as hot.
+
+Both signals → ``fast_s``; one of them → ``WATCH_WARM_FACTOR * fast_s``;
+neither → ``slow_s``.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional
+import time
+
+import requests
+
+from estimates_monitor import http, schedule, storage
+
+# The watcher's own schedule snapshot; `cli diff` keeps using schedule.SCHEDULE_SNAPSHOT_PATH
+WATCH_SNAPSHOT_PATH = Path("data/watch_snapshot.json")
+
+WATCH_FAST_S = 300
+WATCH_SLOW_S = 3600
+WATCH_WARM_FACTOR = 3
+
+# A publication this recent means we're in (or just after) a sitting week
+WATCH_ACTIVE_DAYS = 7
+# Weeks either side of last year's publications that count as "in season"
+WATCH_SEASON_WEEKS = 1
+# Hours holding at least this share of the busiest hour's sightings are hot
+WATCH_HOT_HOUR_SHARE = 0.25
+
+
+def _parse_ts(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        # first_seen_at is stored as utcnow().isoformat() + "Z"
+        return datetime.fromisoformat(str(value).rstrip("Z")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def publication_profile(seen: dict) -> dict:
+    """Summarise ``state["seen"]``: published dates and a first-seen hour histogram."""
+    dates = set()
+    hours = Counter()
+    for rec in (seen or {}).values():
+        published = _parse_ts((rec or {}).get("published_date"))
+        if published:
+            dates.add(published.date())
+        first_seen = _parse_ts((rec or {}).get("first_seen_at"))
+        if first_seen:
+            hours[first_seen.hour] += 1
+    return {"dates": sorted(dates), "hours": hours}
+
+
+def _in_sitting_period(now: datetime, dates) -> bool:
+    today = now.date()
+    for d in dates:
+        if timedelta(0) <= today - d <= timedelta(days=WATCH_ACTIVE_DAYS):
+            return True
+        if d.year < today.year:
+            # Same ISO week (± WATCH_SEASON_WEEKS) in a previous year
+            week_gap = abs(d.isocalendar()[1] - today.isocalendar()[1])
+            if min(week_gap, 52 - week_gap) <= WATCH_SEASON_WEEKS:
+                return True
+    return False
+
+
+def _is_hot_hour(now: datetime, hours: Counter) -> bool:
+    if not hours:
+        return True
+    busiest = max(hours.values())
+    return hours.get(now.hour, 0) >= busiest * WATCH_HOT_HOUR_SHARE
+
+
+def compute_poll_interval(now: datetime, seen: dict, fast_s: float = WATCH_FAST_S, slow_s: float = WATCH_SLOW_S) -> float:
+    """Seconds to wait before the next poll, given the history in ``seen``.
+
+    With no history at all we poll fast: missing a transcript costs more than
+    a few extra conditional GETs.
+    """
+    profile = publication_profile(seen)
+    if not profile["dates"] and not profile["hours"]:
+        return fast_s
+    sitting = _in_sitting_period(now, profile["dates"])
+    hot = _is_hot_hour(now, profile["hours"])
+    if sitting and hot:
+        return fast_s
+    if sitting or hot:
+        return min(slow_s, fast_s * WATCH_WARM_FACTOR)
+    return slow_s
+
+
+def _needs_retry(result) -> bool:
+    """A row that failed, was blocked or didn't resolve to a PDF; offer it again next poll.
+
+    Blocks are usually temporary (WAF throttling, an open circuit cooling down),
+    so saving such a row in the snapshot would drop its transcript for good.
+    """
+    if not isinstance(result, dict):
+        return False
+    if result.get("error") or result.get("parlinfo_blocked") or result.get("action") == "browser_fetch":
+        return True
+    return "pdf_url" in result and not result["pdf_url"]
+
+
+def run_watch(
+    on_entry: Callable[[schedule.TranscriptEntry, requests.Session], Optional[dict]],
+    session: Optional[requests.Session] = None,
+    fast_s: float = WATCH_FAST_S,
+    slow_s: float = WATCH_SLOW_S,
+    max_iterations: Optional[int] = None,
+    sleep_func=None,
+    now_func=None,
+    report: Optional[Callable[[dict], None]] = None,
+):
+    """Poll ``schedule.diff`` until interrupted (or ``max_iterations`` polls).
+
+    ``on_entry(entry, session)`` runs for every row added or changed since the
+    previous poll (only the newest row on the very first poll); the return
+    values are listed in the iteration report. The snapshot at
+    ``WATCH_SNAPSHOT_PATH`` is only saved once the rows have been handled, and a
+    row whose ``on_entry`` raised or returned a blocked / unresolved result is
+    left out of it, so the next poll offers it again. Poll errors are reported and retried after the usual
+    interval rather than ending the watch.
+    """
+    s = session or http.get_session()
+    iteration = 0
+    while max_iterations is None or iteration < max_iterations:
+        iteration += 1
+        now = (now_func or datetime.utcnow)()
+        event = {"iteration": iteration, "at": now.isoformat() + "Z"}
+        try:
+            first_poll = not WATCH_SNAPSHOT_PATH.exists()
+            delta = schedule.diff(session=s, save=False, snapshot_path=WATCH_SNAPSHOT_PATH)
+            event["added"] = len(delta.added)
+            event["changed"] = len(delta.changed)
+            # Without a snapshot every row looks new; take the newest and leave the rest to backfill
+            rows = delta.added[:1] if first_poll else delta.added + delta.changed
+            if rows:
+                event["results"] = []
+                for entry in rows:
+                    try:
+                        result = on_entry(entry, s)
+                    except Exception as e:
+                        result = {"id": getattr(entry, "page_url", None), "error": f"{type(e).__name__}: {e}"}
+                    event["results"].append(result)
+                    if _needs_retry(result):
+                        delta.snapshot.get("rows", {}).pop(schedule._row_key(entry), None)
+            if delta:
+                schedule.save_schedule_snapshot(delta.snapshot, WATCH_SNAPSHOT_PATH)
+        except Exception as e:
+            event["error"] = f"{type(e).__name__}: {e}"
+
+        interval = compute_poll_interval(now, storage.load_state().get("seen", {}), fast_s=fast_s, slow_s=slow_s)
+        event["next_poll_s"] = interval
+        if report:
+            report(event)
+        if max_iterations is not None and iteration >= max_iterations:
+            break
+        (sleep_func or time.sleep)(interval)
@@ -5,6 +5,7 @@ Credentials come from env vars: X_API_KEY, X_API_SECRET, X_ACCESS_TOKEN, X_ACCES
 """
 import os
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Callable, List, Optional
 
 
@@ -17,6 +18,12 @@ class PostResult:
 # Type alias for the post function: (text, reply_to_id?) → PostResult
 PostFunc = Callable[[str, Optional[str]], PostResult]
 
+# The scraper's browser-like headers (text/html Accept) don't belong on API calls
+X_API_HEADERS = {
+    "User-Agent": "estimates-monitor/0.1",
+    "Accept": "application/json",
+}
+
 
 def create_thread(tweets: List[str], post_func: PostFunc) -> List[PostResult]:
     """Post a thread: first tweet is root, subsequent are replies.
@@ -111,13 +118,16 @@ def publish_thread(
         }
 
 
-def make_post_func() -> PostFunc:
+def make_post_func(session=None) -> PostFunc:
     """Create a real X API post function using env var credentials.
 
     Requires: X_API_KEY, X_API_SECRET, X_ACCESS_TOKEN, X_ACCESS_SECRET
     Loads from .env files in estimates_monitor/ and project root if present.
+    Posts go through their own pooled session with ``X_API_HEADERS`` (never
+    retried automatically, so a tweet can't be posted twice) unless ``session``
+    is given.
     """
-    import requests
+    from estimates_monitor import http
     from dotenv import load_dotenv
     from requests_oauthlib import OAuth1
 
@@ -133,12 +143,13 @@ def make_post_func() -> PostFunc:
         os.environ["X_ACCESS_SECRET"],
     )
     endpoint = "https://api.x.com/2/tweets"
+    s = session or http.make_session(headers=X_API_HEADERS)
 
     def _post(text: str, reply_to_id: Optional[str] = None) -> PostResult:
         payload: dict = {"text": text}
         if reply_to_id:
             payload["reply"] = {"in_reply_to_tweet_id": reply_to_id}
-        resp = requests.post(endpoint, json=payload, auth=auth, timeout=30)
+        resp = s.post(endpoint, json=payload, auth=auth, timeout=30)
         resp.raise_for_status()
         data = resp.json()
         post_id = data["data"]["id"]
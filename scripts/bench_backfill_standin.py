@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Load-test backfill (resolve + download) against the local APH/ParlInfo stand-in.
+
+Usage:
+    python scripts/bench_backfill_standin.py [--rows N] [--pdf-kb KB] [--workers N]
+        [--waf-every N] [--burst-every N] [--burst-len N] [--latency-ms MS] [--bandwidth-kbps KB]
+
+State, caches and PDFs go to a temp directory; nothing touches APH or data/.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Ensure package is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from estimates_monitor import archive, backfill, downloader, http, parlinfo, schedule, storage
+from estimates_monitor.standin import StandinConfig, StandinServer
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=500)
+    ap.add_argument("--pdf-kb", type=int, default=256)
+    ap.add_argument("--workers", type=int, default=backfill.BACKFILL_MAX_WORKERS)
+    ap.add_argument("--host-limit", type=int, default=backfill.BACKFILL_DEFAULT_HOST_LIMIT)
+    ap.add_argument("--waf-every", type=int, default=0)
+    ap.add_argument("--burst-every", type=int, default=0)
+    ap.add_argument("--burst-len", type=int, default=3)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--bandwidth-kbps", type=int, default=0)
+    args = ap.parse_args()
+
+    config = StandinConfig(
+        rows=args.rows, pdf_bytes=args.pdf_kb * 1024, waf_every=args.waf_every,
+        burst_every=args.burst_every, burst_len=args.burst_len,
+        latency_s=args.latency_ms / 1000.0, bandwidth_bps=args.bandwidth_kbps * 1024,
+    )
+    with tempfile.TemporaryDirectory() as tmp, StandinServer(config) as srv:
+        root = Path(tmp)
+        storage.STATE_PATH = root / "state.json"
+        downloader.PDF_DIR = root / "pdfs"
+        schedule.SCHEDULE_CACHE_PATH = root / "schedule_cache.json"
+        parlinfo.DISPLAY_CACHE_DIR = root / "parlinfo_cache"
+        archive.ARCHIVE_ENABLED = False
+        schedule.SCHEDULE_URL_CANDIDATES = srv.schedule_candidates
+        # The stand-in answers 403 by design; don't let the breaker end the run
+        http.HTTP_BREAKER_THRESHOLD = 10 ** 9
+
+        session = http.make_session(pool_maxsize=max(args.workers, http.HTTP_POOL_MAXSIZE))
+        stats = backfill.run_backfill(
+            session=session,
+            max_workers=args.workers,
+            host_limits={"127.0.0.1": args.host_limit},
+        )
+        errors = stats.pop("errors")
+        print(f"stand-in:   {srv.url} ({len(srv.published_rows())} published rows, {args.pdf_kb} KB PDFs)")
+        print(f"backfill:   {json.dumps(stats)}")
+        print(f"served:     {json.dumps(dict(sorted(srv.hits.items())))}")
+        for err in errors[:5]:
+            print(f"error:      {err['id']}: {err['error']}")
+
+
+if __name__ == "__main__":
+    main()
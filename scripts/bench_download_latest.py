@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark the end-to-end download-latest flow offline from an HTTP cassette.
+
+Record once against APH (schedule, ParlInfo detail page, PDF):
+    python scripts/bench_download_latest.py --record data/cassettes/latest
+
+Then replay as often as needed without touching the network:
+    python scripts/bench_download_latest.py data/cassettes/latest [--rounds N] [--latency-ms MS | --recorded-latency]
+
+Every run starts from empty state, caches and PDF dir in a temp directory, so
+each round does the full fetch/parse/resolve/download work.
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure package is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from estimates_monitor import archive, cassette, cli, downloader, parlinfo, schedule, storage
+
+
+def _isolate(root: Path):
+    """Point every on-disk cache and state file under ``root``."""
+    storage.STATE_PATH = root / "state.json"
+    downloader.PDF_DIR = root / "pdfs"
+    schedule.SCHEDULE_CACHE_PATH = root / "schedule_cache.json"
+    schedule.SCHEDULE_SNAPSHOT_PATH = root / "schedule_snapshot.json"
+    parlinfo.DISPLAY_CACHE_DIR = root / "parlinfo_cache"
+    archive.ARCHIVE_ENABLED = False
+
+
+def _record(cassette_dir: Path, timeout_s: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        _isolate(Path(tmp))
+        result = cli.run_download_latest(session=cassette.RecordingSession(cassette_dir), timeout_s=timeout_s)
+    n = len(cassette.load_interactions(cassette_dir))
+    print(f"recorded:   {cassette_dir} ({n} interactions)")
+    print(f"result:     {result}")
+
+
+def _replay(cassette_dir: Path, rounds: int, latency_s: float, recorded_latency: bool):
+    times = []
+    calls = 0
+    result = None
+    for _ in range(rounds):
+        session = cassette.ReplaySession(cassette_dir, latency_s=latency_s, recorded_latency=recorded_latency)
+        with tempfile.TemporaryDirectory() as tmp:
+            _isolate(Path(tmp))
+            t0 = time.perf_counter()
+            result = cli.run_download_latest(session=session)
+            times.append(time.perf_counter() - t0)
+        calls = len(session.calls)
+    print(f"cassette:   {cassette_dir} ({calls} requests per run)")
+    print(f"result:     {result.get('pdf_bytes')} bytes sha256={str(result.get('pdf_sha256'))[:12]}")
+    print(f"best:       {min(times) * 1000:8.2f} ms")
+    print(f"median:     {statistics.median(times) * 1000:8.2f} ms  ({rounds} rounds)")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("cassette", nargs="?", default="data/cassettes/latest")
+    ap.add_argument("--record", metavar="DIR", help="Record a new cassette from the live site into DIR")
+    ap.add_argument("--rounds", type=int, default=20)
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="Injected latency per request")
+    ap.add_argument("--recorded-latency", action="store_true", help="Replay each request's recorded latency")
+    ap.add_argument("--timeout", type=int, default=60)
+    args = ap.parse_args()
+
+    if args.record:
+        _record(Path(args.record), args.timeout)
+        return
+    if not cassette.load_interactions(args.cassette):
+        raise SystemExit(f"cassette {args.cassette} is empty; record one with --record")
+    _replay(Path(args.cassette), args.rounds, args.latency_ms / 1000.0, args.recorded_latency)
+
+
+if __name__ == "__main__":
+    main()
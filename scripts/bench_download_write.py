@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Measure the downloader's client-side CPU cost per MB against the local stand-in.
+
+Compares requests' ``iter_content`` loop with the buffered ``readinto`` write
+path (``downloader.DOWNLOAD_READINTO``). CPU time is taken for the downloading
+thread only, so the in-process stand-in server doesn't count.
+
+Usage:
+    python scripts/bench_download_write.py [--mb N] [--rounds N]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure package is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from estimates_monitor import downloader, http
+from estimates_monitor.standin import StandinConfig, StandinServer
+
+
+def _measure(url, session, rounds):
+    best_cpu = best_wall = float("inf")
+    sha = None
+    for _ in range(rounds):
+        with tempfile.TemporaryDirectory() as tmp:
+            c0, w0 = time.thread_time(), time.perf_counter()
+            dl = downloader.download_pdf_deterministic(url, "bench", session=session, out_dir=Path(tmp))
+            best_cpu = min(best_cpu, time.thread_time() - c0)
+            best_wall = min(best_wall, time.perf_counter() - w0)
+            sha = dl["sha256"]
+    return best_cpu, best_wall, sha
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--mb", type=float, default=32.0, help="PDF size in MB")
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+
+    size = int(args.mb * 1024 * 1024)
+    mb = size / (1024 * 1024)
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=size)) as srv:
+        url = srv.pdf_url(srv.rows[0].ref)
+        session = http.make_session()
+        print(f"pdf: {mb:.1f} MB")
+        baseline = None
+        for label, readinto in (("iter_content", False), ("readinto", True)):
+            downloader.DOWNLOAD_READINTO = readinto
+            cpu, wall, sha = _measure(url, session, args.rounds)
+            baseline = baseline or cpu
+            print(f"{label:>12}: {cpu * 1000 / mb:6.2f} ms CPU/MB  {wall * 1000:7.1f} ms wall  {baseline / cpu:4.2f}x  sha256={sha[:12]}")
+
+
+if __name__ == "__main__":
+    main()
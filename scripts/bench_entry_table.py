@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Compare memory and sort time of TranscriptEntry lists vs EntryTable.
+
+Synthesises a backfill-sized corpus by replicating the rows of schedule.html
+with fresh ref numbers, URLs and dates (each row its own string objects, as
+they are when parsed page by page).
+
+Usage:
+    python scripts/bench_entry_table.py [--entries N] [--rounds N]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+
+# Ensure package is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from estimates_monitor import schedule
+from estimates_monitor.entry_table import EntryTable
+
+
+def _corpus(n: int):
+    base = schedule._parse_schedule_html((Path(__file__).resolve().parent.parent / "schedule.html").read_text(encoding="utf-8"))
+    out = []
+    for i in range(n):
+        e = base[i % len(base)]
+        ref = 10000 + (i * 7919) % n  # shuffled ref order
+        out.append(schedule.TranscriptEntry(
+            title="".join(e.title),  # distinct str object per row
+            page_url=e.page_url.replace(str(e.ref_no), str(ref)),
+            pdf_url=None,
+            published_date=e.published_date + timedelta(days=i % 3000) if e.published_date else None,
+            status="".join(e.status),
+            committee_url="".join(e.committee_url) if e.committee_url else None,
+            ref_no=ref,
+        ))
+    return out
+
+
+def _measure(build):
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current
+
+
+def _best(fn, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--entries", type=int, default=50000)
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+
+    entries, list_bytes = _measure(lambda: _corpus(args.entries))
+    table, table_bytes = _measure(lambda: EntryTable.from_entries(entries))
+
+    t_list = _best(lambda: sorted(entries, key=schedule._sort_key_latest, reverse=True), args.rounds)
+    t_table = _best(lambda: table.argsort_latest(), args.rounds)
+    assert table.sort_latest().to_entries() == sorted(entries, key=schedule._sort_key_latest, reverse=True)
+
+    n = len(entries)
+    print(f"entries:        {n}")
+    print(f"list memory:    {list_bytes / n:8.1f} B/entry")
+    print(f"table memory:   {table_bytes / n:8.1f} B/entry  ({list_bytes / table_bytes:.1f}x smaller)")
+    print(f"list sort:      {t_list * 1000:8.2f} ms")
+    print(f"table argsort:  {t_table * 1000:8.2f} ms  ({t_list / t_table:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark schedule parser backends against the checked-in schedule.html.
+
+Usage:
+    python scripts/bench_schedule_parse.py [path/to/schedule.html] [--rounds N]
+    python scripts/bench_schedule_parse.py --archive [--rounds N]
+
+--archive parses every distinct page in data/schedule_archive instead.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure package is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from estimates_monitor import archive, schedule
+
+
+def _time_backend(html: str, backend: str, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        schedule._parse_schedule_html(html, base_url=schedule.SCHEDULE_URL, backend=backend)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _bench_archive(rounds: int):
+    bodies = {}
+    for rec in archive.iter_index():
+        bodies.setdefault(rec["sha256"], (archive.load(rec["sha256"]), rec.get("url")))
+    if not bodies:
+        print(f"archive {archive.ARCHIVE_DIR} is empty")
+        return
+    total_chars = sum(len(html) for html, _ in bodies.values())
+    print(f"archive:    {archive.ARCHIVE_DIR} ({len(bodies)} pages, {total_chars} chars)")
+    results = {}
+    for backend in ("bs4", "lxml"):
+        best = float("inf")
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            n = 0
+            for html, url in bodies.values():
+                n += len(schedule._parse_schedule_html(html, base_url=url or schedule.SCHEDULE_URL, backend=backend))
+            best = min(best, time.perf_counter() - t0)
+        results[backend] = best
+        print(f"{backend + ':':<11} {best * 1000:8.2f} ms  ({n} entries, {len(bodies) / best:.0f} pages/s)")
+    print(f"speedup:    {results['bs4'] / results['lxml']:8.1f}x")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("path", nargs="?", default=str(Path(__file__).resolve().parent.parent / "schedule.html"))
+    ap.add_argument("--rounds", type=int, default=20)
+    ap.add_argument("--archive", action="store_true", help="Benchmark over the schedule archive")
+    args = ap.parse_args()
+
+    if args.archive:
+        _bench_archive(args.rounds)
+        return
+
+    html = Path(args.path).read_text(encoding="utf-8")
+    slow = schedule._parse_schedule_html(html, base_url=schedule.SCHEDULE_URL, backend="bs4")
+    fast = schedule._parse_schedule_html(html, base_url=schedule.SCHEDULE_URL, backend="lxml")
+    transcript_rows_match = slow[:len(fast)] == fast
+
+    t_bs4 = _time_backend(html, "bs4", args.rounds)
+    t_lxml = _time_backend(html, "lxml", args.rounds)
+    print(f"file:       {args.path} ({len(html)} chars)")
+    print(f"bs4:        {t_bs4 * 1000:8.2f} ms  ({len(slow)} entries)")
+    print(f"lxml:       {t_lxml * 1000:8.2f} ms  ({len(fast)} entries)")
+    print(f"speedup:    {t_bs4 / t_lxml:8.1f}x")
+    print(f"rows match: {transcript_rows_match}")
+    if len(slow) > len(fast):
+        extra = ", ".join(repr(e.title) for e in slow[len(fast):])
+        print(f"bs4 only:   {extra} (navigation list items, not transcript rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Compare single-stream and segmented PDF downloads against the local stand-in.
+
+Each stand-in response is throttled to --bandwidth-kbps, mimicking a per-connection
+bottleneck between us and APH; segmented mode should scale with the segment count.
+
+Usage:
+    python scripts/bench_segmented_download.py [--mb N] [--bandwidth-kbps KB] [--segments 1,2,4,8] [--rounds N]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure package is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from estimates_monitor import downloader, http
+from estimates_monitor.standin import StandinConfig, StandinServer
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--mb", type=float, default=32.0, help="PDF size in MB")
+    ap.add_argument("--bandwidth-kbps", type=int, default=8192, help="Per-connection throughput cap in KB/s (0 = none)")
+    ap.add_argument("--segments", default="1,2,4,8", help="Comma-separated segment counts to try")
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    size = int(args.mb * 1024 * 1024)
+    config = StandinConfig(rows=3, pdf_bytes=size, bandwidth_bps=args.bandwidth_kbps * 1024)
+    downloader.SEGMENTED_MIN_BYTES = 0
+    with StandinServer(config) as srv:
+        url = srv.pdf_url(srv.rows[0].ref)
+        print(f"pdf:        {size / 1e6:.1f} MB, {args.bandwidth_kbps} KB/s per connection")
+        baseline = None
+        for n in (int(x) for x in args.segments.split(",")):
+            session = http.make_session(pool_maxsize=max(n, http.HTTP_POOL_MAXSIZE))
+            best = float("inf")
+            sha = None
+            for _ in range(args.rounds):
+                with tempfile.TemporaryDirectory() as tmp:
+                    t0 = time.perf_counter()
+                    dl = downloader.download_pdf_deterministic(url, "bench", session=session, out_dir=Path(tmp), segments=n)
+                    best = min(best, time.perf_counter() - t0)
+                    sha = dl["sha256"]
+            baseline = baseline or best
+            print(f"{n:>2} segment{'s' if n > 1 else ' '}: {best * 1000:8.1f} ms  {size / 1e6 / best:7.1f} MB/s  {baseline / best:4.1f}x  sha256={sha[:12]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,7 @@ from urllib.parse import urlparse, unquote
 # Ensure package is importable
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from estimates_monitor import schedule, parlinfo, storage
-from bs4 import BeautifulSoup
+from estimates_monitor import http, schedule, parlinfo, storage
 import requests
 
 REPORT_PATH = Path("data/diagnose.md")
@@ -124,10 +123,11 @@ def main():
     log_heading(3, "4a — Fetch ParlInfo detail page")
     log_kv("URL", chosen.page_url)
     try:
-        detail_resp = requests.get(chosen.page_url, headers=schedule.DEFAULT_HEADERS, timeout=30)
+        detail_resp = parlinfo.fetch_display_page(chosen.page_url, headers=schedule.DEFAULT_HEADERS, timeout=30)
         log_kv("Status", detail_resp.status_code)
         log_kv("Final URL", detail_resp.url)
         log_kv("Content-Length", len(detail_resp.text))
+        log_kv("Served from cache", detail_resp.from_cache)
 
         if detail_resp.status_code == 403:
             parlinfo_403 = True
@@ -157,7 +157,7 @@ def main():
         log_heading(3, "4b — Fallback: fetch committee page")
         log_kv("Committee URL", chosen.committee_url)
         try:
-            fb_resp = requests.get(chosen.committee_url, headers=schedule.DEFAULT_HEADERS, timeout=30)
+            fb_resp = http.get_session().get(chosen.committee_url, timeout=30)
             log_kv("Status", fb_resp.status_code)
             log_kv("Final URL", fb_resp.url)
             log_kv("Content-Length", len(fb_resp.text))
@@ -175,15 +175,11 @@ def main():
     # ── Step 5: Scan for PDF links ───────────────────────────────────
     log_heading(2, "Step 5 — All PDF links found in detail HTML")
 
-    soup = BeautifulSoup(detail_html, "html.parser")
+    link_index = parlinfo.PdfLinkIndex.from_html(detail_html)
     all_links = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        href_lower = href.lower()
-        if ".pdf" in href_lower or "application%2fpdf" in href_lower or "application/pdf" in href_lower:
-            full_url = requests.compat.urljoin(detail_base, href)
-            link_text = a.get_text(" ", strip=True)[:60]
-            all_links.append({"text": link_text, "href": href[:120], "resolved": full_url})
+    for link in link_index.pdf_links():
+        full_url = requests.compat.urljoin(detail_base, link.href)
+        all_links.append({"text": link.text[:60], "href": link.href[:120], "resolved": full_url})
 
     log_kv("Total PDF links found", len(all_links))
     log()
@@ -204,7 +200,7 @@ def main():
     hostname = (parsed_page.hostname or "").lower()
 
     if "parlinfo.aph.gov.au" in hostname and not committee_fallback:
-        pdf_from_parlinfo = parlinfo.extract_pdf_url(chosen.page_url, detail_html)
+        pdf_from_parlinfo = parlinfo.extract_pdf_url(chosen.page_url, link_index)
         log_kv("parlinfo.extract_pdf_url result", pdf_from_parlinfo or "(None)")
     else:
         log(f"Skipped — page host is `{hostname}`, committee_fallback={committee_fallback}")
@@ -218,7 +214,7 @@ def main():
     log_kv("id_str", id_str or "(None)")
     log_kv("detail_base used for resolution", detail_base)
 
-    pdf_generic = schedule._pick_pdf_link(detail_html, detail_base, estimate_id=est_id, id_str=id_str)
+    pdf_generic = schedule._pick_pdf_link(link_index, detail_base, estimate_id=est_id, id_str=id_str)
     log_kv("_pick_pdf_link result", pdf_generic or "(None)")
 
     # ── Step 8: Final chosen PDF URL ─────────────────────────────────
@@ -282,4 +278,6 @@ def _write_report():
 
 
 if __name__ == "__main__":
+    if "--no-cache" in sys.argv:
+        parlinfo.DISPLAY_CACHE_ENABLED = False
     main()
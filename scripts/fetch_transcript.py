@@ -20,7 +20,7 @@ from pathlib import Path
 # Ensure package is importable
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from estimates_monitor import schedule, downloader, storage
+from estimates_monitor import schedule, downloader, parser, storage
 from datetime import datetime
 
 
@@ -76,6 +76,9 @@ def main():
                     "Download that PDF file.",
                     f"Save it to the data/pdfs/ directory.",
                     "Then run: python scripts/fetch_transcript.py --register-pdf <path_to_downloaded_pdf>",
+                    "Optional: export the browser's aph.gov.au cookies (cookies.txt or JSON) and run "
+                    "`python -m estimates_monitor.cli import-cookies <export>` so the next fetches "
+                    "reuse the WAF clearance over plain HTTP.",
                 ],
             }
             print(f"\n===RESULT===\n{json.dumps(result, indent=2)}")
@@ -90,14 +93,35 @@ def main():
     base_name = entry.published_date.date().isoformat() if entry.published_date else (entry.title or "transcript")
 
     try:
-        dl = downloader.download_pdf_deterministic(
+        pdf = downloader.fetch_pdf(
             entry.pdf_url,
             base_name,
             timeout=60,
         )
+    except downloader.WafChallengeError as e:
+        print(f"    WAF challenge page instead of the PDF ({e.status_code}); browser bypass required.", flush=True)
+        result = {
+            "status": "browser_required",
+            "action": "browser_fetch",
+            "id": entry.page_url,
+            "title": entry.title,
+            "ref_no": entry.ref_no,
+            "pdf_url": entry.pdf_url,
+            "waf": e.as_dict(),
+            "save_dir": "data/pdfs",
+            "instructions": [
+                f"Open this URL in your browser: {entry.pdf_url}",
+                "Wait for the WAF challenge to resolve and the PDF to download.",
+                "Save it to the data/pdfs/ directory.",
+                "Then run: python scripts/fetch_transcript.py --register-pdf <path_to_downloaded_pdf>",
+            ],
+        }
+        print(f"\n===RESULT===\n{json.dumps(result, indent=2)}")
+        sys.exit(0)
     except Exception as e:
         _fail(f"PDF download failed: {e}")
 
+    dl = pdf.result
     print(f"    Saved: {dl['path']} ({dl['bytes']} bytes, sha256={dl['sha256'][:16]}...)", flush=True)
 
     # Step 5: Record in state
@@ -113,6 +137,8 @@ def main():
         "pdf_path": dl["path"],
         "pdf_sha256": dl["sha256"],
         "pdf_bytes": dl["bytes"],
+        "pdf_etag": dl.get("etag"),
+        "pdf_last_modified": dl.get("last_modified"),
     })
 
     result = {
@@ -124,6 +150,7 @@ def main():
         "pdf_path": dl["path"],
         "pdf_sha256": dl["sha256"],
         "pdf_bytes": dl["bytes"],
+        **_extract(pdf),
     }
     print(f"\n>>> Done. PDF downloaded successfully.", flush=True)
     print(f"\n===RESULT===\n{json.dumps(result, indent=2)}")
@@ -136,12 +163,9 @@ def register_pdf():
     if not Path(pdf_path).exists():
         _fail(f"PDF not found: {pdf_path}")
 
-    import hashlib
-    hasher = hashlib.sha256()
-    data = Path(pdf_path).read_bytes()
-    hasher.update(data)
-    sha = hasher.hexdigest()
-    size = len(data)
+    # Hashed in blocks rather than read whole; extraction then reads the mapped file
+    pdf = downloader.PdfHandle.from_path(pdf_path)
+    sha, size = pdf.sha256, pdf.bytes
 
     # Get latest entry from schedule (ignore seen state)
     entry = schedule.get_latest_published(
@@ -173,11 +197,29 @@ def register_pdf():
         "pdf_path": pdf_path,
         "pdf_sha256": sha,
         "pdf_bytes": size,
+        **_extract(pdf),
     }
     print(f">>> PDF registered: {pdf_path} ({size} bytes)", flush=True)
     print(f"\n===RESULT===\n{json.dumps(result, indent=2)}")
 
 
+def _extract(pdf):
+    """Extract the transcript text from the PDF handle for the next workflow step.
+
+    The PDF is already saved and recorded, so a failed extraction is reported
+    in the result rather than failing the run.
+    """
+    print(f"\n>>> Extracting text...", flush=True)
+    try:
+        with pdf:
+            text_path = parser.save_text(pdf)
+    except Exception as e:
+        print(f"    Text extraction failed: {e}", flush=True)
+        return {"text_path": None, "text_error": f"{type(e).__name__}: {e}"}
+    print(f"    Text: {text_path}", flush=True)
+    return {"text_path": str(text_path)}
+
+
 def _fail(msg):
     print(f">>> ERROR: {msg}", file=sys.stderr, flush=True)
     result = {"status": "error", "error": msg}
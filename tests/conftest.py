@@ -0,0 +1,22 @@
+import pytest
+
+from estimates_monitor import archive, cookies, downloader, http, parlinfo, parser, schedule, storage, watch
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Keep state, on-disk caches and the archive out of data/, and HTTP guard state separate per test."""
+    cache_root = tmp_path / "_caches"
+    monkeypatch.setattr(storage, "STATE_PATH", cache_root / "state.json")
+    monkeypatch.setattr(schedule, "SCHEDULE_CACHE_PATH", cache_root / "schedule_cache.json")
+    monkeypatch.setattr(schedule, "SCHEDULE_SNAPSHOT_PATH", cache_root / "schedule_snapshot.json")
+    monkeypatch.setattr(watch, "WATCH_SNAPSHOT_PATH", cache_root / "watch_snapshot.json")
+    monkeypatch.setattr(parlinfo, "DISPLAY_CACHE_DIR", cache_root / "parlinfo_cache")
+    monkeypatch.setattr(archive, "ARCHIVE_DIR", cache_root / "schedule_archive")
+    monkeypatch.setattr(archive, "_stores_since_prune", None)
+    monkeypatch.setattr(schedule, "_template_misses", {})
+    monkeypatch.setattr(downloader, "PDF_DIR", cache_root / "pdfs")
+    monkeypatch.setattr(parser, "TEXT_DIR", cache_root / "text")
+    monkeypatch.setattr(http, "RATE_LIMITER", http.RateLimiter())
+    monkeypatch.setattr(http, "CIRCUIT_BREAKER", http.CircuitBreaker())
+    monkeypatch.setattr(cookies, "COOKIE_JAR_PATH", cache_root / "cookies.txt")
@@ -0,0 +1,231 @@
+import asyncio
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from estimates_monitor import aio, downloader, http, parlinfo, schedule
+
+DISPLAY = "https://parlinfo.aph.gov.au/parlInfo/search/display/display.w3p;query=Id:%22committees/estimate/{ref}/0001%22"
+DETAIL = '<a href="https://parlinfo.aph.gov.au/parlInfo/download/committees/estimate/{ref}/toc_pdf/T{ref}.pdf;fileType=application%2Fpdf">PDF</a>'
+
+
+class FakeContent:
+    def __init__(self, body):
+        self.body = body
+
+    async def iter_chunked(self, n):
+        for i in range(0, len(self.body), n):
+            await asyncio.sleep(0)
+            yield self.body[i:i + n]
+
+
+class FakeResp:
+    def __init__(self, url, status=200, body=b"", headers=None):
+        self.url = url
+        self.status = status
+        self.headers = headers or {}
+        self.content = FakeContent(body)
+        self._body = body
+
+    async def text(self):
+        return self._body.decode("utf-8")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeAsyncSession:
+    """aiohttp-shaped session: detail pages and PDFs for any estimate ref."""
+
+    def __init__(self, schedule_html="", blocked=(), delay_s=0.01):
+        self.schedule_html = schedule_html
+        self.blocked = set(blocked)
+        self.delay_s = delay_s
+        self.active = {}
+        self.peak = {}
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, dict(headers or {})))
+        return _Tracked(self, url)
+
+
+class _Tracked:
+    def __init__(self, session, url):
+        self.session = session
+        self.url = url
+
+    async def __aenter__(self):
+        s, url = self.session, self.url
+        host = url.split("/")[2]
+        s.active[host] = s.active.get(host, 0) + 1
+        s.peak[host] = max(s.peak.get(host, 0), s.active[host])
+        await asyncio.sleep(s.delay_s)
+        if "estimate/" not in url:
+            return FakeResp(url, body=s.schedule_html.encode("utf-8"), headers={"ETag": '"v1"'})
+        ref = int(url.split("estimate/")[1].split("/")[0])
+        if ref in s.blocked:
+            return FakeResp(url, status=403)
+        if "/toc_pdf/" in url:
+            return FakeResp(url, body=b"%PDF-1.4 " + str(ref).encode() * 5000 + b"\n%%EOF\n")
+        return FakeResp(url, body=DETAIL.format(ref=ref).encode("utf-8"))
+
+    async def __aexit__(self, *exc):
+        host = self.url.split("/")[2]
+        self.session.active[host] -= 1
+        return False
+
+
+def _entries(refs):
+    return [
+        schedule.TranscriptEntry(
+            title=f"Committee {r}", page_url=DISPLAY.format(ref=r), pdf_url=None,
+            published_date=datetime(2025, 5, 1), status="Published in full", ref_no=r,
+        )
+        for r in refs
+    ]
+
+
+def test_get_schedule_matches_sync_parser(monkeypatch):
+    html = Path("fixtures/schedule.html").read_text(encoding="utf-8")
+    monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", ["https://example.org/schedule"])
+    session = FakeAsyncSession(schedule_html=html)
+
+    entries = asyncio.run(aio.get_schedule(session))
+    assert entries == schedule._parse_schedule_html(html, base_url="https://example.org/schedule")
+    # Shares the conditional-GET cache with the sync path
+    asyncio.run(aio.get_schedule(session))
+    assert session.requests[1][1]["If-None-Match"] == '"v1"'
+
+
+def test_fetch_all_pipelines_with_per_host_limits(monkeypatch, tmp_path):
+    monkeypatch.setattr(downloader, "PDF_DIR", tmp_path / "pdfs")
+    session = FakeAsyncSession(blocked={7})
+    entries = _entries(range(1, 13))
+
+    results = asyncio.run(aio.fetch_all(entries, session, host_limits={"parlinfo.aph.gov.au": 3}))
+
+    assert [r["id"] for r in results] == [e.page_url for e in entries]
+    assert results[6]["parlinfo_blocked"] is True and "path" not in results[6]
+    ok = [r for r in results if "path" in r]
+    assert len(ok) == 11
+    body = Path(ok[0]["path"]).read_bytes()
+    assert hashlib.sha256(body).hexdigest() == ok[0]["sha256"] and len(body) == ok[0]["bytes"]
+    assert session.peak["parlinfo.aph.gov.au"] == 3
+
+
+def test_download_error_is_reported_and_leaves_no_temp_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(downloader, "PDF_DIR", tmp_path / "pdfs")
+    entry = _entries([5])[0]
+    entry.pdf_url = "https://parlinfo.aph.gov.au/parlInfo/download/committees/estimate/99/toc_pdf/x.pdf"
+    result = asyncio.run(aio.fetch_one(entry, FakeAsyncSession(blocked={99})))
+
+    assert result["error"].startswith("HTTPError: 403")
+    assert list((tmp_path / "pdfs").iterdir()) == []
+
+
+class TrickleContent(FakeContent):
+    """First chunk of only a few bytes, as aiohttp may deliver."""
+
+    async def iter_chunked(self, n):
+        yield self.body[:3]
+        yield self.body[3:]
+
+
+class TrickleSession:
+    def __init__(self, body, headers=None):
+        self.body = body
+        self.headers = headers or {}
+
+    def get(self, url, headers=None, timeout=None):
+        resp = FakeResp(url, body=self.body, headers=self.headers)
+        resp.content = TrickleContent(self.body)
+        return resp
+
+
+def test_short_first_chunk_is_buffered_before_sniffing(tmp_path):
+    body = b"%PDF-1.4 " + b"x" * 5000 + b"\n%%EOF\n"
+    dl = asyncio.run(aio.download_pdf_deterministic("https://example.org/a.pdf", "a", TrickleSession(body), out_dir=tmp_path))
+    assert dl["bytes"] == len(body) and dl["sha256"] == hashlib.sha256(body).hexdigest()
+
+    tiny = b"%PDF-1.4\n%%EOF\n"
+    assert asyncio.run(aio.download_pdf_deterministic("https://example.org/b.pdf", "b", TrickleSession(tiny), out_dir=tmp_path))["bytes"] == len(tiny)
+
+
+def test_challenge_page_with_200_is_reported_blocked(tmp_path):
+    page = b"<!DOCTYPE html><html><head><title>Azure WAF</title></head><body>challenge</body></html>"
+    entry = _entries([5])[0]
+    entry.pdf_url = "https://parlinfo.aph.gov.au/parlInfo/download/committees/estimate/5/toc_pdf/x.pdf"
+    downloader.PDF_DIR.mkdir(parents=True, exist_ok=True)
+    result = asyncio.run(aio.fetch_one(entry, TrickleSession(page, headers={"Content-Type": "text/html"})))
+    assert result["parlinfo_blocked"] is True and result["waf"]["title"] == "Azure WAF"
+    assert [p for p in downloader.PDF_DIR.rglob("*") if p.is_file()] == []
+
+
+def test_archive_and_file_writes_run_off_the_event_loop(monkeypatch, tmp_path):
+    html = Path("fixtures/schedule.html").read_text(encoding="utf-8")
+    monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", ["https://example.org/schedule"])
+    threads = {}
+    real_store, real_store_pdf = aio.archive.store, downloader._store
+    monkeypatch.setattr(aio.archive, "store", lambda *a, **kw: (threads.setdefault("archive", threading.get_ident()), real_store(*a, **kw))[1])
+    monkeypatch.setattr(downloader, "_store", lambda *a, **kw: (threads.setdefault("pdf", threading.get_ident()), real_store_pdf(*a, **kw))[1])
+
+    async def run():
+        threads["loop"] = threading.get_ident()
+        await aio.get_schedule(http.mark_own_session(FakeAsyncSession(schedule_html=html)))
+        entry = _entries([5])[0]
+        return await aio.fetch_one(entry, FakeAsyncSession(), timeout_s=5)
+
+    result = asyncio.run(run())
+    assert "path" in result
+    assert threads["archive"] != threads["loop"] and threads["pdf"] != threads["loop"]
+
+
+def test_challenge_display_page_is_not_cached():
+    page = b"<!DOCTYPE html><html><head><title>Azure WAF</title></head><body>challenge</body></html>"
+    entry = _entries([5])[0]
+    session = http.mark_own_session(TrickleSession(page, headers={"Content-Type": "text/html"}))
+    asyncio.run(aio.resolve_pdf(entry, session))
+    assert entry.pdf_url is None
+    assert parlinfo._read_display_cache(entry.page_url, parlinfo.DISPLAY_CACHE_TTL_S) is None
+
+
+def test_injected_async_session_is_not_archived(monkeypatch):
+    html = Path("fixtures/schedule.html").read_text(encoding="utf-8")
+    monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", ["https://example.org/schedule"])
+    assert asyncio.run(aio.get_schedule(FakeAsyncSession(schedule_html=html)))
+    assert list(aio.archive.iter_index()) == []
+
+
+def test_direct_calls_share_the_default_host_budget(monkeypatch, tmp_path):
+    monkeypatch.setattr(downloader, "PDF_DIR", tmp_path / "pdfs")
+    session = FakeAsyncSession()
+
+    async def run():
+        entries = _entries(range(20, 28))
+        await asyncio.gather(*(aio.resolve_pdf(e, session) for e in entries))
+        await asyncio.gather(*(aio.download_pdf_deterministic(e.pdf_url, e.title, session) for e in entries))
+        return aio._limits(None)
+
+    first = asyncio.run(run())
+    assert session.peak["parlinfo.aph.gov.au"] == aio.AIO_HOST_LIMITS["parlinfo.aph.gov.au"]
+    # A new loop gets its own semaphores
+    assert asyncio.run(run()) is not first
+
+
+def test_get_latest_published_forwards_limits(monkeypatch):
+    html = Path("fixtures/schedule.html").read_text(encoding="utf-8")
+    monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", ["https://example.org/schedule"])
+    used = []
+
+    class Recording(aio.HostLimits):
+        def __call__(self, url):
+            used.append(url)
+            return super().__call__(url)
+
+    latest = asyncio.run(aio.get_latest_published(FakeAsyncSession(schedule_html=html), limits=Recording()))
+    assert used[0] == "https://example.org/schedule" and used[-1] == latest.page_url
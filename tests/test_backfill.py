@@ -0,0 +1,191 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+import requests
+
+from estimates_monitor import backfill, downloader, schedule, storage
+
+DISPLAY = "https://parlinfo.aph.gov.au/parlInfo/search/display/display.w3p;query=Id:%22committees/estimate/{ref}/0001%22"
+DETAIL = '<a href="https://parlinfo.aph.gov.au/parlInfo/download/committees/estimate/{ref}/toc_pdf/T{ref}.pdf;fileType=application%2Fpdf">PDF</a>'
+ARCHIVE = (
+    '<table><tr><td>Economics</td><td>10/02/2024</td>'
+    '<td><a href="https://web.archive.org/web/20240301000000/https://parlinfo.aph.gov.au/parlInfo/search/display/'
+    'display.w3p;query=Id:%22committees/estimate/{ref}/0001%22">Published in full</a></td></tr></table>'
+)
+
+
+class DummyResp:
+    def __init__(self, url, text="", status_code=200, body=b""):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+        self.body = body or text.encode("utf-8")
+
+    def iter_content(self, chunk_size=8192):
+        yield self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            exc = requests.exceptions.HTTPError(f"{self.status_code}")
+            exc.response = self
+            raise exc
+
+
+class HostSession:
+    """Detail pages and PDFs for any estimate ref; tracks per-host concurrency."""
+
+    def __init__(self, blocked=(), archive_ref=None, delay_s=0.02):
+        self.blocked = set(blocked)
+        self.archive_ref = archive_ref
+        self.delay_s = delay_s
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.pdf_gets = []
+
+    def get(self, url, **kwargs):
+        if url.startswith("https://archive.example"):
+            return DummyResp(url, ARCHIVE.format(ref=self.archive_ref))
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay_s)
+            ref = int(url.split("estimate/")[1].split("/")[0])
+            if ref in self.blocked:
+                return DummyResp(url, status_code=403)
+            if "/toc_pdf/" in url:
+                self.pdf_gets.append(ref)
+                return DummyResp(url, body=b"%PDF-1.4 " + str(ref).encode() * 100 + b"\n%%EOF\n")
+            return DummyResp(url, DETAIL.format(ref=ref))
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def _entries(refs):
+    return [
+        schedule.TranscriptEntry(
+            title=f"Committee {r}",
+            page_url=DISPLAY.format(ref=r),
+            pdf_url=None,
+            published_date=datetime(2025, 1, 1 + i),
+            status="Published in full",
+            ref_no=r,
+        )
+        for i, r in enumerate(refs)
+    ]
+
+
+def _setup(tmp_path, monkeypatch, refs):
+    monkeypatch.setattr(storage, "STATE_PATH", tmp_path / "state.json")
+    monkeypatch.setattr(downloader, "PDF_DIR", tmp_path / "pdfs")
+    monkeypatch.setattr(schedule, "get_schedule", lambda session=None, timeout_s=30: _entries(refs))
+
+
+def test_backfill_downloads_all_and_reports_throughput(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch, range(100, 110))
+    session = HostSession(blocked={105})
+
+    result = backfill.run_backfill(session=session, max_workers=8, host_limits={"parlinfo.aph.gov.au": 2})
+
+    assert result["entries"] == 10
+    assert result["downloaded"] == 9
+    assert result["blocked"] == 1 and result["unresolved"] == 0
+    assert [row["id"] for row in result["browser_fetch"]] == [DISPLAY.format(ref=105)]
+    assert result["bytes"] > 0 and result["mb_per_s"] > 0 and result["entries_per_s"] > 0
+    assert session.peak <= 2
+    state = storage.load_state()
+    assert len(state["seen"]) == 9
+    assert state["seen"][DISPLAY.format(ref=100)]["pdf_path"].startswith(str(tmp_path / "pdfs"))
+    # A 403'd display page is a WAF block: it stays out of seen and goes to the browser
+    assert DISPLAY.format(ref=105) not in state["seen"]
+    assert state["backfill_failures"][DISPLAY.format(ref=105)]["outcome"] == "blocked"
+
+
+def test_backfill_resumes_where_it_left_off(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch, range(200, 206))
+    first = backfill.run_backfill(session=HostSession(), limit=2)
+    assert first["downloaded"] == 2
+
+    session = HostSession()
+    second = backfill.run_backfill(session=session)
+    assert second["skipped"] == 2
+    assert second["downloaded"] == 4
+    # The two newest entries were fetched in the first run and are not re-downloaded
+    assert sorted(session.pdf_gets) == [200, 201, 202, 203]
+
+
+def test_backfill_failures_are_recorded_not_fatal(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch, [300, 301])
+
+    class FlakySession(HostSession):
+        def get(self, url, **kwargs):
+            if "/300/" in url:
+                raise requests.exceptions.ConnectionError("reset")
+            return super().get(url, **kwargs)
+
+    result = backfill.run_backfill(session=FlakySession())
+    assert result["failed"] == 1 and result["downloaded"] == 1
+    assert result["errors"][0]["id"] == DISPLAY.format(ref=300)
+    state = storage.load_state()
+    assert not storage.is_seen(DISPLAY.format(ref=300))
+    assert "reset" in state["backfill_failures"][DISPLAY.format(ref=300)]["error"]
+
+    # A later successful run clears the failure
+    result = backfill.run_backfill(session=HostSession())
+    assert result["downloaded"] == 1 and result["skipped"] == 1
+    assert storage.load_state()["backfill_failures"] == {}
+    assert storage.get_seen(DISPLAY.format(ref=300))["pdf_path"]
+
+
+def test_backfill_state_is_saved_in_batches(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch, range(500, 507))
+    monkeypatch.setattr(backfill, "BACKFILL_FLUSH_EVERY", 3)
+    saves = []
+    real_save = storage.save_state
+    monkeypatch.setattr(storage, "save_state", lambda state: (saves.append(len(state["seen"])), real_save(state)))
+
+    result = backfill.run_backfill(session=HostSession(), max_workers=1)
+    assert result["downloaded"] == 7
+    # Two full batches plus the remainder, not one write per entry
+    assert saves == [3, 6, 7]
+
+
+def test_interrupted_backfill_saves_finished_entries(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch, range(600, 604))
+
+    done = []
+
+    def stop_after_two(entry, outcome):
+        done.append(entry)
+        if len(done) == 2:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        backfill.run_backfill(session=HostSession(), max_workers=1, progress=stop_after_two)
+    assert len(storage.load_state()["seen"]) == 2
+
+
+def test_archive_pages_are_enumerated_and_unwrapped(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch, [400])
+    entries = backfill.collect_entries(session=HostSession(archive_ref=50), archive_urls=["https://archive.example/schedule"])
+
+    assert [e.page_url for e in entries] == [DISPLAY.format(ref=400), DISPLAY.format(ref=50)]
+
+
+def test_waf_challenge_on_pdf_is_blocked_not_failed(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch, [400, 401])
+
+    class ChallengeSession(HostSession):
+        def get(self, url, **kwargs):
+            if "/400/toc_pdf/" in url:
+                return DummyResp(url, "<!DOCTYPE html><html><head><title>Azure WAF</title></head></html>")
+            return super().get(url, **kwargs)
+
+    result = backfill.run_backfill(session=ChallengeSession())
+    assert result["blocked"] == 1 and result["failed"] == 0 and result["downloaded"] == 1
+    assert result["browser_fetch"][0]["id"] == DISPLAY.format(ref=400)
+    assert result["browser_fetch"][0]["waf"]["title"] == "Azure WAF"
@@ -0,0 +1,118 @@
+import hashlib
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+from estimates_monitor import cassette, cli, http, schedule, storage
+
+PDF = b"%PDF-1.4 " + b"transcript body " * 4000 + b"\n%%EOF\n"
+
+SCHEDULE = """<html><body><table><tbody>
+  <tr>
+    <td>10/02/2026</td>
+    <td><a href="/committee/rra">Rural and Regional Affairs</a></td>
+    <td>29366</td>
+    <td><a href="{base}/display.w3p;query=Id:%22committees/estimate/29366/0002%22">Published in full</a></td>
+  </tr>
+</tbody></table></body></html>"""
+
+DETAIL = '<html><body><a href="/download/committees/estimate/29366/toc_pdf/Rural.pdf">PDF</a></body></html>'
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        if self.path == "/old-schedule":
+            self.send_response(301)
+            self.send_header("Location", "/schedule")
+            self.end_headers()
+            return
+        if self.path == "/schedule":
+            body, ctype = SCHEDULE.format(base=base).encode(), "text/html; charset=utf-8"
+        elif self.path.startswith("/display.w3p"):
+            body, ctype = DETAIL.encode(), "text/html; charset=utf-8"
+        elif self.path.endswith(".pdf"):
+            body, ctype = PDF, "application/pdf"
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+    threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    yield srv, f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_download_latest_replays_offline(site, tmp_path, monkeypatch):
+    srv, base = site
+    monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", [base + "/old-schedule"])
+    tape = tmp_path / "tape"
+
+    recorded = cli.run_download_latest(session=cassette.RecordingSession(tape, session=http.make_session()))
+    srv.shutdown()  # nothing below may reach the network
+    storage.STATE_PATH.unlink()  # so the replay downloads again instead of skipping a seen entry
+
+    replay = cassette.ReplaySession(tape)
+    result = cli.run_download_latest(session=replay, now_func=lambda: datetime(2026, 2, 13))
+
+    assert result["pdf_sha256"] == recorded["pdf_sha256"] == hashlib.sha256(PDF).hexdigest()
+    assert Path(result["pdf_path"]).read_bytes() == PDF
+    assert result["id"] == recorded["id"] and result["id"].startswith(base + "/display.w3p")
+    assert [m for m, _ in replay.calls] == ["GET", "GET", "GET"]
+
+
+def test_replayed_response_looks_like_the_recorded_one(site, tmp_path):
+    _, base = site
+    tape = tmp_path / "tape"
+    live = cassette.RecordingSession(tape, session=http.make_session()).get(base + "/old-schedule", timeout=5)
+
+    resp = cassette.ReplaySession(tape).get(base + "/old-schedule", timeout=5)
+    assert resp.status_code == 200 and resp.ok
+    assert resp.url == live.url == base + "/schedule"  # redirect collapsed to the final URL
+    assert resp.text == live.text
+    assert resp.headers["Content-Type"] == "text/html; charset=utf-8"
+    assert b"".join(resp.iter_content(100)) == live.content
+    assert len(list((tape / "bodies").iterdir())) == 1
+
+
+def test_unrecorded_request_is_a_connection_error(tmp_path):
+    replay = cassette.ReplaySession(tmp_path)
+    # A ConnectionError, so callers take their usual network-failure path
+    with pytest.raises(requests.exceptions.ConnectionError) as exc:
+        replay.get("https://www.aph.gov.au/nothing")
+    assert isinstance(exc.value, cassette.CassetteMissError)
+
+
+def test_repeated_requests_replay_in_order_with_latency(site, tmp_path):
+    _, base = site
+    tape = tmp_path / "tape"
+    rec = cassette.RecordingSession(tape, session=http.make_session())
+    rec.get(base + "/schedule", timeout=5)
+    rec.get(base + "/missing", timeout=5)
+
+    slept = []
+    replay = cassette.ReplaySession(tape, latency_s=0.25, sleep=slept.append)
+    assert replay.get(base + "/schedule").status_code == 200
+    assert replay.get(base + "/schedule").status_code == 200  # last answer repeats
+    r = replay.get(base + "/missing")
+    with pytest.raises(requests.HTTPError):
+        r.raise_for_status()
+    assert r.status_code == 404 and r.reason == "Not Found"
+    assert slept == [0.25, 0.25, 0.25]
@@ -5,8 +5,9 @@ from estimates_monitor import cli, schedule, storage, downloader
 
 
 class DummyResp:
-    def __init__(self, data: bytes):
+    def __init__(self, data: bytes, status_code=200):
         self.data = data
+        self.status_code = status_code
     def raise_for_status(self):
         return
     def iter_content(self, chunk_size=8192):
@@ -17,9 +18,14 @@ class DummySession:
     def __init__(self, data: bytes):
         self.data = data
         self.calls = 0
+        self.heads = 0
     def get(self, url, stream=True, timeout=30):
         self.calls += 1
         return DummyResp(self.data)
+    def head(self, url, timeout=30, allow_redirects=True):
+        # A server that won't answer HEAD: no validators, so re-downloads GET again
+        self.heads += 1
+        return DummyResp(b"", status_code=405)
 
 
 def test_download_latest_writes_file_and_updates_state(tmp_path, monkeypatch):
@@ -38,7 +44,7 @@ def test_download_latest_writes_file_and_updates_state(tmp_path, monkeypatch):
     (tmp_path / "pdfs").mkdir(parents=True, exist_ok=True)
     (tmp_path / "pdfs" / "manual_download.pdf").write_bytes(b"<!doctype html>Azure WAF")
 
-    data = b"%PDF-1.4 mock data"
+    data = b"%PDF-1.4 mock data\n%%EOF\n"
     session = DummySession(data)
 
     result = cli.run_download_latest(session=session, now_func=lambda: datetime(2026, 2, 13, 10, 30, 0))
@@ -69,7 +75,7 @@ def test_download_latest_idempotent_without_force(tmp_path, monkeypatch):
     monkeypatch.setattr(storage, "STATE_PATH", tmp_path / "state.json")
     monkeypatch.setattr(downloader, "PDF_DIR", tmp_path / "pdfs")
 
-    data = b"%PDF-1.4 data"
+    data = b"%PDF-1.4 data\n%%EOF\n"
     session = DummySession(data)
 
     first = cli.run_download_latest(session=session, now_func=lambda: datetime(2026, 2, 13, 10, 30, 0))
@@ -80,6 +86,27 @@ def test_download_latest_idempotent_without_force(tmp_path, monkeypatch):
     assert second["pdf_path"] == first["pdf_path"]
 
 
+def test_force_download_falls_back_to_get_when_head_is_refused(tmp_path, monkeypatch):
+    entry = schedule.TranscriptEntry(
+        title="Estimates hearing 10b",
+        page_url="https://example.org/transcripts/est10b.html",
+        pdf_url="https://example.org/downloads/est10b.pdf",
+        published_date=None,
+        status="Published in full",
+    )
+    monkeypatch.setattr(cli.schedule, "get_latest_published", lambda session=None, is_seen_func=None, timeout_s=60: entry)
+    monkeypatch.setattr(storage, "STATE_PATH", tmp_path / "state.json")
+    monkeypatch.setattr(downloader, "PDF_DIR", tmp_path / "pdfs")
+
+    session = DummySession(b"%PDF-1.4 data 10b\n%%EOF\n")
+    first = cli.run_download_latest(session=session, now_func=lambda: datetime(2026, 2, 13, 10, 30, 0))
+    second = cli.run_download_latest(session=session, force_download=True, now_func=lambda: datetime(2026, 2, 13, 10, 31, 0))
+
+    assert session.heads == 1 and session.calls == 2
+    assert not second.get("not_modified")
+    assert second["pdf_sha256"] == first["pdf_sha256"]
+
+
 def test_download_latest_refuses_if_posted(tmp_path, monkeypatch):
     entry = schedule.TranscriptEntry(
         title="Estimates hearing 11",
@@ -116,3 +143,31 @@ def test_download_latest_dry_run_resolves_without_download(tmp_path, monkeypatch
     # State must not have been mutated
     state = storage.load_state()
     assert state.get("seen") is None or entry.page_url not in state.get("seen", {})
+
+
+def test_download_entry_resolves_and_downloads_a_given_row(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "STATE_PATH", tmp_path / "state.json")
+    monkeypatch.setattr(downloader, "PDF_DIR", tmp_path / "pdfs")
+    resolved = []
+
+    def fake_resolve(entry, session=None, timeout_s=30):
+        resolved.append(entry.page_url)
+        entry.pdf_url = entry.page_url.replace(".html", ".pdf")
+        return entry
+
+    monkeypatch.setattr(cli.schedule, "resolve_pdf", fake_resolve)
+    entry = schedule.TranscriptEntry(
+        title="Estimates hearing 12",
+        page_url="https://example.org/transcripts/est12.html",
+        pdf_url=None,
+        published_date=datetime(2026, 2, 14),
+        status="Published",
+    )
+    session = DummySession(b"%PDF-1.4 hearing 12\n%%EOF\n")
+
+    first = cli.run_download_entry(entry, session=session)
+    again = cli.run_download_entry(entry, session=session)
+
+    assert first["skipped"] is False and Path(first["pdf_path"]).exists()
+    assert again == {"id": entry.page_url, "title": entry.title, "pdf_path": first["pdf_path"], "skipped": True}
+    assert resolved == [entry.page_url] and session.calls == 1
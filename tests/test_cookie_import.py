@@ -0,0 +1,138 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from estimates_monitor import cookies, http
+
+
+class ClearanceHandler(BaseHTTPRequestHandler):
+    """403s like the WAF unless the clearance cookie is presented."""
+
+    def do_GET(self):
+        ok = "waf_clearance=ok" in (self.headers.get("Cookie") or "")
+        body = b"%PDF-1.4 transcript" if ok else b"<html>challenge</html>"
+        self.send_response(200 if ok else 403)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), ClearanceHandler)
+    threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def _netscape(path, expires):
+    path.write_text(
+        "# Netscape HTTP Cookie File\n"
+        f"#HttpOnly_127.0.0.1\tFALSE\t/\tFALSE\t{expires}\twaf_clearance\tok\n"
+        f".example.org\tTRUE\t/\tFALSE\t{expires}\ttracker\tx\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_imported_cookie_clears_waf_and_persists(server, tmp_path):
+    export = _netscape(tmp_path / "cookies.txt", int(time.time()) + 3600)
+    jar = tmp_path / "jar.txt"
+    s = http.make_session()
+    assert s.get(server + "/pdf", timeout=5).status_code == 403
+
+    result = cookies.import_cookies(export, session=s, jar_path=jar, domains=("127.0.0.1",))
+    assert result["imported"] == 1 and result["skipped"] == 1
+    assert s.get(server + "/pdf", timeout=5).status_code == 200
+
+    # A fresh session (next process) picks the clearance up from the jar
+    fresh = http.make_session()
+    assert cookies.load_saved_cookies(fresh.cookies, jar) == 1
+    assert fresh.get(server + "/pdf", timeout=5).status_code == 200
+
+
+def test_expired_cookies_are_not_imported(tmp_path):
+    export = _netscape(tmp_path / "cookies.txt", int(time.time()) - 10)
+    s = http.make_session()
+    result = cookies.import_cookies(export, session=s, jar_path=tmp_path / "jar.txt", domains=None)
+    assert result["imported"] == 0 and len(s.cookies) == 0
+
+
+@pytest.mark.parametrize("payload", [
+    # Playwright storage_state()
+    {"cookies": [{"name": "TS01", "value": "v", "domain": "parlinfo.aph.gov.au", "path": "/", "expires": -1, "httpOnly": True, "secure": True}], "origins": []},
+    # Chrome extension export
+    [{"name": "TS01", "value": "v", "domain": ".parlinfo.aph.gov.au", "path": "/", "expirationDate": time.time() + 600, "secure": True}],
+])
+def test_json_exports_are_parsed(tmp_path, payload):
+    export = tmp_path / "cookies.json"
+    export.write_text(json.dumps(payload), encoding="utf-8")
+    jar = tmp_path / "jar.txt"
+    s = http.make_session()
+
+    result = cookies.import_cookies(export, session=s, jar_path=jar)
+    assert result["imported"] == 1
+    assert s.cookies.get("TS01") == "v"
+    # Session cookies (no expiry) survive the round trip through the jar too
+    fresh = http.make_session()
+    assert cookies.load_saved_cookies(fresh.cookies, jar) == 1
+
+
+def test_shared_session_loads_saved_cookies(tmp_path):
+    export = _netscape(tmp_path / "cookies.txt", int(time.time()) + 3600)
+    cookies.import_cookies(export, session=http.make_session(), domains=None)
+    http.reset_session()
+    try:
+        assert http.get_session().cookies.get("waf_clearance") == "ok"
+    finally:
+        http.reset_session()
+
+
+def test_jar_is_owner_only(tmp_path):
+    export = _netscape(tmp_path / "cookies.txt", int(time.time()) + 3600)
+    jar = tmp_path / "jar.txt"
+    cookies.import_cookies(export, session=http.make_session(), jar_path=jar, domains=None)
+    assert jar.stat().st_mode & 0o777 == 0o600
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith("cookies") and p.name != "cookies.txt"] == []
+
+
+class RefreshingHandler(ClearanceHandler):
+    """Rotates the clearance cookie on every answer, as the WAF does."""
+
+    def end_headers(self):
+        self.send_header("Set-Cookie", "waf_clearance=ok2; Path=/; Max-Age=3600")
+        super().end_headers()
+
+
+def test_refreshed_cookies_are_saved_back(tmp_path, monkeypatch):
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), RefreshingHandler)
+    threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    monkeypatch.setattr(cookies, "COOKIE_DOMAINS", ("127.0.0.1",))
+    http.reset_session()
+    try:
+        cookies.import_cookies(_netscape(tmp_path / "cookies.txt", int(time.time()) + 3600), domains=None)
+        assert http.get_session().get(f"http://127.0.0.1:{srv.server_address[1]}/pdf", timeout=5).status_code == 200
+        assert http.save_shared_cookies() == 1
+    finally:
+        http.reset_session()
+        srv.shutdown()
+        srv.server_close()
+
+    fresh = http.make_session()
+    cookies.load_saved_cookies(fresh.cookies)
+    assert fresh.cookies.get("waf_clearance") == "ok2"
+    # Cookies for other domains already in the jar are left alone
+    assert fresh.cookies.get("tracker") == "x"
+
+
+def test_nothing_is_saved_without_a_shared_session():
+    http.reset_session()
+    assert http.save_shared_cookies() == 0
+    assert not cookies.COOKIE_JAR_PATH.exists()
@@ -0,0 +1,73 @@
+import hashlib
+import os
+from datetime import datetime
+from pathlib import Path
+
+from estimates_monitor import cli, downloader, http, schedule, storage
+from estimates_monitor.standin import StandinConfig, StandinServer
+
+
+def test_identical_pdfs_from_different_urls_are_stored_once(tmp_path):
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=50_000)) as srv:
+        url = srv.pdf_url(srv.rows[0].ref)
+        s = http.make_session()
+        a = downloader.download_pdf_deterministic(url, "Economics", session=s, out_dir=tmp_path)
+        b = downloader.download_pdf_deterministic(url.split(";")[0], "Economics mirror", session=s, out_dir=tmp_path)
+
+    sha = hashlib.sha256(srv.pdf_body(srv.rows[0].ref)).hexdigest()
+    assert a["sha256"] == b["sha256"] == sha
+    assert a["object_path"] == b["object_path"] == str(tmp_path / "objects" / sha[:2] / sha[2:4] / f"{sha}.pdf")
+    objects = [p for p in (tmp_path / "objects").rglob("*") if p.is_file()]
+    assert len(objects) == 1
+    assert a["path"] != b["path"]
+    assert os.path.samefile(a["path"], objects[0]) and os.path.samefile(b["path"], objects[0])
+    assert a["etag"] and a["last_modified"]
+
+
+def test_force_download_skips_unchanged_pdf_after_head(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "STATE_PATH", tmp_path / "state.json")
+    monkeypatch.setattr(downloader, "PDF_DIR", tmp_path / "pdfs")
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=80_000)) as srv:
+        row = srv.rows[0]
+        entry = schedule.TranscriptEntry(
+            title=row.title, page_url=srv.display_url(row.ref), pdf_url=srv.pdf_url(row.ref),
+            published_date=datetime(2026, 2, 27), status=row.status,
+        )
+        monkeypatch.setattr(cli.schedule, "get_latest_published", lambda session=None, is_seen_func=None, timeout_s=60: entry)
+        s = http.make_session()
+        first = cli.run_download_latest(session=s, now_func=lambda: datetime(2026, 2, 27, 10))
+        second = cli.run_download_latest(session=s, force_download=True, now_func=lambda: datetime(2026, 2, 28, 10))
+
+    assert srv.hits["pdf"] == 1 and srv.hits["head"] == 1
+    assert second["pdf_sha256"] == first["pdf_sha256"] and Path(second["pdf_path"]).exists()
+    seen = storage.get_seen(entry.page_url)
+    assert seen["pdf_etag"] == f'"pdf-{row.ref}-80000"' and seen["pdf_last_modified"]
+
+
+def test_changed_etag_downloads_again(tmp_path):
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=20_000)) as srv:
+        url = srv.pdf_url(srv.rows[0].ref)
+        s = http.make_session()
+        first = downloader.download_pdf_deterministic(url, "Economics", session=s, out_dir=tmp_path)
+        known = {"pdf_sha256": first["sha256"], "pdf_bytes": first["bytes"], "pdf_path": first["path"], "pdf_etag": '"older"'}
+        again = downloader.download_pdf_deterministic(url, "Economics", session=s, out_dir=tmp_path, known=known)
+
+    assert not again.get("not_modified")
+    assert srv.hits["head"] == 1 and srv.hits["pdf"] == 2
+
+
+def test_pre_store_download_is_adopted_without_transfer(tmp_path):
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=20_000)) as srv:
+        ref = srv.rows[0].ref
+        body = srv.pdf_body(ref)
+        sha = hashlib.sha256(body).hexdigest()
+        legacy = tmp_path / f"economics_{sha[:8]}.pdf"
+        legacy.write_bytes(body)
+        head = http.make_session().head(srv.pdf_url(ref), timeout=5)
+        known = {"pdf_sha256": sha, "pdf_bytes": len(body), "pdf_path": str(legacy), "pdf_last_modified": head.headers["Last-Modified"]}
+
+        dl = downloader.download_pdf_deterministic(srv.pdf_url(ref), "Economics", session=http.make_session(), out_dir=tmp_path, known=known)
+
+    assert dl["not_modified"] is True and srv.hits["pdf"] == 0
+    assert os.path.samefile(dl["path"], downloader.object_path(sha, tmp_path))
+    assert dl["path"] == str(legacy)
@@ -0,0 +1,82 @@
+import hashlib
+import io
+
+import pytest
+import requests
+
+from estimates_monitor import downloader, http
+from estimates_monitor.standin import StandinConfig, StandinServer
+
+SIZE = 3_000_001
+
+
+def test_buffered_reads_grow_and_reproduce_the_body():
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=SIZE)) as srv:
+        ref = srv.rows[0].ref
+        resp = http.make_session().get(srv.pdf_url(ref), stream=True, timeout=5)
+        chunks = [bytes(c) for c in downloader._body_chunks(resp, downloader.DOWNLOAD_CHUNK_BYTES)]
+        resp.close()
+
+    assert b"".join(chunks) == srv.pdf_body(ref)
+    sizes = [len(c) for c in chunks]
+    assert max(sizes) == downloader.DOWNLOAD_READ_MAX_BYTES
+    assert len(chunks) < SIZE // downloader.DOWNLOAD_READ_MIN_BYTES
+
+
+def test_drained_stream_is_marked_consumed_like_iter_content():
+    # _body_chunks relies on this private requests attribute; fail loudly if it is renamed
+    assert requests.Response()._content_consumed is False
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=100_000)) as srv:
+        resp = http.make_session().get(srv.pdf_url(srv.rows[0].ref), stream=True, timeout=5)
+        assert downloader._unread_stream(resp)
+        body = b"".join(bytes(c) for c in downloader._body_chunks(resp, downloader.DOWNLOAD_CHUNK_BYTES))
+        resp.close()
+    assert len(body) == 100_000
+    assert not downloader._unread_stream(resp)
+    with pytest.raises(RuntimeError):
+        resp.content
+
+
+def test_download_does_not_go_through_iter_content(tmp_path, monkeypatch):
+    def refuse(self, *a, **kw):
+        raise AssertionError("iter_content used")
+
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=SIZE)) as srv:
+        ref = srv.rows[0].ref
+        monkeypatch.setattr(requests.Response, "iter_content", refuse)
+        dl = downloader.download_pdf_deterministic(srv.pdf_url(ref), "Economics", session=http.make_session(), out_dir=tmp_path)
+    assert dl["sha256"] == hashlib.sha256(srv.pdf_body(ref)).hexdigest()
+
+
+def test_dropped_connection_keeps_every_byte_received(tmp_path, monkeypatch):
+    monkeypatch.setattr(downloader, "DOWNLOAD_RESUME_RETRIES", 0)
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=SIZE, drop_after_bytes=200_000)) as srv:
+        url = srv.pdf_url(srv.rows[0].ref)
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            downloader.download_pdf_deterministic(url, "Economics", session=http.make_session(retries=0), out_dir=tmp_path)
+    part, _ = downloader._part_paths(tmp_path, url)
+    assert part.stat().st_size == 200_000
+
+
+def test_encoded_and_replayed_bodies_use_iter_content():
+    class Resp:
+        def __init__(self, headers, consumed):
+            self.headers = headers
+            self.raw = io.BytesIO(b"raw bytes")
+            self._content_consumed = consumed
+
+        def iter_content(self, chunk_size):
+            yield b"decoded"
+
+    assert list(downloader._body_chunks(Resp({"Content-Encoding": "gzip"}, False), 8)) == [b"decoded"]
+    assert list(downloader._body_chunks(Resp({}, True), 8)) == [b"decoded"]
+    assert [bytes(c) for c in downloader._body_chunks(Resp({}, False), 8)] == [b"raw bytes"]
+
+
+def test_iter_content_path_gives_the_same_result(tmp_path, monkeypatch):
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=SIZE)) as srv:
+        url = srv.pdf_url(srv.rows[0].ref)
+        fast = downloader.download_pdf_deterministic(url, "Economics", session=http.make_session(), out_dir=tmp_path / "a")
+        monkeypatch.setattr(downloader, "DOWNLOAD_READINTO", False)
+        slow = downloader.download_pdf_deterministic(url, "Economics", session=http.make_session(), out_dir=tmp_path / "b")
+    assert fast["sha256"] == slow["sha256"] and fast["bytes"] == slow["bytes"] == SIZE
@@ -0,0 +1,75 @@
+import hashlib
+from pathlib import Path
+
+import pytest
+import requests
+
+from estimates_monitor import downloader, http
+from estimates_monitor.standin import StandinConfig, StandinServer
+
+SIZE = 300_000
+DROP = 120_000
+
+
+def _parts(out_dir: Path):
+    return sorted(p.name for p in (out_dir / downloader.PART_DIRNAME).glob("*")) if (out_dir / downloader.PART_DIRNAME).exists() else []
+
+
+def test_dropped_connection_resumes_with_range_in_the_same_call(tmp_path):
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=SIZE, drop_after_bytes=DROP)) as srv:
+        ref = srv.rows[0].ref
+        dl = downloader.download_pdf_deterministic(srv.pdf_url(ref), "Estimates", session=http.make_session(retries=0), out_dir=tmp_path)
+
+    body = srv.pdf_body(ref)
+    assert dl["sha256"] == hashlib.sha256(body).hexdigest() and dl["bytes"] == SIZE
+    assert Path(dl["path"]).read_bytes() == body
+    assert srv.hits["dropped"] == 1 and srv.hits["range"] == 1
+    # Only the missing tail (plus at most the chunk in flight when the connection dropped) went over the wire again
+    assert SIZE <= srv.hits["pdf_bytes"] < SIZE + downloader.DOWNLOAD_CHUNK_BYTES
+    assert _parts(tmp_path) == []
+
+
+def test_part_file_survives_a_failed_run_and_next_run_fetches_only_the_tail(tmp_path, monkeypatch):
+    monkeypatch.setattr(downloader, "DOWNLOAD_RESUME_RETRIES", 0)
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=SIZE, drop_after_bytes=DROP)) as srv:
+        url = srv.pdf_url(srv.rows[0].ref)
+        s = http.make_session(retries=0)
+        with pytest.raises(requests.exceptions.RequestException):
+            downloader.download_pdf_deterministic(url, "Estimates", session=s, out_dir=tmp_path)
+        part, meta = downloader._part_paths(tmp_path, url)
+        kept = part.stat().st_size
+        assert DROP - downloader.DOWNLOAD_CHUNK_BYTES < kept <= DROP and meta.exists()
+        assert list(tmp_path.glob("*.pdf")) == []
+
+        dl = downloader.download_pdf_deterministic(url, "Estimates", session=s, out_dir=tmp_path)
+
+    assert dl["sha256"] == hashlib.sha256(srv.pdf_body(srv.rows[0].ref)).hexdigest()
+    assert srv.hits["pdf_bytes"] - DROP == SIZE - kept
+    assert not part.exists() and not meta.exists()
+
+
+def test_changed_pdf_restarts_from_zero(tmp_path, monkeypatch):
+    monkeypatch.setattr(downloader, "DOWNLOAD_RESUME_RETRIES", 0)
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=SIZE, drop_after_bytes=DROP)) as srv:
+        url = srv.pdf_url(srv.rows[0].ref)
+        s = http.make_session(retries=0)
+        with pytest.raises(requests.exceptions.RequestException):
+            downloader.download_pdf_deterministic(url, "Estimates", session=s, out_dir=tmp_path)
+        # Pretend the server's copy changed since the partial was written
+        part, meta = downloader._part_paths(tmp_path, url)
+        meta.write_text(meta.read_text().replace('"pdf-', '"stale-'))
+        srv.config.drop_after_bytes = 0
+
+        dl = downloader.download_pdf_deterministic(url, "Estimates", session=s, out_dir=tmp_path)
+
+    assert dl["bytes"] == SIZE and dl["sha256"] == hashlib.sha256(srv.pdf_body(srv.rows[0].ref)).hexdigest()
+    assert srv.hits["range"] == 0  # If-Range mismatch: the server sent the whole body
+
+
+def test_no_partial_kept_when_server_does_not_take_ranges(tmp_path):
+    config = StandinConfig(rows=3, pdf_bytes=SIZE, drop_after_bytes=DROP, accept_ranges=False)
+    with StandinServer(config) as srv:
+        with pytest.raises(requests.exceptions.RequestException):
+            downloader.download_pdf_deterministic(srv.pdf_url(srv.rows[0].ref), "Estimates", session=http.make_session(retries=0), out_dir=tmp_path)
+    assert srv.hits["pdf"] == 1
+    assert _parts(tmp_path) == []
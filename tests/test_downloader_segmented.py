@@ -0,0 +1,61 @@
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from estimates_monitor import downloader, http
+from estimates_monitor.standin import StandinConfig, StandinServer
+
+SIZE = 1_000_003  # not a multiple of the segment count
+
+
+@pytest.fixture(autouse=True)
+def small_threshold(monkeypatch):
+    monkeypatch.setattr(downloader, "SEGMENTED_MIN_BYTES", 100_000)
+
+
+def test_segment_bounds_cover_the_file_exactly():
+    bounds = downloader._segment_bounds(SIZE, 4)
+    assert bounds[0][0] == 0 and bounds[-1][1] == SIZE - 1
+    assert all(b[1] + 1 == n[0] for b, n in zip(bounds, bounds[1:]))
+    assert downloader._segment_bounds(10, 4) == [(0, 2), (3, 5), (6, 8), (9, 9)]
+
+
+def test_segmented_download_matches_single_stream(tmp_path):
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=SIZE)) as srv:
+        ref = srv.rows[0].ref
+        dl = downloader.download_pdf_deterministic(srv.pdf_url(ref), "Economics", session=http.make_session(), out_dir=tmp_path, segments=4)
+
+    body = srv.pdf_body(ref)
+    assert dl["segments"] == 4 and dl["bytes"] == SIZE
+    assert dl["sha256"] == hashlib.sha256(body).hexdigest()
+    assert Path(dl["path"]).read_bytes() == body
+    assert srv.hits["head"] == 1 and srv.hits["range"] == 4
+    assert os.listdir(tmp_path / downloader.PART_DIRNAME) == []
+
+
+def test_dropped_segment_resumes_its_own_range(tmp_path):
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=SIZE, drop_after_bytes=50_000)) as srv:
+        ref = srv.rows[0].ref
+        dl = downloader.download_pdf_deterministic(srv.pdf_url(ref), "Economics", session=http.make_session(retries=0), out_dir=tmp_path, segments=4)
+
+    assert dl["sha256"] == hashlib.sha256(srv.pdf_body(ref)).hexdigest()
+    assert srv.hits["dropped"] == 1 and srv.hits["range"] == 5
+
+
+def test_falls_back_to_single_stream_without_ranges(tmp_path):
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=SIZE, accept_ranges=False)) as srv:
+        ref = srv.rows[0].ref
+        dl = downloader.download_pdf_deterministic(srv.pdf_url(ref), "Economics", session=http.make_session(), out_dir=tmp_path, segments=4)
+
+    assert "segments" not in dl
+    assert dl["sha256"] == hashlib.sha256(srv.pdf_body(ref)).hexdigest()
+    assert srv.hits["range"] == 0 and srv.hits["pdf"] == 1
+
+
+def test_small_pdfs_use_a_single_stream(tmp_path, monkeypatch):
+    monkeypatch.setattr(downloader, "SEGMENTED_MIN_BYTES", SIZE + 1)
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=SIZE)) as srv:
+        dl = downloader.download_pdf_deterministic(srv.pdf_url(srv.rows[0].ref), "Economics", session=http.make_session(), out_dir=tmp_path, segments=4)
+    assert "segments" not in dl and srv.hits["range"] == 0
@@ -0,0 +1,108 @@
+import os
+from datetime import datetime
+
+import pytest
+import requests
+
+from estimates_monitor import cli, downloader, http, schedule, storage
+from estimates_monitor.standin import StandinConfig, StandinServer
+
+
+class DummyResp:
+    def __init__(self, chunks, headers=None, status_code=200):
+        self.chunks = chunks
+        self.headers = headers or {}
+        self.status_code = status_code
+        self.sent = 0
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+    def iter_content(self, chunk_size=8192):
+        for c in self.chunks:
+            self.sent += 1
+            yield c
+
+
+class DummySession:
+    def __init__(self, resp):
+        self.resp = resp
+
+    def get(self, url, stream=True, timeout=30):
+        return self.resp
+
+    def head(self, url, timeout=30, allow_redirects=True):
+        return self.resp
+
+
+def _leftovers(out_dir):
+    return [p for p in out_dir.rglob("*") if p.is_file()]
+
+
+@pytest.mark.parametrize("waf_status", [403, 200])
+def test_challenge_page_raises_typed_error_and_leaves_nothing(tmp_path, waf_status):
+    with StandinServer(StandinConfig(rows=4, waf_every=2, waf_status=waf_status)) as srv:
+        ref = next(r.ref for r in srv.rows if srv.behind_waf(r.ref))
+        with pytest.raises(downloader.WafChallengeError) as exc:
+            downloader.download_pdf_deterministic(srv.pdf_url(ref), "Economics", session=http.make_session(retries=0), out_dir=tmp_path)
+
+    err = exc.value
+    assert isinstance(err, requests.HTTPError)
+    assert err.status_code == waf_status and err.title == "Azure WAF"
+    assert err.content_type.startswith("text/html") and err.reference == f"standin-{ref}"
+    assert _leftovers(tmp_path) == []
+
+
+def test_stream_is_abandoned_after_the_sniff_window(tmp_path):
+    resp = DummyResp([b"<!DOCTYPE html><html><head><title>Just a moment</title>"] + [b"x" * 8192] * 100)
+    with pytest.raises(downloader.WafChallengeError) as exc:
+        downloader.download_pdf_deterministic("https://example.org/a.pdf", "a", session=DummySession(resp), out_dir=tmp_path)
+    # The sniff buffers up to PDF_SNIFF_BYTES before deciding; the remaining ~800 KB is never read
+    assert resp.sent == 2
+    assert exc.value.title == "Just a moment"
+
+
+def test_pdf_without_trailer_is_rejected(tmp_path):
+    resp = DummyResp([b"%PDF-1.4 truncated body"], headers={"Content-Type": "application/pdf"})
+    with pytest.raises(downloader.InvalidPdfError):
+        downloader.download_pdf_deterministic("https://example.org/a.pdf", "a", session=DummySession(resp), out_dir=tmp_path)
+    assert _leftovers(tmp_path) == []
+
+
+def test_non_pdf_binary_is_rejected(tmp_path):
+    resp = DummyResp([b"PK\x03\x04 zip archive"], headers={"Content-Type": "application/octet-stream"})
+    with pytest.raises(downloader.InvalidPdfError):
+        downloader.download_pdf_deterministic("https://example.org/a.pdf", "a", session=DummySession(resp), out_dir=tmp_path)
+
+
+def test_leading_junk_before_the_header_is_allowed(tmp_path):
+    resp = DummyResp([b"\r\n\r\n", b"%PDF-1.7 body", b"\n%%EOF\r\n"])
+    dl = downloader.download_pdf_deterministic("https://example.org/a.pdf", "a", session=DummySession(resp), out_dir=tmp_path)
+    assert dl["bytes"] == 4 + 13 + 8
+
+
+def test_segmented_download_sniffs_the_first_segment(tmp_path, monkeypatch):
+    monkeypatch.setattr(downloader, "SEGMENTED_MIN_BYTES", 0)
+    with StandinServer(StandinConfig(rows=4, pdf_bytes=400_000)) as srv:
+        ref = srv.rows[0].ref
+        monkeypatch.setattr("estimates_monitor.standin.pdf_body", lambda r, size: b"<html>" + b"x" * (size - 6))
+        with pytest.raises(downloader.WafChallengeError):
+            downloader.download_pdf_deterministic(srv.pdf_url(ref), "a", session=http.make_session(), out_dir=tmp_path, segments=4)
+    assert _leftovers(tmp_path) == []
+
+
+def test_download_latest_hands_challenge_to_browser(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "STATE_PATH", tmp_path / "state.json")
+    monkeypatch.setattr(downloader, "PDF_DIR", tmp_path / "pdfs")
+    with StandinServer(StandinConfig(rows=4, waf_every=2, waf_status=200)) as srv:
+        row = next(r for r in srv.rows if srv.behind_waf(r.ref))
+        entry = schedule.TranscriptEntry(title=row.title, page_url=srv.display_url(row.ref), pdf_url=srv.pdf_url(row.ref),
+                                         published_date=datetime(2026, 2, 27), status=row.status)
+        monkeypatch.setattr(cli.schedule, "get_latest_published", lambda session=None, is_seen_func=None, timeout_s=60: entry)
+        result = cli.run_download_latest(session=http.make_session(retries=0))
+
+    assert result["action"] == "browser_fetch" and result["parlinfo_blocked"] is True
+    assert result["waf"]["status_code"] == 200 and result["pdf_url"] == entry.pdf_url
+    assert storage.get_seen(entry.page_url) is None
+    assert not os.path.exists(tmp_path / "pdfs") or _leftovers(tmp_path / "pdfs") == []
@@ -0,0 +1,74 @@
+import dataclasses
+from datetime import datetime
+from pathlib import Path
+
+from estimates_monitor import schedule
+from estimates_monitor.entry_table import EntryTable
+from estimates_monitor.schedule import TranscriptEntry
+
+
+def _entries():
+    parsed = schedule._parse_schedule_html(Path("schedule.html").read_text(encoding="utf-8"))
+    extra = [
+        TranscriptEntry(title="No ref", page_url="https://example.org/a", pdf_url="https://example.org/a.pdf",
+                        published_date=datetime(2026, 2, 13, 9, 30, 15), status="Published", parlinfo_blocked=True),
+        TranscriptEntry(title="No date", page_url="https://example.org/b", pdf_url=None,
+                        published_date=None, status="Published", ref_no=5, resolve_error="ReadTimeout: read timed out"),
+    ]
+    return parsed + extra
+
+
+def test_round_trip_is_lossless():
+    entries = _entries()
+    table = EntryTable.from_entries(entries)
+    assert len(table) == len(entries)
+    assert table.to_entries() == entries
+    assert table[-1] == entries[-1]
+
+
+def test_round_trip_keeps_every_field():
+    # Every TranscriptEntry field set to a non-default value; a new field fails here until stored
+    full = TranscriptEntry(
+        title="Full", page_url="https://example.org/full", pdf_url="https://example.org/full.pdf",
+        published_date=datetime(2026, 2, 13, 9, 30), status="Published", committee_url="https://example.org/c",
+        ref_no=7, parlinfo_blocked=True, resolve_error="HTTPError: 500",
+    )
+    defaults = TranscriptEntry(title="", page_url="", pdf_url=None, published_date=None, status="")
+    for f in dataclasses.fields(TranscriptEntry):
+        assert getattr(full, f.name) != getattr(defaults, f.name), f.name
+
+    table = EntryTable.from_entries([defaults, full])
+    assert table.to_entries() == [defaults, full]
+    assert table.take([1]).to_entries() == [full]
+
+
+def test_sort_matches_schedule_ordering():
+    entries = _entries()
+    table = EntryTable.from_entries(entries)
+    expected = sorted(entries, key=schedule._sort_key_latest, reverse=True)
+    assert table.sort_latest().to_entries() == expected
+    assert table.sort_latest(reverse=False).to_entries() == expected[::-1]
+
+
+def test_filters():
+    entries = _entries()
+    table = EntryTable.from_entries(entries)
+
+    assert [e.title for e in table.filter(status="Published")] == ["No ref", "No date"]
+    assert len(table.filter(status="Nope")) == 0
+
+    lo, hi = datetime(2025, 2, 1), datetime(2025, 3, 1)
+    in_range = [e for e in entries if e.published_date and lo <= e.published_date <= hi]
+    assert table.filter(date_from=lo, date_to=hi).to_entries() == in_range
+
+    refs = [e for e in entries if e.ref_no is not None and 29300 <= e.ref_no <= 29360]
+    got = table.filter(ref_min=29300, ref_max=29360, status="Published in full")
+    assert got.to_entries() == [e for e in refs if e.status == "Published in full"]
+
+
+def test_repeated_strings_are_interned():
+    table = EntryTable.from_entries(_entries())
+    assert len(table._titles.values) < len(table)
+    assert len(table._prefixes.values) < len(table) // 5
+    # Derived tables share the interned values
+    assert table.filter(status="Published")._titles is table._titles
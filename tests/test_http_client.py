@@ -0,0 +1,155 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+from estimates_monitor import http
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers 503 ``fail_first`` times per path, then 200."""
+
+    fail_first = 2
+    hits = {}
+    seen_headers = []
+
+    def _answer(self):
+        n = self.hits.get(self.path, 0)
+        self.hits[self.path] = n + 1
+        self.seen_headers.append(dict(self.headers))
+        if n < self.fail_first:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _answer
+    do_POST = _answer
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(http, "HTTP_BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(http, "HTTP_BACKOFF_JITTER", 0)
+    FlakyHandler.hits = {}
+    FlakyHandler.seen_headers = []
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    t = threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    t.start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_shared_session_is_reused_and_resettable():
+    http.reset_session()
+    a = http.get_session()
+    assert http.get_session() is a
+    http.reset_session()
+    assert http.get_session() is not a
+    http.reset_session()
+
+
+def test_session_defaults():
+    s = http.make_session()
+    assert s.headers["User-Agent"] == http.DEFAULT_HEADERS["User-Agent"]
+    assert "gzip" in s.headers["Accept-Encoding"]
+    adapter = s.get_adapter("https://parlinfo.aph.gov.au/")
+    assert adapter.max_retries.total == http.HTTP_RETRIES
+    assert 429 in adapter.max_retries.status_forcelist
+    assert adapter._pool_maxsize == http.HTTP_POOL_MAXSIZE
+
+
+def test_get_is_retried_through_5xx(server):
+    resp = http.make_session(retries=3).get(server + "/schedule", timeout=5)
+    assert resp.status_code == 200
+    assert FlakyHandler.hits["/schedule"] == 3
+    assert FlakyHandler.seen_headers[0]["User-Agent"] == http.DEFAULT_HEADERS["User-Agent"]
+
+
+def test_exhausted_retries_return_last_response(server):
+    resp = http.make_session(retries=1).get(server + "/down", timeout=5)
+    assert resp.status_code == 503
+    assert FlakyHandler.hits["/down"] == 2
+
+
+def test_post_is_never_retried(server):
+    resp = http.make_session(retries=3).post(server + "/tweet", json={"text": "hi"}, timeout=5)
+    assert resp.status_code == 503
+    assert FlakyHandler.hits["/tweet"] == 1
+
+
+def test_no_retry_session_returns_the_first_503(server):
+    shared = http.make_session(retries=3)
+    shared.headers["X-Probe"] = "1"
+    quick = http.no_retry_session(shared)
+    assert http.no_retry_session(shared) is quick
+    assert quick.cookies is shared.cookies
+
+    resp = quick.get(server + "/schedule", timeout=5)
+    assert resp.status_code == 503 and FlakyHandler.hits["/schedule"] == 1
+    assert FlakyHandler.seen_headers[-1]["X-Probe"] == "1"
+
+
+class FakeAdapter(requests.adapters.BaseAdapter):
+    def __init__(self, html):
+        super().__init__()
+        self.html = html
+        self.hits = 0
+
+    def send(self, request, **kwargs):
+        self.hits += 1
+        resp = requests.Response()
+        resp.status_code, resp.url, resp._content = 200, request.url, self.html.encode("utf-8")
+        resp.request = request
+        return resp
+
+    def close(self):
+        pass
+
+
+def test_injected_session_keeps_its_adapters(monkeypatch):
+    from estimates_monitor import schedule
+
+    html = Path("fixtures/schedule.html").read_text(encoding="utf-8")
+    s = requests.Session()
+    fake = FakeAdapter(html)
+    s.mount("https://", fake)
+    assert http.no_retry_session(s) is s
+    assert schedule.get_schedule(session=s, use_cache=False)
+    assert fake.hits == 1
+
+
+def test_no_retry_sibling_keeps_settings_and_custom_adapters():
+    s = http.make_session()
+    s.verify, s.proxies, s.auth = "/tmp/ca.pem", {"https": "http://proxy:3128"}, ("u", "p")
+    fake = FakeAdapter("")
+    s.mount("https://example.org/", fake)
+    quick = http.no_retry_session(s)
+    assert (quick.verify, quick.proxies, quick.auth, quick.hooks) == (s.verify, s.proxies, s.auth, s.hooks)
+    assert quick.get_adapter("https://example.org/x") is fake
+    assert quick.get_adapter("https://www.aph.gov.au/").max_retries.total == 0
+
+
+def test_schedule_fallback_is_not_delayed_by_status_retries(server, monkeypatch):
+    from estimates_monitor import schedule
+
+    FlakyHandler.fail_first = 100
+    try:
+        monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", [server + "/primary", server + "/fallback"])
+        with pytest.raises(Exception):
+            schedule._fetch_schedule_from(session=http.make_session(retries=3), timeout_s=5, hedge_delay_s=None)
+    finally:
+        FlakyHandler.fail_first = 2
+    # One GET per candidate: the 503 moved straight on to the fallback
+    assert FlakyHandler.hits == {"/primary": 1, "/fallback": 1}
@@ -0,0 +1,165 @@
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from estimates_monitor import http, schedule
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, s):
+        self.slept.append(s)
+        self.now += s
+
+
+def test_token_bucket_bursts_then_paces():
+    clock = FakeClock()
+    limiter = http.RateLimiter({"parlinfo.aph.gov.au": (2.0, 3)}, clock=clock, sleep=clock.sleep)
+    waits = [limiter.acquire("parlinfo.aph.gov.au") for _ in range(5)]
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3:] == [pytest.approx(0.5), pytest.approx(0.5)]
+    # Idle time refills the bucket up to the burst size
+    clock.now += 60
+    assert [limiter.acquire("parlinfo.aph.gov.au") for _ in range(3)] == [0, 0, 0]
+
+
+def test_hosts_have_separate_budgets_and_parent_domain_fallback():
+    clock = FakeClock()
+    limiter = http.RateLimiter({"parlinfo.aph.gov.au": (1.0, 1), "aph.gov.au": (1.0, 2)}, clock=clock, sleep=clock.sleep)
+    assert limiter.acquire("parlinfo.aph.gov.au") == 0
+    assert limiter.acquire("www.aph.gov.au") == 0
+    assert limiter.acquire("www.aph.gov.au") == 0
+    assert limiter.acquire("parlinfo.aph.gov.au") == pytest.approx(1.0)
+    assert limiter.acquire("example.org") == 0  # unlimited
+
+
+def test_breaker_opens_cools_down_and_probes_once():
+    clock = FakeClock()
+    breaker = http.CircuitBreaker(threshold=3, cooldown_s=60, clock=clock)
+    host = "parlinfo.aph.gov.au"
+    for _ in range(2):
+        breaker.before_request(host)
+        breaker.record(host, ok=False)
+    assert not breaker.is_open(host)
+    breaker.record(host, ok=False)
+    assert breaker.is_open(host)
+
+    with pytest.raises(http.CircuitOpenError) as exc:
+        breaker.before_request(host)
+    assert exc.value.retry_in_s == pytest.approx(60)
+    breaker.before_request("www.aph.gov.au")  # other hosts unaffected
+
+    clock.now += 61
+    breaker.before_request(host)  # the half-open probe
+    with pytest.raises(http.CircuitOpenError):
+        breaker.before_request(host)  # only one probe at a time
+    breaker.record(host, ok=False)  # probe failed: open again
+    with pytest.raises(http.CircuitOpenError):
+        breaker.before_request(host)
+
+    clock.now += 61
+    breaker.before_request(host)
+    breaker.record(host, ok=True)
+    assert not breaker.is_open(host)
+    breaker.before_request(host)
+
+
+class WafHandler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        self.send_response(403)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def waf_server():
+    WafHandler.hits = 0
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), WafHandler)
+    threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_session_fails_fast_once_circuit_opens(waf_server, monkeypatch):
+    monkeypatch.setattr(http, "HTTP_BREAKER_THRESHOLD", 3)
+    s = http.make_session()
+    for _ in range(3):
+        assert s.get(waf_server + "/page", timeout=5).status_code == 403
+    with pytest.raises(http.CircuitOpenError):
+        s.get(waf_server + "/page", timeout=5)
+    assert WafHandler.hits == 3
+
+
+def test_resolve_pdf_treats_open_circuit_as_blocked(waf_server, monkeypatch):
+    monkeypatch.setattr(http, "HTTP_BREAKER_THRESHOLD", 1)
+    s = http.make_session()
+    s.get(waf_server + "/x", timeout=5)
+    entry = schedule.TranscriptEntry(
+        title="T", page_url=waf_server + "/display.w3p;query=Id:%22committees/estimate/1/0001%22",
+        pdf_url=None, published_date=datetime(2026, 2, 10), status="Published",
+    )
+    schedule.resolve_pdf(entry, session=s)
+    assert entry.parlinfo_blocked and entry.pdf_url is None
+    assert WafHandler.hits == 1
+
+
+class BusyHandler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def busy_server(monkeypatch):
+    monkeypatch.setattr(http, "HTTP_BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(http, "HTTP_BACKOFF_JITTER", 0)
+    BusyHandler.hits = 0
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), BusyHandler)
+    threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_each_retry_attempt_takes_a_token(busy_server, monkeypatch):
+    monkeypatch.setattr(http, "HTTP_BREAKER_THRESHOLD", 100)
+    clock = FakeClock()
+    limiter = http.RateLimiter({"127.0.0.1": (1.0, 1)}, clock=clock, sleep=clock.sleep)
+    monkeypatch.setattr(http, "RATE_LIMITER", limiter)
+
+    resp = http.make_session(retries=3).get(busy_server + "/burst", timeout=5)
+
+    assert resp.status_code == 503 and BusyHandler.hits == 4
+    # One token for the first attempt, then one per retry paced at 1/s
+    assert clock.slept == [pytest.approx(1.0)] * 3
+
+
+def test_circuit_opening_mid_retry_stops_the_retries(busy_server, monkeypatch):
+    monkeypatch.setattr(http, "HTTP_BREAKER_THRESHOLD", 2)
+    s = http.make_session(retries=3)
+    with pytest.raises(http.CircuitOpenError):
+        s.get(busy_server + "/burst", timeout=5)
+    assert BusyHandler.hits == 2
+    assert http.CIRCUIT_BREAKER.is_open("127.0.0.1")
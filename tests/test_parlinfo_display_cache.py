@@ -0,0 +1,128 @@
+import os
+import time
+
+import pytest
+
+from estimates_monitor import cli, http, parlinfo, schedule
+
+DISPLAY = "https://parlinfo.aph.gov.au/parlInfo/search/display/display.w3p;query=Id:%22committees/estimate/29366/0002%22"
+DETAIL = '<a href="https://parlinfo.aph.gov.au/parlInfo/download/committees/estimate/29366/toc_pdf/RIGHT.pdf;fileType=application%2Fpdf">PDF</a>'
+
+
+class DummyResp:
+    def __init__(self, url, text, status_code=200):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+
+class CountingSession:
+    def __init__(self, text=DETAIL, status_code=200, own=True):
+        self.text = text
+        self.status_code = status_code
+        self.calls = 0
+        if own:
+            # Stands in for a make_session() session, which uses the on-disk cache
+            http.mark_own_session(self)
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return DummyResp(url, self.text, self.status_code)
+
+
+def test_normalise_display_url_merges_encodings():
+    encoded = "http://parlinfo.aph.gov.au/parlInfo/search/display/display.w3p;query=Id%3A%22committees%2Festimate%2F29366%2F0002%22#x"
+    plain = 'https://PARLINFO.aph.gov.au/parlInfo/search/display/display.w3p;query=Id:"committees/estimate/29366/0002"'
+    assert parlinfo.normalise_display_url(encoded) == parlinfo.normalise_display_url(plain)
+
+
+def test_second_resolution_costs_no_network():
+    session = CountingSession()
+    first = cli.run_resolve_pdf(DISPLAY, session=session)
+    second = cli.run_resolve_pdf(DISPLAY.replace("%22", '"'), session=session)
+    assert first == second
+    assert first.endswith("/toc_pdf/RIGHT.pdf;fileType=application%2Fpdf")
+    assert session.calls == 1
+
+    entry = schedule.TranscriptEntry(title="t", page_url=DISPLAY, pdf_url=None, published_date=None, status="Published in full")
+    schedule.resolve_pdf(entry, session=session)
+    assert entry.pdf_url == first
+    assert session.calls == 1
+
+
+def test_expired_and_disabled_cache_refetch(monkeypatch):
+    session = CountingSession()
+    parlinfo.fetch_display_page(DISPLAY, session=session)
+    parlinfo.fetch_display_page(DISPLAY, session=session, ttl_s=0)
+    assert session.calls == 2
+    page = parlinfo.fetch_display_page(DISPLAY, session=session)
+    assert page.from_cache and session.calls == 2
+
+    monkeypatch.setattr(parlinfo, "DISPLAY_CACHE_ENABLED", False)
+    page = parlinfo.fetch_display_page(DISPLAY, session=session)
+    assert not page.from_cache and session.calls == 3
+
+
+def test_403_is_not_cached():
+    session = CountingSession(text="<html>Azure WAF</html>", status_code=403)
+    entry = schedule.TranscriptEntry(title="t", page_url=DISPLAY, pdf_url=None, published_date=None, status="Published in full")
+    schedule.resolve_pdf(entry, session=session)
+    assert entry.parlinfo_blocked
+    with pytest.raises(Exception):
+        parlinfo.fetch_display_page(DISPLAY, session=session).raise_for_status()
+    assert session.calls == 2
+
+
+def test_lru_eviction_keeps_recently_used(monkeypatch):
+    monkeypatch.setattr(parlinfo, "DISPLAY_CACHE_MAX_BYTES", 3000)
+    session = CountingSession(text=DETAIL + "x" * (1000 - len(DETAIL)))
+    urls = [DISPLAY.replace("0002", f"000{i}") for i in range(3)]
+    parlinfo.fetch_display_page(urls[0], session=session)
+    parlinfo.fetch_display_page(urls[1], session=session)
+    # make urls[0] the most recently used, then push the cache over budget
+    old = time.time() - 100
+    os.utime(parlinfo._display_cache_path(urls[1]), (old, old))
+    parlinfo.fetch_display_page(urls[0], session=session)
+    parlinfo.fetch_display_page(urls[2], session=session)
+
+    assert parlinfo._display_cache_path(urls[0]).exists()
+    assert not parlinfo._display_cache_path(urls[1]).exists()
+    assert parlinfo._display_cache_path(urls[2]).exists()
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "<!DOCTYPE html><html><head><title>Azure WAF</title></head><body>Checking your browser</body></html>",
+    "<html><body>Transcript not yet available</body></html>",
+])
+def test_pages_without_the_expected_markup_are_not_cached(text):
+    session = CountingSession(text=text)
+    parlinfo.fetch_display_page(DISPLAY, session=session)
+    assert not parlinfo._display_cache_path(DISPLAY).exists()
+
+    session.text = DETAIL
+    page = parlinfo.fetch_display_page(DISPLAY, session=session)
+    assert not page.from_cache and session.calls == 2
+    assert parlinfo.fetch_display_page(DISPLAY, session=session).from_cache
+
+
+def test_empty_body_already_on_disk_is_ignored():
+    parlinfo._write_display_cache(DISPLAY, parlinfo.DisplayPage(url=DISPLAY, status_code=200, text="", fetched_at=time.time()))
+    session = CountingSession()
+    page = parlinfo.fetch_display_page(DISPLAY, session=session)
+    assert not page.from_cache and session.calls == 1 and "toc_pdf" in page.text
+
+
+def test_injected_session_does_not_touch_the_cache():
+    # e.g. run_check.py's dummy session answering the real 29366 display URL
+    parlinfo._write_display_cache(DISPLAY, parlinfo.DisplayPage(url=DISPLAY, status_code=200, text=DETAIL, fetched_at=time.time()))
+    session = CountingSession(text=DETAIL.replace("RIGHT", "FIXTURE"), own=False)
+    page = parlinfo.fetch_display_page(DISPLAY, session=session)
+    assert not page.from_cache and "FIXTURE" in page.text
+    assert "RIGHT" in parlinfo._read_display_cache(DISPLAY, parlinfo.DISPLAY_CACHE_TTL_S).text
+
+    # Opting in explicitly still works
+    assert parlinfo.fetch_display_page(DISPLAY, session=session, use_cache=True).from_cache
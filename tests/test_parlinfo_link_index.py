@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from estimates_monitor import parlinfo, schedule
+
+DISPLAY = "https://parlinfo.aph.gov.au/parlInfo/search/display/display.w3p;query=Id:%22committees/estimate/29366/0002%22"
+
+DETAIL = """
+<html><body>
+  <script>var a = '<a href="/x.pdf">';</script>
+  <a href="/nav">Home</a>
+  <a href="https://parlinfo.aph.gov.au/parlInfo/download/committees/estimate/29366/other/WRONG.pdf;fileType=application%2Fpdf">PDF</a>
+  <a href="https://parlinfo.aph.gov.au/parlInfo/download/committees/estimate/29366/toc_pdf/RIGHT.pdf;fileType=application%2Fpdf#search=%22committees/estimate/29366/0002%22"><span>Download</span>
+     PDF &amp; print</a>
+</body></html>
+"""
+
+
+def test_index_tokenises_anchor_flags():
+    index = parlinfo.PdfLinkIndex.from_html(DETAIL)
+    assert [link.text for link in index.links] == ["Home", "PDF", "Download PDF & print"]
+    pdfs = index.pdf_links()
+    assert len(pdfs) == 2
+    wrong, right = pdfs
+    assert not wrong.toc_pdf and wrong.estimate_id == "29366"
+    assert right.toc_pdf and right.estimate_id == "29366"
+    assert right.fragment == "search=%22committees/estimate/29366/0002%22"
+    assert "committees/estimate/29366/0002" in right.decoded
+    assert [link.href for link in index.for_estimate("29366")] == [wrong.href, right.href]
+
+
+def test_both_strategies_accept_index_and_agree_with_html():
+    index = parlinfo.PdfLinkIndex.from_html(DETAIL)
+    est, _, id_str = schedule._extract_estimate_id_parts(DISPLAY)
+    assert parlinfo.extract_pdf_url(DISPLAY, index) == parlinfo.extract_pdf_url(DISPLAY, DETAIL)
+    assert schedule._pick_pdf_link(index, DISPLAY, estimate_id=est, id_str=id_str) == \
+        schedule._pick_pdf_link(DETAIL, DISPLAY, estimate_id=est, id_str=id_str)
+    assert "/toc_pdf/RIGHT.pdf" in schedule._pick_pdf_link(index, DISPLAY, estimate_id=est, id_str=id_str)
+
+
+def test_fixtures_resolve_as_before():
+    html = Path('fixtures/detail_29366.html').read_text(encoding='utf-8')
+    assert "/toc_pdf/" in parlinfo.extract_pdf_url(DISPLAY, parlinfo.PdfLinkIndex.from_html(html))
+    detail = Path('fixtures/detail.html').read_text(encoding='utf-8')
+    assert schedule._pick_pdf_link(detail, "https://example.org/").endswith('transcript-estimates1.pdf')
+
+
+def test_resolve_pdf_parses_detail_page_once(monkeypatch):
+    class Resp:
+        url = DISPLAY
+        status_code = 200
+        text = DETAIL
+
+        def raise_for_status(self):
+            pass
+
+    class Session:
+        def get(self, url, **kwargs):
+            return Resp()
+
+    calls = []
+    real = parlinfo.PdfLinkIndex.from_html
+
+    def counting(html):
+        calls.append(html)
+        return real(html)
+
+    monkeypatch.setattr(parlinfo.PdfLinkIndex, "from_html", staticmethod(counting))
+    # force the generic fallback to run too by hiding the toc link from extract_pdf_url
+    monkeypatch.setattr(parlinfo, "extract_pdf_url", lambda url, links: None)
+    entry = schedule.TranscriptEntry(title="t", page_url=DISPLAY, pdf_url=None, published_date=None, status="Published in full")
+    schedule.resolve_pdf(entry, session=Session())
+    assert "/toc_pdf/RIGHT.pdf" in entry.pdf_url
+    assert len(calls) == 1
@@ -11,7 +11,7 @@ def test_parlinfo_preserves_aph_host_and_downloader_works(tmp_path, monkeypatch)
     assert pdf.startswith("https://www.aph.gov.au/-/media/")
 
     # Now ensure downloader can fetch it (mock session)
-    data = b"%PDF-1.4 mock"
+    data = b"%PDF-1.4 mock\n%%EOF\n"
     class DummyResp:
         def __init__(self, data):
             self.data = data
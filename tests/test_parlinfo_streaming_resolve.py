@@ -0,0 +1,91 @@
+from estimates_monitor import cli, http, parlinfo, schedule
+
+DISPLAY = "https://parlinfo.aph.gov.au/parlInfo/search/display/display.w3p;query=Id:%22committees/estimate/29366/0002%22"
+TOC = '<a href="https://parlinfo.aph.gov.au/parlInfo/download/committees/estimate/{ref}/toc_pdf/T{ref}.pdf;fileType=application%2Fpdf">PDF</a>'
+FILLER = "<p>" + "x" * 1000 + "</p>\n"
+
+
+class StreamResp:
+    def __init__(self, url, body: bytes, status_code=200):
+        self.url = url
+        self.body = body
+        self.status_code = status_code
+        self.encoding = "utf-8"
+        self.bytes_read = 0
+        self.closed = False
+
+    @property
+    def text(self):
+        self.bytes_read = len(self.body)
+        return self.body.decode("utf-8")
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.body), chunk_size):
+            chunk = self.body[i:i + chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class StreamSession:
+    def __init__(self, body: str):
+        self.body = body.encode("utf-8")
+        self.responses = []
+
+    def get(self, url, **kwargs):
+        resp = StreamResp(url, self.body)
+        self.responses.append((kwargs.get("stream"), resp))
+        return resp
+
+
+def _entry():
+    return schedule.TranscriptEntry(title="t", page_url=DISPLAY, pdf_url=None, published_date=None, status="Published in full")
+
+
+def test_stops_reading_after_decisive_toc_link(monkeypatch):
+    monkeypatch.setattr(parlinfo, "DISPLAY_STREAM_CHUNK_BYTES", 1024)
+    body = FILLER * 5 + TOC.format(ref=29366) + FILLER * 200
+    session = StreamSession(body)
+
+    entry = schedule.resolve_pdf(_entry(), session=session)
+
+    stream, resp = session.responses[0]
+    assert stream is True
+    assert entry.pdf_url == parlinfo.extract_pdf_url(DISPLAY, body)
+    assert resp.closed
+    assert resp.bytes_read < len(body) // 10
+
+
+def test_other_estimate_toc_link_reads_whole_page(monkeypatch):
+    monkeypatch.setattr(parlinfo, "DISPLAY_STREAM_CHUNK_BYTES", 1024)
+    body = FILLER * 5 + TOC.format(ref=11111) + FILLER * 20 + TOC.format(ref=29366)
+    session = StreamSession(body)
+
+    entry = schedule.resolve_pdf(_entry(), session=session)
+
+    _, resp = session.responses[0]
+    assert resp.bytes_read == len(body)
+    assert not resp.closed
+    # Full-scan semantics are unchanged: extract_pdf_url takes the first toc_pdf link
+    assert entry.pdf_url == parlinfo.extract_pdf_url(DISPLAY, body)
+
+
+def test_partial_cached_page_serves_resolution_but_not_full_readers(monkeypatch):
+    monkeypatch.setattr(parlinfo, "DISPLAY_STREAM_CHUNK_BYTES", 1024)
+    body = TOC.format(ref=29366) + FILLER * 50
+    session = http.mark_own_session(StreamSession(body))
+
+    first = schedule.resolve_pdf(_entry(), session=session)
+    second = schedule.resolve_pdf(_entry(), session=session)
+    assert first.pdf_url == second.pdf_url
+    assert len(session.responses) == 1
+
+    # resolve-pdf wants the whole page, so a truncated record is a cache miss
+    assert cli.run_resolve_pdf(DISPLAY, session=session) == first.pdf_url
+    assert len(session.responses) == 2
+    assert session.responses[1][0] is None
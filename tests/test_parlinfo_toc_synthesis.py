@@ -0,0 +1,161 @@
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+from estimates_monitor import parlinfo, schedule
+from estimates_monitor.schedule import TranscriptEntry
+
+
+DISPLAY = (
+    "https://parlinfo.aph.gov.au/parlInfo/search/display/display.w3p;"
+    "query=Id%3A%22committees%2Festimate%2F{ref}%2F{doc}%22"
+)
+PDF = (
+    "https://parlinfo.aph.gov.au/parlInfo/download/committees/estimate/29366/toc_pdf/"
+    "Rural%20and%20Regional%20Affairs%20and%20Transport%20Legislation%20Committee_2026_02_10.pdf;"
+    "fileType=application%2Fpdf#search=%22committees/estimate/29366/0002%22"
+)
+SEEN = {
+    DISPLAY.format(ref=29366, doc="0002"): {
+        "title": "Rural and Regional Affairs and Transport",
+        "published_date": "2026-02-10T00:00:00",
+        "pdf_url": PDF,
+    },
+    # Non-toc links and records missing fields don't contribute
+    "https://example.org/other": {"title": "x", "published_date": "2026-01-01T00:00:00", "pdf_url": "https://example.org/a.pdf"},
+    DISPLAY.format(ref=29000, doc="0001"): {"title": "Economics", "pdf_url": None},
+}
+
+
+class DummyResp:
+    def __init__(self, url, status_code=200, headers=None, body=b"", text=""):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.body = body
+        self.text = text
+
+    def iter_content(self, chunk_size=1):
+        yield self.body
+
+    def close(self):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"{self.status_code}")
+
+
+class ProbeSession:
+    def __init__(self, head_status=200, content_type="application/pdf", detail_html=""):
+        self.head_status = head_status
+        self.content_type = content_type
+        self.detail_html = detail_html
+        self.heads = []
+        self.gets = []
+
+    def head(self, url, timeout=15, allow_redirects=True):
+        self.heads.append(url)
+        return DummyResp(url, self.head_status, {"Content-Type": self.content_type})
+
+    def get(self, url, headers=None, timeout=30, stream=False):
+        self.gets.append((url, dict(headers or {})))
+        if (headers or {}).get("Range"):
+            return DummyResp(url, 206, body=b"%PDF-1.7")
+        return DummyResp(url, body=self.detail_html.encode("utf-8"), text=self.detail_html)
+
+
+def test_learned_template_reproduces_known_url():
+    template = parlinfo.learn_toc_pdf_template(SEEN)
+    assert "{ref}" in template and "{title}" in template and "{date:%Y_%m_%d}" in template
+    url = parlinfo.synthesise_toc_pdf_url(
+        template, DISPLAY.format(ref=29366, doc="0002"), "Rural and Regional Affairs and Transport", datetime(2026, 2, 10)
+    )
+    assert url == PDF
+
+
+def test_no_usable_history_gives_no_template():
+    assert parlinfo.learn_toc_pdf_template({}) is None
+    assert parlinfo.learn_toc_pdf_template({"https://example.org/other": SEEN["https://example.org/other"]}) is None
+
+
+def test_resolve_pdf_uses_synthesised_url_without_detail_fetch():
+    template = parlinfo.learn_toc_pdf_template(SEEN)
+    entry = TranscriptEntry(
+        title="Economics",
+        page_url=DISPLAY.format(ref=29400, doc="0003"),
+        published_date=datetime(2026, 2, 12),
+        pdf_url=None,
+        status="Published",
+    )
+    session = ProbeSession()
+    schedule.resolve_pdf(entry, session=session, toc_pdf_template=template)
+
+    assert entry.pdf_url.startswith(
+        "https://parlinfo.aph.gov.au/parlInfo/download/committees/estimate/29400/toc_pdf/Economics%20Legislation%20Committee_2026_02_12.pdf"
+    )
+    assert entry.pdf_url.endswith("#search=%22committees/estimate/29400/0003%22")
+    # HEAD is sent without the fragment; the detail page is never requested
+    assert "#" not in session.heads[0]
+    assert session.gets == []
+
+
+def test_failed_probe_falls_back_to_detail_page(monkeypatch):
+    html = Path("fixtures/detail_29366.html").read_text(encoding="utf-8")
+    monkeypatch.setattr(schedule, "TOC_PDF_TEMPLATE", parlinfo.learn_toc_pdf_template(SEEN))
+    entry = TranscriptEntry(
+        title="Rural and Regional Affairs and Transport",
+        page_url=DISPLAY.format(ref=29366, doc="0002"),
+        published_date=datetime(2026, 2, 11),  # wrong date -> synthesised name 404s
+        pdf_url=None,
+        status="Published",
+    )
+    session = ProbeSession(head_status=404, detail_html=html)
+    schedule.resolve_pdf(entry, session=session)
+
+    assert len(session.heads) == 1
+    assert session.gets and session.gets[0][0] == entry.page_url
+    assert "/toc_pdf/" in entry.pdf_url
+
+
+def test_probe_falls_back_to_range_get_when_head_refused():
+    session = ProbeSession(head_status=405)
+    assert parlinfo.probe_pdf_url(PDF, session=session)
+    assert session.gets[0][1]["Range"] == "bytes=0-7"
+
+
+def test_probe_rejects_html_answer():
+    assert not parlinfo.probe_pdf_url(PDF, session=ProbeSession(content_type="text/html"))
+
+
+def test_probe_treats_unreachable_pdf_host_as_a_miss():
+    class UnreachableSession:
+        def head(self, url, **kwargs):
+            raise requests.exceptions.ConnectionError("refused")
+
+        def get(self, url, **kwargs):
+            raise AssertionError("no fallback GET expected")
+
+    assert not parlinfo.probe_pdf_url(PDF, session=UnreachableSession())
+
+
+def _rrat_entry(ref, doc="0002", title="Rural and Regional Affairs and Transport"):
+    # Scheduled a year off the date in its PDF name, as ref 29366 was (2025-02-10 vs 2026_02_10)
+    return TranscriptEntry(title=title, page_url=DISPLAY.format(ref=ref, doc=doc),
+                           published_date=datetime(2025, 2, 10), pdf_url=None, status="Published")
+
+
+def test_template_miss_disables_it_for_the_committee(monkeypatch):
+    html = Path("fixtures/detail_29366.html").read_text(encoding="utf-8")
+    monkeypatch.setattr(schedule, "TOC_PDF_TEMPLATE", parlinfo.learn_toc_pdf_template(SEEN))
+    session = ProbeSession(head_status=404, detail_html=html)
+
+    schedule.resolve_pdf(_rrat_entry(29366), session=session)
+    schedule.resolve_pdf(_rrat_entry(29366, doc="0003"), session=session)
+    assert len(session.heads) == 1
+
+    # Other committees on the same host still get one try each, until the host is dropped
+    for i in range(schedule.TOC_PDF_TEMPLATE_HOST_MISSES + 1):
+        schedule.resolve_pdf(_rrat_entry(29366, title=f"Committee {i}"), session=session)
+    assert len(session.heads) == schedule.TOC_PDF_TEMPLATE_HOST_MISSES
@@ -0,0 +1,121 @@
+import hashlib
+import importlib.util
+import io
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from estimates_monitor import cli, downloader, http, parser, schedule, storage
+from estimates_monitor.standin import StandinConfig, StandinServer
+
+THREE_PAGES = (
+    b"%PDF-1.4\n1 0 obj <</Type /Catalog /Pages 2 0 R>> endobj\n"
+    b"2 0 obj <</Type /Pages /Kids [3 0 R 4 0 R 5 0 R] /Count 3>> endobj\n"
+    b"3 0 obj <</Type /Page /Parent 2 0 R>> endobj\n"
+    b"4 0 obj <</Type/Page/Parent 2 0 R>> endobj\n"
+    b"5 0 obj <</Parent 2 0 R /Type /Page>> endobj\n"
+    b"trailer <</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+def test_handle_from_download_maps_the_stored_pdf_without_rehashing(tmp_path, monkeypatch):
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=200_000)) as srv:
+        ref = srv.rows[0].ref
+        dl = downloader.download_pdf_deterministic(srv.pdf_url(ref), "Economics", session=http.make_session(), out_dir=tmp_path)
+
+    monkeypatch.setattr(downloader, "_hash_file", lambda p: pytest.fail("hashed again"))
+    with downloader.PdfHandle.from_download(dl) as pdf:
+        assert pdf.sha256 == dl["sha256"] and pdf.bytes == 200_000
+        assert pdf.buffer[:] == srv.pdf_body(ref)
+        assert hashlib.sha256(pdf.buffer).hexdigest() == dl["sha256"]
+    assert pdf._map is None
+
+
+def test_stream(tmp_path):
+    path = tmp_path / "three.pdf"
+    path.write_bytes(THREE_PAGES)
+    with downloader.PdfHandle.from_path(path) as pdf:
+        with pdf.stream() as f:
+            assert isinstance(f, io.IOBase) and f.seekable()
+            assert f.read(8) == b"%PDF-1.4"
+            f.seek(-7, io.SEEK_END)
+            assert f.read() == THREE_PAGES[-7:]
+            f.seek(0)
+            buf = bytearray(4)
+            assert f.readinto(buf) == 4 and buf == b"%PDF"
+            assert f.read() == THREE_PAGES[4:]
+
+
+def test_from_path_hashes_without_reading_the_whole_file(tmp_path, monkeypatch):
+    path = tmp_path / "big.pdf"
+    body = b"%PDF-1.4\n" + b"x" * 3_000_000 + b"\n%%EOF\n"
+    path.write_bytes(body)
+    monkeypatch.setattr(Path, "read_bytes", lambda self: pytest.fail("read whole file"))
+    pdf = downloader.PdfHandle.from_path(path)
+    assert pdf.sha256 == hashlib.sha256(body).hexdigest() and pdf.bytes == len(body)
+
+
+def _fake_extract(pdf):
+    # Only a handle is accepted: extraction must not go back to the path
+    assert isinstance(pdf, downloader.PdfHandle)
+    with pdf.stream() as f:
+        return f"{len(f.read())} bytes from handle"
+
+
+def test_register_pdf_streams_the_hash(tmp_path, monkeypatch, capsys):
+    spec = importlib.util.spec_from_file_location("fetch_transcript", Path(__file__).resolve().parent.parent / "scripts" / "fetch_transcript.py")
+    fetch_transcript = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fetch_transcript)
+
+    monkeypatch.setattr(storage, "STATE_PATH", tmp_path / "state.json")
+    path = tmp_path / "manual.pdf"
+    path.write_bytes(THREE_PAGES)
+    entry = schedule.TranscriptEntry(title="Economics", page_url="https://example.org/est.html", pdf_url=None,
+                                     published_date=datetime(2026, 2, 27), status="Published")
+    monkeypatch.setattr(schedule, "get_latest_published", lambda is_seen_func=None, timeout_s=30: entry)
+    monkeypatch.setattr(sys, "argv", ["fetch_transcript.py", "--register-pdf", str(path)])
+    monkeypatch.setattr(Path, "read_bytes", lambda self: pytest.fail("read whole file"))
+    monkeypatch.setattr(parser, "extract_text_with_markitdown", _fake_extract)
+
+    fetch_transcript.register_pdf()
+
+    result = json.loads(capsys.readouterr().out.split("===RESULT===")[1])
+    assert result["pdf_sha256"] == hashlib.sha256(THREE_PAGES).hexdigest()
+    assert result["pdf_bytes"] == len(THREE_PAGES) and "pdf_pages" not in result
+    assert Path(result["text_path"]).read_text(encoding="utf-8") == f"{len(THREE_PAGES)} bytes from handle"
+    assert storage.get_seen(entry.page_url)["pdf_sha256"] == result["pdf_sha256"]
+
+
+def test_extractor_takes_a_handle(tmp_path):
+    pytest.importorskip("markitdown")
+    path = tmp_path / "three.pdf"
+    path.write_bytes(THREE_PAGES)
+    with downloader.PdfHandle.from_path(path) as pdf:
+        assert isinstance(parser.extract_text_with_markitdown(pdf), str)
+
+
+def test_download_latest_extracts_from_the_download_handle(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "STATE_PATH", tmp_path / "state.json")
+    monkeypatch.setattr(parser, "extract_text_with_markitdown", _fake_extract)
+    monkeypatch.setattr(downloader, "_hash_file", lambda p: pytest.fail("hashed again"))
+    with StandinServer(StandinConfig(rows=3, pdf_bytes=50_000)) as srv:
+        row = srv.rows[0]
+        entry = schedule.TranscriptEntry(title=row.title, page_url=srv.display_url(row.ref), pdf_url=srv.pdf_url(row.ref),
+                                         published_date=datetime(2026, 2, 27), status=row.status)
+        monkeypatch.setattr(cli.schedule, "get_latest_published", lambda session=None, is_seen_func=None, timeout_s=60: entry)
+        result = cli.run_download_latest(session=http.make_session(), extract=True)
+
+    assert Path(result["text_path"]).read_text(encoding="utf-8") == "50000 bytes from handle"
+    assert Path(result["text_path"]).parent == parser.TEXT_DIR
+
+
+def test_readinto_fills_the_callers_buffer(tmp_path):
+    path = tmp_path / "three.pdf"
+    path.write_bytes(THREE_PAGES)
+    with downloader.PdfHandle.from_path(path) as pdf, pdf.stream() as f:
+        buf = bytearray(len(THREE_PAGES) + 10)
+        assert f.readinto(buf) == len(THREE_PAGES) and bytes(buf[:len(THREE_PAGES)]) == THREE_PAGES
+        assert f.readinto(buf) == 0
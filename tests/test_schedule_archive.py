@@ -0,0 +1,123 @@
+import gzip
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from estimates_monitor import archive, http, schedule
+
+
+class DummyResp:
+    def __init__(self, url, text):
+        self.url = url
+        self.text = text
+        self.status_code = 200
+        self.headers = {}
+
+    def raise_for_status(self):
+        return
+
+
+class PlainSession:
+    def __init__(self, html, own=True):
+        self.html = html
+        if own:
+            # Stands in for a make_session() session, which archives by default
+            http.mark_own_session(self)
+
+    def get(self, url, **kwargs):
+        return DummyResp(url, self.html)
+
+
+def test_identical_bodies_are_stored_once_but_indexed_per_fetch():
+    html = Path("schedule.html").read_text(encoding="utf-8")
+    first = archive.store(html, "https://example.org/s", fetched_at=datetime(2026, 2, 10, 8))
+    second = archive.store(html, "https://example.org/s", fetched_at=datetime(2026, 2, 10, 9))
+
+    assert first["new"] and not second["new"]
+    assert first["sha256"] == second["sha256"]
+    assert first["stored_bytes"] < first["bytes"] / 4
+    objects = [p for p in (archive.ARCHIVE_DIR / "objects").rglob("*") if p.is_file()]
+    assert len(objects) == 1
+    assert [r["fetched_at"] for r in archive.iter_index()] == ["2026-02-10T08:00:00Z", "2026-02-10T09:00:00Z"]
+    assert archive.load(first["sha256"]) == html
+
+
+def test_gzip_objects_are_deterministic(monkeypatch):
+    monkeypatch.setattr(archive, "zstandard", None)
+    rec = archive.store("<html>x</html>", "https://example.org/s")
+    blob = (archive.ARCHIVE_DIR / "objects" / rec["sha256"][:2] / f"{rec['sha256']}.gz").read_bytes()
+    assert gzip.decompress(blob) == b"<html>x</html>"
+    assert blob == gzip.compress(b"<html>x</html>", compresslevel=archive.ARCHIVE_GZIP_LEVEL, mtime=0)
+
+
+def test_get_schedule_archives_and_replay_reparses(monkeypatch):
+    html = Path("fixtures/schedule.html").read_text(encoding="utf-8")
+    monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", ["https://example.org"])
+    live = schedule.get_schedule(session=PlainSession(html))
+    schedule.get_schedule(session=PlainSession(html))
+    schedule.get_schedule(session=PlainSession(html.replace("Second Committee", "Renamed Committee")))
+
+    assert len(list(archive.iter_index())) == 3
+    replayed = list(archive.replay())
+    assert len(replayed) == 2  # the repeated body is parsed once
+    assert replayed[0][1] == live
+    assert "Renamed Committee" in [e.title for e in archive.replay_entries()]
+
+
+def test_replay_time_window():
+    archive.store("<html>a</html>", "u", fetched_at=datetime(2026, 1, 1))
+    archive.store("<html>b</html>", "u", fetched_at=datetime(2026, 3, 1))
+    seen = [rec["fetched_at"] for rec, _ in archive.replay(parse=lambda html, base_url=None: html, since="2026-02-01")]
+    assert seen == ["2026-03-01T00:00:00Z"]
+
+
+def test_injected_session_is_not_archived_unless_asked(monkeypatch):
+    html = Path("fixtures/schedule.html").read_text(encoding="utf-8")
+    monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", ["https://example.org"])
+    assert schedule.get_schedule(session=PlainSession(html, own=False))
+    assert list(archive.iter_index()) == []
+
+    schedule.get_schedule(session=PlainSession(html, own=False), archive_pages=True)
+    assert len(list(archive.iter_index())) == 1
+
+
+def test_archive_disabled(monkeypatch):
+    monkeypatch.setattr(archive, "ARCHIVE_ENABLED", False)
+    monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", ["https://example.org"])
+    schedule.get_schedule(session=PlainSession(Path("fixtures/schedule.html").read_text(encoding="utf-8")))
+    assert list(archive.iter_index()) == []
+
+
+def test_prune_drops_old_and_excess_records_and_their_objects():
+    for day, body in [(1, "a"), (2, "b"), (3, "a"), (200, "c"), (201, "d"), (202, "e")]:
+        archive.store(f"<html>{body}</html>", "u", fetched_at=datetime(2025, 1, 1) + timedelta(days=day))
+
+    result = archive.prune(now=datetime(2025, 7, 25), retention_days=180, max_records=2)
+
+    kept = list(archive.iter_index())
+    assert [r["fetched_at"][:10] for r in kept] == ["2025-07-21", "2025-07-22"]
+    assert result == {"records": 4, "objects": 3}
+    objects = sorted(p.name for p in (archive.ARCHIVE_DIR / "objects").rglob("*") if p.is_file())
+    assert objects == sorted(archive._find_object(r["sha256"])[0].name for r in kept)
+
+
+def test_store_prunes_periodically(monkeypatch):
+    monkeypatch.setattr(archive, "ARCHIVE_MAX_RECORDS", 3)
+    monkeypatch.setattr(archive, "ARCHIVE_PRUNE_EVERY", 4)
+    for i in range(10):
+        archive.store(f"<html>{i}</html>", "u", fetched_at=datetime(2026, 2, 10, i))
+    # Pruned on the first store and after the 5th and 9th; never more than the cap plus PRUNE_EVERY
+    assert len(list(archive.iter_index())) == 4
+    assert len([p for p in (archive.ARCHIVE_DIR / "objects").rglob("*") if p.is_file()]) == 4
+
+
+def test_archive_failure_is_logged_not_raised(monkeypatch, caplog):
+    def broken(*a, **kw):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(archive, "store", broken)
+    monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", ["https://example.org"])
+    with caplog.at_level(logging.WARNING, logger="estimates_monitor.schedule"):
+        entries = schedule.get_schedule(session=PlainSession(Path("fixtures/schedule.html").read_text(encoding="utf-8")))
+    assert entries
+    assert "archive write failed: disk full" in caplog.text
@@ -0,0 +1,78 @@
+from estimates_monitor import schedule
+from pathlib import Path
+
+
+class DummyResp:
+    def __init__(self, url, text, status_code=200, headers=None):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"{self.status_code}")
+
+
+class ConditionalSession:
+    """Serves the schedule once, then answers 304 when the ETag matches."""
+
+    def __init__(self, html, etag='"v1"'):
+        self.html = html
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        headers = headers or {}
+        self.requests.append(dict(headers))
+        if headers.get("If-None-Match") == self.etag:
+            return DummyResp(url, "", status_code=304, headers={"ETag": self.etag})
+        return DummyResp(url, self.html, headers={"ETag": self.etag, "Last-Modified": "Tue, 10 Feb 2026 00:00:00 GMT"})
+
+
+def test_second_poll_uses_304_and_skips_parse(tmp_path, monkeypatch):
+    html = Path('fixtures/schedule.html').read_text(encoding='utf-8')
+    monkeypatch.setattr(schedule, "SCHEDULE_CACHE_PATH", tmp_path / "schedule_cache.json")
+    monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", ["https://example.org"])
+    session = ConditionalSession(html)
+
+    first = schedule.get_schedule(session=session)
+    assert len(first) == 2
+    assert "If-None-Match" not in session.requests[0]
+
+    def _no_parse(*a, **k):
+        raise AssertionError("schedule re-parsed on 304")
+
+    monkeypatch.setattr(schedule, "_parse_schedule_html", _no_parse)
+    second = schedule.get_schedule(session=session)
+
+    assert session.requests[1]["If-None-Match"] == '"v1"'
+    assert session.requests[1]["If-Modified-Since"] == "Tue, 10 Feb 2026 00:00:00 GMT"
+    assert second == first
+    # Cached entries are fresh objects; callers mutate pdf_url on them.
+    assert second[0] is not first[0]
+
+
+def test_changed_etag_reparses(tmp_path, monkeypatch):
+    html = Path('fixtures/schedule.html').read_text(encoding='utf-8')
+    monkeypatch.setattr(schedule, "SCHEDULE_CACHE_PATH", tmp_path / "schedule_cache.json")
+    monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", ["https://example.org"])
+    schedule.get_schedule(session=ConditionalSession(html, etag='"v1"'))
+
+    session = ConditionalSession(html.replace("Second Committee", "Renamed Committee"), etag='"v2"')
+    entries = schedule.get_schedule(session=session)
+    assert "Renamed Committee" in [e.title for e in entries]
+
+
+def test_no_validators_means_no_cache_file(tmp_path, monkeypatch):
+    html = Path('fixtures/schedule.html').read_text(encoding='utf-8')
+    cache_path = tmp_path / "schedule_cache.json"
+    monkeypatch.setattr(schedule, "SCHEDULE_CACHE_PATH", cache_path)
+    monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", ["https://example.org"])
+
+    class PlainSession:
+        def get(self, url, **kwargs):
+            return DummyResp(url, html)
+
+    assert len(schedule.get_schedule(session=PlainSession())) == 2
+    assert not cache_path.exists()
@@ -0,0 +1,48 @@
+from datetime import datetime
+from estimates_monitor import cli, schedule
+
+
+def _entry(ref_no, status="Published in full", doc="0000", title="Committee"):
+    return schedule.TranscriptEntry(
+        title=title,
+        page_url=f"https://parlinfo.aph.gov.au/parlInfo/search/display/display.w3p;query=Id:%22committees/estimate/{ref_no}/{doc}%22",
+        pdf_url=None,
+        published_date=datetime(2026, 2, 10),
+        status=status,
+        committee_url="https://www.aph.gov.au/committee",
+        ref_no=ref_no,
+    )
+
+
+def test_diff_reports_added_changed_removed(tmp_path, monkeypatch):
+    monkeypatch.setattr(schedule, "SCHEDULE_SNAPSHOT_PATH", tmp_path / "snapshot.json")
+
+    first = schedule.diff(entries=[_entry(100), _entry(101, status="Published"), _entry(102)])
+    assert [e.ref_no for e in first.added] == [102, 101, 100]
+    assert (tmp_path / "snapshot.json").exists()
+
+    second = schedule.diff(entries=[_entry(100), _entry(101), _entry(103)])
+    assert [e.ref_no for e in second.added] == [103]
+    assert [(e.ref_no, e.status) for e in second.changed] == [(101, "Published in full")]
+    assert [e.ref_no for e in second.removed] == [102]
+    assert second.removed[0].published_date == datetime(2026, 2, 10)
+
+    third = schedule.diff(entries=[_entry(100), _entry(101), _entry(103)])
+    assert not third
+
+
+def test_diff_detects_new_transcript_link(tmp_path, monkeypatch):
+    monkeypatch.setattr(schedule, "SCHEDULE_SNAPSHOT_PATH", tmp_path / "snapshot.json")
+    prev = schedule.diff(entries=[_entry(100, doc="0000")], save=False).snapshot
+    delta = schedule.diff(prev, entries=[_entry(100, doc="0001")], save=False)
+    assert [e.page_url for e in delta.changed] == [_entry(100, doc="0001").page_url]
+    assert not (tmp_path / "snapshot.json").exists()
+
+
+def test_cli_diff_returns_json_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(schedule, "SCHEDULE_SNAPSHOT_PATH", tmp_path / "snapshot.json")
+    monkeypatch.setattr(schedule, "get_schedule", lambda session=None, timeout_s=30, use_cache=True: [_entry(200)])
+    result = cli.run_diff()
+    assert result["added"][0]["ref_no"] == 200
+    assert result["added"][0]["published_date"] == "2026-02-10T00:00:00"
+    assert result["changed"] == [] and result["removed"] == []
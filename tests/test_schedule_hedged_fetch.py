@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+from estimates_monitor import schedule
+
+
+class DummyResp:
+    def __init__(self, url, text="<html></html>", status_code=200):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+        self.closed = False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"{self.status_code}")
+
+    def close(self):
+        self.closed = True
+
+
+class SlowPrimarySession:
+    def __init__(self, primary_delay_s, primary_status=200):
+        self.primary_delay_s = primary_delay_s
+        self.primary_status = primary_status
+        self.calls = []
+        self.lock = threading.Lock()
+        self.primary_resp = None
+
+    def get(self, url, **kwargs):
+        with self.lock:
+            self.calls.append((url, time.monotonic()))
+        if url == "https://primary.example.org":
+            time.sleep(self.primary_delay_s)
+            self.primary_resp = DummyResp(url, status_code=self.primary_status)
+            return self.primary_resp
+        return DummyResp(url)
+
+
+@pytest.fixture
+def candidates(monkeypatch):
+    monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", ["https://primary.example.org", "https://fallback.example.org"])
+
+
+def test_hung_primary_is_raced_after_hedge_delay(candidates):
+    session = SlowPrimarySession(primary_delay_s=0.5)
+    t0 = time.monotonic()
+    url, resp = schedule._fetch_schedule_from(session=session, timeout_s=5, hedge_delay_s=0.05)
+    elapsed = time.monotonic() - t0
+
+    assert url == "https://fallback.example.org"
+    assert resp.url == "https://fallback.example.org"
+    assert elapsed < 0.4
+    # The fallback was only fired once the hedge delay had passed
+    assert session.calls[1][1] - session.calls[0][1] >= 0.04
+
+    # The losing response is released once it lands
+    time.sleep(0.6)
+    assert session.primary_resp.closed
+
+
+def test_fast_primary_never_fires_fallback(candidates):
+    session = SlowPrimarySession(primary_delay_s=0)
+    url, _ = schedule._fetch_schedule_from(session=session, timeout_s=5, hedge_delay_s=0.5)
+    assert url == "https://primary.example.org"
+    assert [c[0] for c in session.calls] == ["https://primary.example.org"]
+
+
+def test_primary_404_falls_back_without_waiting(candidates):
+    session = SlowPrimarySession(primary_delay_s=0, primary_status=404)
+    t0 = time.monotonic()
+    url, _ = schedule._fetch_schedule_from(session=session, timeout_s=5, hedge_delay_s=2)
+    assert url == "https://fallback.example.org"
+    assert time.monotonic() - t0 < 1
+
+
+def test_all_candidates_failing_raises_last_error(candidates):
+    class FailingSession:
+        def get(self, url, **kwargs):
+            return DummyResp(url, status_code=503)
+
+    with pytest.raises(Exception, match="503"):
+        schedule._fetch_schedule_from(session=FailingSession(), timeout_s=5, hedge_delay_s=0.01)
@@ -0,0 +1,39 @@
+import pytest
+from pathlib import Path
+from estimates_monitor import schedule
+
+pytest.importorskip("lxml")
+
+BASE = 'https://www.aph.gov.au/Parliamentary_Business/Hansard/Estimates_Transcript_Schedule'
+
+
+def test_lxml_matches_bs4_on_transcript_rows():
+    html = Path('schedule.html').read_text(encoding='utf-8')
+    slow = schedule._parse_schedule_html(html, base_url=BASE, backend="bs4")
+    fast = schedule._parse_schedule_html(html, base_url=BASE, backend="lxml")
+    assert len(fast) == 62
+    assert slow[:len(fast)] == fast
+    # Anything extra from bs4 came from the navigation menu, never from ParlInfo
+    assert all('parlinfo.aph.gov.au' not in e.page_url for e in slow[len(fast):])
+
+
+def test_lxml_identical_on_fixture():
+    html = Path('fixtures/schedule.html').read_text(encoding='utf-8')
+    assert schedule._parse_schedule_html(html, base_url='https://example.org', backend="lxml") == \
+        schedule._parse_schedule_html(html, base_url='https://example.org', backend="bs4")
+
+
+def test_lxml_hands_unstructured_pages_to_bs4():
+    html = '''
+    <html><body><ul>
+      <li><a href="/t/1">Transcript one</a> <span class="status">Published in full</span> <span class="date">5 January 2025</span></li>
+    </ul></body></html>
+    '''
+    assert schedule._parse_schedule_rows_lxml(html, base_url='https://example.org') is None
+    entries = schedule._parse_schedule_html(html, base_url='https://example.org', backend="lxml")
+    assert [e.page_url for e in entries] == ['https://example.org/t/1']
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError):
+        schedule._parse_schedule_html("<html></html>", backend="nope")
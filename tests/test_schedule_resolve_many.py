@@ -0,0 +1,104 @@
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from estimates_monitor import schedule
+
+DISPLAY = "https://parlinfo.aph.gov.au/parlInfo/search/display/display.w3p;query=Id:%22committees/estimate/{ref}/0001%22"
+DETAIL = '<a href="https://parlinfo.aph.gov.au/parlInfo/download/committees/estimate/{ref}/toc_pdf/T{ref}.pdf;fileType=application%2Fpdf">PDF</a>'
+
+
+class DummyResp:
+    def __init__(self, url, text, status_code=200):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            exc = requests.exceptions.HTTPError(f"{self.status_code}")
+            exc.response = self
+            raise exc
+
+
+class DetailSession:
+    def __init__(self, blocked=(), failing=(), delay_s=0.1):
+        self.blocked = set(blocked)
+        self.failing = set(failing)
+        self.delay_s = delay_s
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay_s)
+            ref = int(url.split("estimate/")[1].split("/")[0])
+            if ref in self.blocked:
+                return DummyResp(url, "", 403)
+            if ref in self.failing:
+                return DummyResp(url, "", 500)
+            return DummyResp(url, DETAIL.format(ref=ref))
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def _entries(refs):
+    return [
+        schedule.TranscriptEntry(
+            title=f"Committee {ref}",
+            page_url=DISPLAY.format(ref=ref),
+            pdf_url=None,
+            published_date=datetime(2026, 2, 10),
+            status="Published in full",
+            ref_no=ref,
+        )
+        for ref in refs
+    ]
+
+
+def test_resolve_many_is_concurrent_ordered_and_marks_blocked():
+    refs = [301, 302, 303, 304, 305, 306]
+    session = DetailSession(blocked={303}, delay_s=0.1)
+    t0 = time.monotonic()
+    out = schedule.resolve_many(_entries(refs), session=session, max_workers=3)
+    elapsed = time.monotonic() - t0
+
+    assert [e.ref_no for e in out] == refs
+    assert session.peak == 3
+    assert elapsed < 0.5  # two waves of 0.1s, not six
+    blocked = [e for e in out if e.parlinfo_blocked]
+    assert [e.ref_no for e in blocked] == [303]
+    assert blocked[0].pdf_url is None
+    assert all(e.pdf_url.endswith(f"T{e.ref_no}.pdf;fileType=application%2Fpdf") for e in out if e.ref_no != 303)
+
+
+def test_resolve_many_skips_already_resolved():
+    entries = _entries([401, 402])
+    entries[0].pdf_url = "https://example.org/known.pdf"
+    session = DetailSession(delay_s=0)
+    schedule.resolve_many(entries, session=session)
+    assert entries[0].pdf_url == "https://example.org/known.pdf"
+    assert entries[1].pdf_url.endswith("T402.pdf;fileType=application%2Fpdf")
+
+
+def test_resolve_many_records_non_403_failure_and_keeps_the_rest():
+    entries = _entries([501, 502, 503])
+    out = schedule.resolve_many(entries, session=DetailSession(failing={501}, delay_s=0.01))
+    assert out == entries
+    assert entries[0].pdf_url is None and not entries[0].parlinfo_blocked
+    assert entries[0].resolve_error.startswith("HTTPError")
+    assert all(e.pdf_url and e.resolve_error is None for e in entries[1:])
+
+
+def test_resolve_many_reads_worker_default_at_call_time(monkeypatch):
+    monkeypatch.setattr(schedule, "RESOLVE_MAX_WORKERS", 1)
+    session = DetailSession(delay_s=0.01)
+    schedule.resolve_many(_entries(range(600, 604)), session=session)
+    assert session.peak == 1
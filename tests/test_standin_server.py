@@ -0,0 +1,91 @@
+import hashlib
+
+import pytest
+
+from estimates_monitor import backfill, downloader, http, schedule, storage
+from estimates_monitor.standin import StandinConfig, StandinServer
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(http, "HTTP_BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(http, "HTTP_BACKOFF_JITTER", 0)
+
+
+def test_schedule_skips_help_404_candidate_and_parses_every_row(monkeypatch):
+    with StandinServer(StandinConfig(rows=3000)) as srv:
+        monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", srv.schedule_candidates)
+        entries = schedule.get_schedule(session=http.make_session(), use_cache=False)
+
+    published = srv.published_rows()
+    assert len(entries) == len(published) > 2500
+    assert [e.ref_no for e in entries] == [r.ref for r in published]
+    assert entries[0].page_url == srv.display_url(published[0].ref)
+    assert srv.hits["redirect"] == srv.hits["help404"] == 1
+
+
+def test_resolve_many_rides_out_5xx_bursts_and_flags_waf(monkeypatch, fast_retries):
+    monkeypatch.setattr(http, "HTTP_BREAKER_THRESHOLD", 1000)
+    config = StandinConfig(rows=40, unpublished_every=0, waf_every=8, burst_every=5, burst_len=2)
+    with StandinServer(config) as srv:
+        entries = [
+            schedule.TranscriptEntry(title=r.title, page_url=srv.display_url(r.ref), pdf_url=None,
+                                     published_date=None, status=r.status, ref_no=r.ref)
+            for r in srv.rows
+        ]
+        schedule.resolve_many(entries, session=http.make_session(retries=5), max_workers=8)
+
+    for e in entries:
+        if srv.behind_waf(e.ref_no):
+            assert e.parlinfo_blocked and e.pdf_url is None
+        else:
+            assert e.pdf_url == srv.pdf_url(e.ref_no)
+    assert srv.hits["5xx"] > 0
+    assert srv.hits["waf"] == 5
+
+
+def test_backfill_downloads_everything_outside_the_waf(tmp_path, monkeypatch, fast_retries):
+    monkeypatch.setattr(http, "HTTP_BREAKER_THRESHOLD", 1000)
+    monkeypatch.setattr(storage, "STATE_PATH", tmp_path / "state.json")
+    monkeypatch.setattr(downloader, "PDF_DIR", tmp_path / "pdfs")
+    config = StandinConfig(rows=30, pdf_bytes=200_000, waf_every=10, burst_every=7, burst_len=1)
+    with StandinServer(config) as srv:
+        monkeypatch.setattr(schedule, "SCHEDULE_URL_CANDIDATES", [srv.schedule_url])
+        stats = backfill.run_backfill(session=http.make_session(retries=5), max_workers=6)
+
+    blocked = sum(1 for r in srv.published_rows() if srv.behind_waf(r.ref))
+    assert stats["failed"] == 0
+    assert stats["blocked"] == blocked and stats["unresolved"] == 0
+    assert len(stats["browser_fetch"]) == blocked
+    assert stats["downloaded"] == len(srv.published_rows()) - blocked
+    assert stats["bytes"] == stats["downloaded"] * 200_000
+    seen = storage.load_state()["seen"]
+    r = next(r for r in srv.published_rows() if not srv.behind_waf(r.ref))
+    assert seen[srv.display_url(r.ref)]["pdf_sha256"] == hashlib.sha256(srv.pdf_body(r.ref)).hexdigest()
+
+
+def test_pdf_head_ranges_and_waf_cookie():
+    with StandinServer(StandinConfig(rows=10, pdf_bytes=10_000, waf_every=3)) as srv:
+        s = http.make_session(retries=0)
+        open_ref = next(r.ref for r in srv.rows if not srv.behind_waf(r.ref))
+        body = srv.pdf_body(open_ref)
+        assert body.startswith(b"%PDF-") and body.endswith(b"%%EOF\n") and len(body) == 10_000
+
+        h = s.head(srv.pdf_url(open_ref), timeout=5)
+        assert h.headers["Content-Length"] == "10000" and h.headers["Accept-Ranges"] == "bytes"
+        etag = h.headers["ETag"]
+
+        part = s.get(srv.pdf_url(open_ref), headers={"Range": "bytes=100-199", "If-Range": etag}, timeout=5)
+        assert part.status_code == 206 and part.content == body[100:200]
+        assert part.headers["Content-Range"] == "bytes 100-199/10000"
+        assert s.get(srv.pdf_url(open_ref), headers={"Range": "bytes=-6"}, timeout=5).content == b"%%EOF\n"
+        # A stale validator gets the whole body back
+        stale = s.get(srv.pdf_url(open_ref), headers={"Range": "bytes=0-9", "If-Range": '"old"'}, timeout=5)
+        assert stale.status_code == 200 and stale.content == body
+        assert s.get(srv.pdf_url(open_ref), headers={"Range": "bytes=20000-"}, timeout=5).status_code == 416
+
+        waf_ref = next(r.ref for r in srv.rows if srv.behind_waf(r.ref))
+        blocked = s.get(srv.pdf_url(waf_ref), timeout=5)
+        assert blocked.status_code == 403 and b"Azure WAF" in blocked.content
+        cleared = s.get(srv.pdf_url(waf_ref), headers={"Cookie": srv.config.waf_cookie}, timeout=5)
+        assert cleared.status_code == 200 and cleared.content == srv.pdf_body(waf_ref)
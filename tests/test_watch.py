@@ -0,0 +1,138 @@
+from datetime import datetime
+
+from estimates_monitor import schedule, storage, watch
+
+
+def _seen(published, first_seen):
+    return {
+        f"https://example.org/{i}": {"published_date": p, "first_seen_at": f}
+        for i, (p, f) in enumerate(zip(published, first_seen))
+    }
+
+
+# Transcripts from the February 2026 estimates, all spotted between 06:00 and 07:00 UTC
+SEEN = _seen(
+    ["2026-02-09T00:00:00", "2026-02-10T00:00:00", "2026-02-11T00:00:00"],
+    ["2026-02-12T06:10:00Z", "2026-02-13T06:40:00Z", "2026-02-14T06:05:00Z"],
+)
+
+
+def test_fast_in_sitting_week_at_usual_hour():
+    assert watch.compute_poll_interval(datetime(2026, 2, 15, 6, 30), SEEN, fast_s=60, slow_s=3600) == 60
+
+
+def test_warm_when_only_one_signal():
+    # Sitting week but an hour nothing has ever appeared
+    assert watch.compute_poll_interval(datetime(2026, 2, 15, 18, 0), SEEN, fast_s=60, slow_s=3600) == 60 * watch.WATCH_WARM_FACTOR
+    # Usual hour, but months after the last hearings
+    assert watch.compute_poll_interval(datetime(2026, 7, 1, 6, 30), SEEN, fast_s=60, slow_s=3600) == 60 * watch.WATCH_WARM_FACTOR
+
+
+def test_slow_out_of_season_at_quiet_hour():
+    assert watch.compute_poll_interval(datetime(2026, 7, 1, 18, 0), SEEN, fast_s=60, slow_s=3600) == 3600
+
+
+def test_same_weeks_next_year_count_as_sitting():
+    assert watch.compute_poll_interval(datetime(2027, 2, 16, 6, 30), SEEN, fast_s=60, slow_s=3600) == 60
+
+
+def test_no_history_polls_fast():
+    assert watch.compute_poll_interval(datetime(2026, 7, 1, 18, 0), {}, fast_s=60, slow_s=3600) == 60
+
+
+def test_run_watch_reuses_session_and_fires_on_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "STATE_PATH", tmp_path / "state.json")
+    deltas = iter([
+        schedule.ScheduleDelta(added=[object()]),
+        schedule.ScheduleDelta(),
+        RuntimeError("schedule down"),
+    ])
+    sessions = []
+
+    def fake_diff(session=None, **kwargs):
+        sessions.append(session)
+        d = next(deltas)
+        if isinstance(d, Exception):
+            raise d
+        return d
+
+    monkeypatch.setattr(schedule, "diff", fake_diff)
+    changes, sleeps, events = [], [], []
+    session = object()
+
+    watch.run_watch(
+        lambda entry, s: changes.append(s) or {"downloaded": True},
+        session=session,
+        fast_s=10,
+        slow_s=100,
+        max_iterations=3,
+        sleep_func=sleeps.append,
+        now_func=lambda: datetime(2026, 7, 1, 18, 0),
+        report=events.append,
+    )
+
+    assert sessions == [session] * 3
+    assert changes == [session]
+    assert events[0]["results"] == [{"downloaded": True}]
+    assert "results" not in events[1]
+    assert events[2]["error"] == "RuntimeError: schedule down"
+    # Empty state -> fast polling; no sleep after the final iteration
+    assert sleeps == [10, 10]
+
+
+def _entry(ref, status="Published"):
+    return schedule.TranscriptEntry(
+        title=f"Hearing {ref}", page_url=f"https://example.org/{ref}", pdf_url=None,
+        published_date=datetime(2026, 2, 9), status=status, ref_no=ref,
+    )
+
+
+def test_run_watch_handles_every_new_row_and_retries_failures(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "STATE_PATH", tmp_path / "state.json")
+    polls = iter([
+        [_entry(1)],
+        [_entry(1), _entry(2), _entry(3), _entry(4)],
+        [_entry(1), _entry(2), _entry(3), _entry(4)],
+    ])
+    monkeypatch.setattr(schedule, "get_schedule", lambda session=None, **kwargs: next(polls))
+    handled = []
+    failing = {3}
+
+    def on_entry(entry, s):
+        handled.append(entry.ref_no)
+        if entry.ref_no in failing:
+            failing.discard(entry.ref_no)
+            raise RuntimeError("download failed")
+        return {"ref_no": entry.ref_no}
+
+    events = []
+    watch.run_watch(on_entry, session=object(), max_iterations=3, sleep_func=lambda s: None, report=events.append)
+
+    # First poll: baseline plus the newest row; then all three new rows; then the failed one again
+    assert handled == [1, 4, 3, 2, 3]
+    assert events[1]["results"][1] == {"id": "https://example.org/3", "error": "RuntimeError: download failed"}
+    assert events[2]["results"] == [{"ref_no": 3}]
+    assert set(schedule.load_schedule_snapshot(watch.WATCH_SNAPSHOT_PATH)["rows"]) == {"1", "2", "3", "4"}
+    # `cli diff` still has its own, untouched snapshot
+    assert not schedule.SCHEDULE_SNAPSHOT_PATH.exists()
+
+
+def test_run_watch_retries_blocked_and_unresolved_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "STATE_PATH", tmp_path / "state.json")
+    rows = [_entry(1), _entry(2), _entry(3)]
+    polls = iter([rows[:1], rows, rows, rows])
+    monkeypatch.setattr(schedule, "get_schedule", lambda session=None, **kwargs: next(polls))
+    # ref 2: circuit open on the first try; ref 3: no PDF link yet
+    answers = {
+        2: [{"id": "2", "pdf_url": None, "parlinfo_blocked": True, "action": "browser_fetch"}, {"id": "2", "pdf_url": "x.pdf"}],
+        3: [{"id": "3", "pdf_url": None}, {"id": "3", "pdf_url": "y.pdf"}],
+    }
+    handled = []
+
+    def on_entry(entry, s):
+        handled.append(entry.ref_no)
+        return answers[entry.ref_no].pop(0) if entry.ref_no in answers else {"id": str(entry.ref_no), "pdf_url": "z.pdf"}
+
+    watch.run_watch(on_entry, session=object(), max_iterations=4, sleep_func=lambda s: None)
+    assert handled == [1, 3, 2, 3, 2]
+    assert set(schedule.load_schedule_snapshot(watch.WATCH_SNAPSHOT_PATH)["rows"]) == {"1", "2", "3"}
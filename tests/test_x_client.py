@@ -174,3 +174,17 @@ def test_cli_publish():
     pending.approve("clip1")
     result = run_publish("clip1", post_func=_mock_post)
     assert result["status"] == "published"
+
+
+def test_real_post_func_uses_api_headers_not_the_scrapers(monkeypatch):
+    pytest.importorskip("dotenv")
+    pytest.importorskip("requests_oauthlib")
+    from estimates_monitor import http, x_client
+
+    for name in ("X_API_KEY", "X_API_SECRET", "X_ACCESS_TOKEN", "X_ACCESS_SECRET"):
+        monkeypatch.setenv(name, "x")
+    made = []
+    monkeypatch.setattr(http, "make_session", lambda **kw: made.append(kw) or object())
+    x_client.make_post_func()
+    assert made == [{"headers": x_client.X_API_HEADERS}]
+    assert x_client.X_API_HEADERS["Accept"] == "application/json"